@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+API somente leitura do portfólio BNI (FastAPI + asyncpg).
+Expõe propriedades (paginação keyset por id), busca aproximada, resumo do
+portfólio, agregados por cidade, transações recentes e exportação em massa.
+As respostas ficam num cache TTL/LRU em memória, invalidado quando uma
+sincronização termina (a exportação não passa pelo cache).
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import csv
+import io
+import json
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+API_PREFIX = '/api/v1'
+CACHE_TTL = float(os.getenv('API_CACHE_TTL', '300'))
+CACHE_MAXSIZE = int(os.getenv('API_CACHE_MAXSIZE', '1024'))
+# Intervalo (s) entre verificações de novas sincronizações concluídas
+CACHE_CHECK_INTERVAL = float(os.getenv('API_CACHE_CHECK_INTERVAL', '5'))
+POOL_MIN_SIZE = int(os.getenv('API_POOL_MIN_SIZE', '2'))
+POOL_MAX_SIZE = int(os.getenv('API_POOL_MAX_SIZE', '10'))
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_PAGE_ROWS = 50_000
+EXPORT_CHUNK_ROWS = 1_000
+
+PROPRIEDADES_LIST_COLUMNS = (
+    'id, codigo, codigo_cc, nome, endereco, cidade, estado, tipo_propriedade, '
+    'tipo_estoque, area_total, area_construida, valor_avaliacao, status'
+)
+
+# Filtros de igualdade aceitos em /propriedades
+PROPRIEDADES_FILTERS = ('cidade', 'estado', 'status', 'tipo_propriedade', 'tipo_estoque')
+
+SYNC_VERSION_SQL = """
+    SELECT count(*), max(concluido_em)
+    FROM sincronizacoes
+    WHERE status = 'concluido'
+"""
+
+CIDADES_SQL = """
+    SELECT cidade, estado,
+           count(*) AS quantidade,
+           sum(valor_avaliacao) AS valor_total,
+           avg(valor_avaliacao) AS valor_medio,
+           sum(area_total) AS area_total
+    FROM propriedades
+    WHERE cidade IS NOT NULL
+    GROUP BY cidade, estado
+    ORDER BY quantidade DESC, cidade
+"""
+
+
+class TTLCache:
+    """
+    Cache LRU com expiração por tempo, para um único processo.
+
+    Guarda as respostas já serializadas (bytes), então um acerto não custa
+    consulta nem serialização. `clear()` é chamado quando os dados mudam.
+    """
+
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def render(payload):
+    """Serializa o payload em JSON compacto (bytes)."""
+    from export_dados import json_default
+
+    return json.dumps(payload, default=json_default, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+async def init_connection(conn):
+    """Decodifica JSONB como objetos Python."""
+    await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads,
+                              schema='pg_catalog')
+
+
+async def create_pool():
+    """Cria o pool assíncrono de conexões com o banco de dados."""
+    import asyncpg
+
+    return await asyncpg.create_pool(
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=int(os.getenv('POSTGRES_PORT', '5432')),
+        database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        init=init_connection,
+    )
+
+
+async def fetch_sync_version(pool):
+    """Versão dos dados: muda sempre que uma sincronização é concluída."""
+    row = await pool.fetchrow(SYNC_VERSION_SQL)
+    return (row[0], row[1])
+
+
+async def watch_sync_version(app):
+    """Limpa o cache quando `sincronizacoes` registra uma nova conclusão."""
+    import asyncpg
+
+    while True:
+        await asyncio.sleep(CACHE_CHECK_INTERVAL)
+        try:
+            version = await fetch_sync_version(app.state.pool)
+        except (asyncpg.PostgresError, OSError) as e:
+            print(f"⚠️  Falha ao verificar sincronizações: {e}")
+            continue
+        if version != app.state.sync_version:
+            app.state.sync_version = version
+            app.state.cache.clear()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.pool = await create_pool()
+    app.state.cache = TTLCache()
+    app.state.sync_version = await fetch_sync_version(app.state.pool)
+    watcher = asyncio.create_task(watch_sync_version(app))
+    try:
+        yield
+    finally:
+        watcher.cancel()
+        await app.state.pool.close()
+
+
+def create_app():
+    """
+    Monta a aplicação. O uvicorn a chama (factory=True), então importar o
+    módulo, como em `bni api --help`, não carrega fastapi nem asyncpg.
+    """
+    from fastapi import FastAPI, HTTPException, Query, Response
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI(
+        title='BNI Gestão Imobiliária - API',
+        description='API somente leitura do portfólio BNI',
+        lifespan=lifespan,
+    )
+
+    async def cached(key, producer):
+        """
+        Retorna a resposta em cache para `key` ou gera, serializa e guarda.
+
+        `producer` é uma corrotina que devolve o payload (dict/list).
+        """
+        cache = app.state.cache
+        body = cache.get(key)
+        status = 'HIT'
+        if body is None:
+            status = 'MISS'
+            body = render(await producer())
+            cache.set(key, body)
+        return Response(content=body, media_type='application/json',
+                        headers={'X-Cache': status})
+
+    @app.get(f'{API_PREFIX}/health')
+    async def health():
+        cache = app.state.cache
+        return {
+            'status': 'ok',
+            'cache': {'itens': len(cache), 'hits': cache.hits, 'misses': cache.misses},
+            'sincronizacoes_concluidas': app.state.sync_version[0],
+        }
+
+    @app.get(f'{API_PREFIX}/propriedades')
+    async def list_propriedades(
+        after_id: int = Query(0, ge=0, description='Último id da página anterior'),
+        limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cidade: Optional[str] = None,
+        estado: Optional[str] = None,
+        status: Optional[str] = None,
+        tipo_propriedade: Optional[str] = None,
+        tipo_estoque: Optional[str] = None,
+    ):
+        """Lista propriedades por id crescente (keyset: WHERE id > after_id)."""
+        filters = {
+            'cidade': cidade, 'estado': estado, 'status': status,
+            'tipo_propriedade': tipo_propriedade, 'tipo_estoque': tipo_estoque,
+        }
+        filters = {k: v for k, v in filters.items() if v is not None}
+
+        async def produce():
+            conditions = ['id > $1']
+            values = [after_id]
+            for column in PROPRIEDADES_FILTERS:
+                if column in filters:
+                    values.append(filters[column])
+                    conditions.append(f"{column} = ${len(values)}")
+            values.append(limit + 1)
+            rows = await app.state.pool.fetch(
+                f"SELECT {PROPRIEDADES_LIST_COLUMNS} FROM propriedades "
+                f"WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ${len(values)}",
+                *values
+            )
+            items = [dict(r) for r in rows[:limit]]
+            next_after_id = items[-1]['id'] if len(rows) > limit else None
+            return {'items': items, 'next_after_id': next_after_id}
+
+        key = ('propriedades', after_id, limit, tuple(sorted(filters.items())))
+        return await cached(key, produce)
+
+    @app.get(f'{API_PREFIX}/propriedades/busca')
+    async def search_propriedades(
+        q: str = Query(..., min_length=2, description='Nome, endereço ou codigo_cc'),
+        limite: int = Query(20, ge=1, le=200),
+        limiar: float = Query(0.4, gt=0, le=1),
+    ):
+        """Busca aproximada (pg_trgm) via buscar_propriedades()."""
+        async def produce():
+            rows = await app.state.pool.fetch(
+                "SELECT * FROM buscar_propriedades($1, $2, $3)", q.strip(), limite, limiar
+            )
+            return {'items': [dict(r) for r in rows]}
+
+        return await cached(('busca', q.strip().lower(), limite, limiar), produce)
+
+    @app.get(f'{API_PREFIX}/propriedades/{{propriedade_id}}')
+    async def get_propriedade(propriedade_id: int):
+        async def produce():
+            row = await app.state.pool.fetchrow(
+                "SELECT * FROM propriedades WHERE id = $1", propriedade_id
+            )
+            return dict(row) if row else None
+
+        response = await cached(('propriedade', propriedade_id), produce)
+        if response.body == b'null':
+            raise HTTPException(status_code=404, detail='Propriedade não encontrada')
+        return response
+
+    @app.get(f'{API_PREFIX}/portfolio/resumo')
+    async def portfolio_resumo():
+        async def produce():
+            row = await app.state.pool.fetchrow("SELECT * FROM vw_resumo_portfolio")
+            return dict(row)
+
+        return await cached(('resumo',), produce)
+
+    @app.get(f'{API_PREFIX}/portfolio/cidades')
+    async def portfolio_cidades():
+        async def produce():
+            rows = await app.state.pool.fetch(CIDADES_SQL)
+            return {'items': [dict(r) for r in rows]}
+
+        return await cached(('cidades',), produce)
+
+    @app.get(f'{API_PREFIX}/transacoes/recentes')
+    async def transacoes_recentes(limit: int = Query(100, ge=1, le=100)):
+        async def produce():
+            rows = await app.state.pool.fetch(
+                "SELECT * FROM vw_transacoes_recentes LIMIT $1", limit
+            )
+            return {'items': [dict(r) for r in rows]}
+
+        return await cached(('transacoes_recentes', limit), produce)
+
+    @app.get(f'{API_PREFIX}/export/{{tabela}}')
+    async def export_tabela(
+        tabela: str,
+        formato: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+        since: Optional[datetime] = Query(None,
+                                          description='Só linhas alteradas a partir desta data'),
+        after_id: int = Query(0, ge=0, description='Retoma após este id'),
+        max_rows: Optional[int] = Query(None, ge=1),
+    ):
+        """
+        Exportação em massa (streaming), mesma paginação keyset de export_dados.py.
+
+        Cada página de EXPORT_PAGE_ROWS linhas usa uma conexão do pool e um
+        cursor no servidor; a conexão é devolvida entre páginas. Para retomar,
+        use o id (e a data, com `since`) da última linha recebida.
+        """
+        from export_dados import EXPORT_TABLES, json_default
+
+        if tabela not in EXPORT_TABLES:
+            raise HTTPException(status_code=404, detail='Tabela não exportável')
+        column = EXPORT_TABLES[tabela]
+        if since is None:
+            query = f"SELECT * FROM {tabela} WHERE id > $1 ORDER BY id LIMIT $2"
+        else:
+            query = (f"SELECT * FROM {tabela} WHERE ({column}, id) > ($1, $2) "
+                     f"ORDER BY {column}, id LIMIT $3")
+
+        def encode(records, header):
+            if formato == 'ndjson':
+                return ''.join(
+                    json.dumps(dict(r), default=json_default, ensure_ascii=False) + '\n'
+                    for r in records
+                ).encode('utf-8')
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if header:
+                writer.writerow(records[0].keys())
+            for r in records:
+                writer.writerow([
+                    json.dumps(v, default=json_default, ensure_ascii=False)
+                    if isinstance(v, (dict, list)) else v
+                    for v in r.values()
+                ])
+            return buffer.getvalue().encode('utf-8')
+
+        async def stream():
+            key = (since, after_id)
+            exported = 0
+            header = True
+            while max_rows is None or exported < max_rows:
+                limit = (EXPORT_PAGE_ROWS if max_rows is None
+                         else min(EXPORT_PAGE_ROWS, max_rows - exported))
+                args = (key[1], limit) if since is None else (key[0], key[1], limit)
+                page_rows = 0
+                chunk = []
+                async with app.state.pool.acquire() as conn:
+                    async with conn.transaction():
+                        async for record in conn.cursor(query, *args, prefetch=EXPORT_CHUNK_ROWS):
+                            chunk.append(record)
+                            if len(chunk) == EXPORT_CHUNK_ROWS:
+                                yield encode(chunk, header)
+                                header = False
+                                page_rows += len(chunk)
+                                last = chunk[-1]
+                                chunk = []
+                        if chunk:
+                            yield encode(chunk, header)
+                            header = False
+                            page_rows += len(chunk)
+                            last = chunk[-1]
+                exported += page_rows
+                if page_rows < limit:
+                    break
+                key = (last[column] if since is not None else None, last['id'])
+
+        media_type = 'application/x-ndjson' if formato == 'ndjson' else 'text/csv'
+        return StreamingResponse(stream(), media_type=media_type)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API somente leitura do portfólio BNI')
+    parser.add_argument('--host', type=str, default=os.getenv('API_HOST', '0.0.0.0'),
+                       help='Endereço de escuta')
+    parser.add_argument('--port', type=int, default=int(os.getenv('API_PORT', '8000')),
+                       help='Porta HTTP')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processos uvicorn (cada um com pool e cache próprios)')
+    parser.add_argument('--reload', action='store_true',
+                       help='Recarrega ao alterar o código (desenvolvimento)')
+
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        'api_portfolio:create_app',
+        factory=True,
+        app_dir=str(Path(__file__).parent),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
+        access_log=False,
+    )
+
+
+if __name__ == '__main__':
+    main()
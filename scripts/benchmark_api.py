@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da API do portfólio (scripts/api_portfolio.py).
+Dispara requisições concorrentes com httpx e reporta req/s e latências
+p50/p99 por endpoint, com e sem o cache de respostas.
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import subprocess
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import httpx
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+ENDPOINTS = {
+    'propriedades': '/api/v1/propriedades?limit=50',
+    'propriedades_pag2': '/api/v1/propriedades?limit=50&after_id={after_id}',
+    'resumo': '/api/v1/portfolio/resumo',
+    'cidades': '/api/v1/portfolio/cidades',
+    'transacoes_recentes': '/api/v1/transacoes/recentes',
+}
+
+
+def percentile(values, pct):
+    """Percentil por ordenação (valores em ms)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_endpoint(client, path, total, concurrency):
+    """Executa `total` GETs com `concurrency` em paralelo; retorna métricas."""
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(path)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            url = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'req_s': total / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'erros': errors,
+    }
+
+
+async def run_benchmark(base_url, total, concurrency):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        first_page = (await client.get(ENDPOINTS['propriedades'])).json()
+        after_id = first_page.get('next_after_id') or 0
+
+        results = {}
+        for name, path in ENDPOINTS.items():
+            path = path.format(after_id=after_id)
+            await client.get(path)  # aquecimento
+            results[name] = await run_endpoint(client, path, total, concurrency)
+        return results
+
+
+def wait_for_server(base_url, timeout=30):
+    """Aguarda o /health responder."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/v1/health", timeout=1).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def spawn_server(port, workers, cache_ttl):
+    """Inicia a API num subprocesso com o TTL de cache informado."""
+    env = dict(os.environ, API_CACHE_TTL=str(cache_ttl))
+    return subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / 'api_portfolio.py'),
+         '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+    )
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print(f"{'endpoint':<22} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'erros':>6}")
+    for name, r in results.items():
+        print(f"{name:<22} {r['req_s']:>10,.0f} {r['p50_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['erros']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga da API do portfólio')
+    parser.add_argument('--url', type=str, default=None,
+                       help='URL de uma API já em execução (ex.: http://localhost:8000)')
+    parser.add_argument('--requests', type=int, default=2000,
+                       help='Requisições por endpoint')
+    parser.add_argument('--concurrency', type=int, default=32,
+                       help='Requisições simultâneas')
+    parser.add_argument('--port', type=int, default=8765,
+                       help='Porta da API iniciada pelo benchmark')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processos uvicorn da API iniciada pelo benchmark')
+
+    args = parser.parse_args()
+
+    print("⏱️  Teste de carga: API do portfólio")
+    print(f"   {args.requests:,} requisições por endpoint, concorrência {args.concurrency}")
+
+    if args.url:
+        print_results(f"🌐 {args.url}", asyncio.run(
+            run_benchmark(args.url, args.requests, args.concurrency)))
+        return
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for label, ttl in (('sem cache (TTL 0)', 0), ('com cache', 300)):
+        server = spawn_server(args.port, args.workers, ttl)
+        try:
+            if not wait_for_server(base_url):
+                print("❌ API não respondeu; verifique a conexão com o banco")
+                sys.exit(1)
+            results = asyncio.run(run_benchmark(base_url, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print_results(f"▶️  {label}", results)
+
+
+if __name__ == '__main__':
+    main()
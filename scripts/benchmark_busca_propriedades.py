@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de propriedades: ILIKE sem índice vs pg_trgm (GIN).
+Gera propriedades sintéticas num schema isolado e mede buscas por nome,
+endereço e codigo_cc usando a mesma função buscar_propriedades() do schema.
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCHEMA = 'bench_busca'
+
+SETUP_SQL = """
+    DROP SCHEMA IF EXISTS {schema} CASCADE;
+    CREATE SCHEMA {schema};
+    SET search_path TO {schema}, public;
+    CREATE TABLE propriedades (
+        id SERIAL PRIMARY KEY,
+        codigo VARCHAR(50) UNIQUE NOT NULL,
+        codigo_cc VARCHAR(50),
+        nome VARCHAR(500) NOT NULL,
+        endereco TEXT,
+        cidade VARCHAR(100)
+    );
+    INSERT INTO propriedades (codigo, codigo_cc, nome, endereco, cidade)
+    SELECT
+        'B' || g,
+        'CC' || lpad(g::text, 7, '0'),
+        (ARRAY['EDF.', 'RES.', 'COND.', 'CASA', 'SALA'])[1 + g %% 5] || ' '
+            || (ARRAY['EMILIO', 'AURORA', 'MIRANTE', 'PALMEIRAS', 'ATLANTICO',
+                      'IPANEMA', 'JARDIM', 'SOLAR', 'HORIZONTE', 'BOSQUE'])[1 + (g / 5) %% 10]
+            || ' '
+            || upper(md5(g::text)::text) || ' ' || (g %% 997),
+        (ARRAY['RUA', 'AV.', 'AL.', 'TRAV.'])[1 + g %% 4] || ' '
+            || (ARRAY['BARAO DE MAUA', 'SETE DE SETEMBRO', 'DAS FLORES',
+                      'ATLANTICA', 'PAULISTA', 'RIO BRANCO'])[1 + (g / 7) %% 6] || ', '
+            || (g %% 5000) || ' ' || substr(md5((g * 31)::text), 1, 8),
+        (ARRAY['Vitória', 'Vila Velha', 'Rio de Janeiro', 'São Paulo'])[1 + g %% 4]
+    FROM generate_series(1, %(rows)s) g;
+    INSERT INTO propriedades (codigo, codigo_cc, nome, endereco, cidade)
+    VALUES ('ALVO', 'CC-ALVO', 'EDF.EMILIO BUMACHAR', 'RUA CHAPOT PRESVOT, 389', 'Vitória');
+"""
+
+INDEX_SQL = """
+    CREATE INDEX ON propriedades USING GIN (nome gin_trgm_ops);
+    CREATE INDEX ON propriedades USING GIN (endereco gin_trgm_ops);
+    CREATE INDEX ON propriedades USING GIN (codigo_cc gin_trgm_ops);
+    ANALYZE propriedades;
+"""
+
+ILIKE_SQL = """
+    SELECT id, codigo, codigo_cc, nome
+    FROM propriedades
+    WHERE nome ILIKE '%%' || %(termo)s || '%%'
+       OR endereco ILIKE '%%' || %(termo)s || '%%'
+       OR codigo_cc ILIKE '%%' || %(termo)s || '%%'
+    ORDER BY id
+    LIMIT %(limite)s
+"""
+
+TRGM_SQL = "SELECT * FROM buscar_propriedades(%(termo)s, %(limite)s)"
+
+# Termos exatos (comparáveis com ILIKE) e com erro de digitação (só trigramas)
+TERMS = ['BUMACHAR', 'emilio bumachar', 'CC-ALVO', 'chapot presvot', 'bumaxar', 'emlio bumachr']
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def timed(cursor, statement, params, repeat):
+    """Executa a consulta `repeat` vezes; retorna (melhor tempo em ms, nº de linhas)."""
+    best, rows = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(statement, params)
+        rows = len(cursor.fetchall())
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de busca: ILIKE vs pg_trgm')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                       help='Número de propriedades sintéticas')
+    parser.add_argument('--limite', type=int, default=20,
+                       help='Resultados por busca')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Repetições de cada busca (melhor tempo)')
+    parser.add_argument('--keep', action='store_true',
+                       help='Mantém o schema de benchmark ao final')
+
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark: busca de propriedades (ILIKE vs pg_trgm)")
+    print(f"   {args.rows:,} propriedades sintéticas, limite {args.limite}")
+    print("-" * 70)
+
+    conn = get_db_connection()
+    conn.autocommit = True
+    results = {}
+    try:
+        with conn.cursor() as cursor:
+            start = time.perf_counter()
+            cursor.execute(SETUP_SQL.format(schema=SCHEMA), {'rows': args.rows})
+            cursor.execute("ANALYZE propriedades")
+            print(f"✓ Carga: {time.perf_counter() - start:.1f}s")
+
+            for termo in TERMS:
+                params = {'termo': termo, 'limite': args.limite}
+                results[termo] = {'ilike': timed(cursor, ILIKE_SQL, params, args.repeat)}
+
+            start = time.perf_counter()
+            cursor.execute(INDEX_SQL)
+            print(f"✓ Índices GIN de trigramas: {time.perf_counter() - start:.1f}s")
+
+            for termo in TERMS:
+                params = {'termo': termo, 'limite': args.limite}
+                results[termo]['trgm'] = timed(cursor, TRGM_SQL, params, args.repeat)
+
+            cursor.execute("SELECT pg_size_pretty(pg_indexes_size('propriedades'))")
+            index_size = cursor.fetchone()[0]
+            cursor.execute("SET search_path TO public")
+    finally:
+        if not args.keep:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+    print("-" * 70)
+    print(f"{'termo':<20} {'ILIKE ms':>10} {'linhas':>7} {'pg_trgm ms':>12} {'linhas':>7}")
+    for termo, res in results.items():
+        (ilike_ms, ilike_rows), (trgm_ms, trgm_rows) = res['ilike'], res['trgm']
+        print(f"{termo:<20} {ilike_ms:>10.1f} {ilike_rows:>7} {trgm_ms:>12.1f} {trgm_rows:>7}")
+    print(f"\n📦 Tamanho dos índices de propriedades: {index_size}")
+
+
+if __name__ == '__main__':
+    main()
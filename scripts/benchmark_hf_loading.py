@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carregamento de dados para o Hugging Face Dataset.
+Compara o caminho pandas (read_csv + Dataset.from_pandas) com o caminho
+Arrow nativo (pyarrow.csv + cache memory-mapped) em tempo e pico de memória.
+"""
+
+import os
+import sys
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SCRIPT_DIR = Path(__file__).parent
+
+
+def generate_csv(path, rows, seed=42):
+    """Gera um CSV no formato de propriedades.csv com `rows` linhas."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, rows + 1)
+    df = pd.DataFrame({
+        'ID': ids,
+        'CODIGO_CC': (51000 + ids).astype(str),
+        'NOME_IMOVEL': np.char.add('APTO ', (ids % 2000).astype(str)),
+        'TIPO_ESTOQUE': rng.choice(['Concluídos', 'De Terceiros', 'N/D'], rows),
+        'VALOR_31_12_2023_R$': rng.uniform(10000, 2000000, rows).round(2),
+        'VALOR_31_12_2024_R$': rng.uniform(10000, 2000000, rows).round(2),
+        'STATUS_ATUAL': rng.choice(['Concluído', 'Locado', 'Aporte SCP'], rows),
+        'PRECO_TOTAL_PROMESSA_R$': 'N/A',
+        'DATA_HABITE_SE_PREVISTA': 'N/A',
+        'OBSERVACOES_FINANCEIRAS': 'Estoque de imóveis concluídos',
+    })
+    df.to_csv(path, index=False)
+
+
+def run_path(path_name, data_dir, schemas_dir):
+    """Executa um caminho de carregamento e retorna tempo e pico de RSS (MB)."""
+    import sync_huggingface as sync
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if path_name == 'pandas':
+        dataset = sync.create_dataset_from_data(sync.load_data_from_directory(data_dir))
+    else:
+        dataset = sync.create_dataset_from_arrow(
+            sync.load_arrow_datasets_from_directory(data_dir, schemas_dir)
+        )
+
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'path': path_name,
+        'rows': dataset.num_rows if hasattr(dataset, 'num_rows') else None,
+        'seconds': round(elapsed, 3),
+        'peak_rss_mb': round(rss_after / 1024, 1),
+        'delta_rss_mb': round((rss_after - rss_before) / 1024, 1),
+    }
+
+
+def run_isolated(path_name, data_dir, schemas_dir):
+    """Roda um caminho em processo separado para isolar o pico de memória."""
+    result = subprocess.run(
+        [sys.executable, __file__, '--run-path', path_name,
+         '--data-dir', str(data_dir), '--schemas-dir', str(schemas_dir)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pandas vs Arrow para o Hugging Face')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000],
+                       help='Tamanhos de entrada a testar')
+    parser.add_argument('--schemas-dir', type=str,
+                       default=os.getenv('DATA_SCHEMAS_PATH', './data/schemas'),
+                       help='Diretório com schemas JSON')
+    parser.add_argument('--data-dir', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--run-path', choices=['pandas', 'arrow'], default=None,
+                       help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.run_path:
+        sys.stdout = open(os.devnull, 'w')
+        result = run_path(args.run_path, args.data_dir, args.schemas_dir)
+        sys.stdout = sys.__stdout__
+        print(json.dumps(result))
+        return
+
+    print("⏱️  Benchmark de carregamento: pandas vs Arrow")
+    print("-" * 70)
+    print(f"{'linhas':>10} {'caminho':<16} {'tempo (s)':>10} {'pico RSS (MB)':>14}")
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            generate_csv(data_dir / 'propriedades.csv', rows)
+
+            results = [
+                run_isolated('pandas', data_dir, args.schemas_dir),
+                run_isolated('arrow', data_dir, args.schemas_dir),
+            ]
+            # Segunda execução Arrow reaproveita o cache memory-mapped
+            cached = run_isolated('arrow', data_dir, args.schemas_dir)
+            cached['path'] = 'arrow (cache)'
+            results.append(cached)
+
+            for result in results:
+                print(f"{rows:>10} {result['path']:<16} {result['seconds']:>10.3f} "
+                      f"{result['peak_rss_mb']:>14.1f}")
+
+    print("-" * 70)
+
+
+if __name__ == '__main__':
+    main()
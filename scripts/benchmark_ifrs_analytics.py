@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da movimentação do valor justo (scripts/ifrs_analytics.py).
+Gera em memória portfólios no layout processado e extratos de transações e
+mede analyze_portfolio() por tamanho, conferindo que a conciliação fecha
+exatamente (saldo inicial + movimentações = saldo final, em centavos).
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+STATUS = ['Concluído', 'Locado', 'Vendido/Reclassificado', 'Concluído/Locado',
+          'Promessa_Compra_Venda', 'Aporte SCP']
+TIPOS_ESTOQUE = ['Concluídos', 'De Terceiros', 'N/D']
+TIPOS_TRANSACAO = ['aluguel', 'manutencao', 'reforma', 'compra', 'venda', 'outro']
+
+
+def generate_frames(rows, transactions, seed=42):
+    """Portfólio (layout processado) e transações com `rows` e `transactions` linhas."""
+    rng = np.random.default_rng(seed)
+    codigo = (100000 + np.arange(rows)).astype(str)
+    status = rng.choice(STATUS, rows, p=[0.55, 0.25, 0.08, 0.04, 0.05, 0.03])
+    valor_2023 = np.round(rng.lognormal(np.log(300_000), 0.9, rows), 2)
+    valor_2023[rng.random(rows) < 0.05] = np.nan
+    valor_2024 = np.round(valor_2023 * rng.normal(1.03, 0.05, rows), 2)
+    valor_2024[status == 'Vendido/Reclassificado'] = 0.0
+    propriedades = pd.DataFrame({
+        'codigo': codigo,
+        'tipo_estoque': rng.choice(TIPOS_ESTOQUE, rows),
+        'status': status,
+        'valor_avaliacao': np.where(valor_2024 > 0, valor_2024, valor_2023),
+        'valor_2023': valor_2023,
+        'valor_2024': valor_2024,
+    })
+    transacoes = pd.DataFrame({
+        'codigo': codigo[rng.integers(0, rows, transactions)],
+        'tipo_transacao': rng.choice(TIPOS_TRANSACAO, transactions),
+        'valor': np.round(rng.lognormal(np.log(5_000), 1.2, transactions), 2),
+        'data_transacao': pd.to_datetime('2023-06-01')
+                          + pd.to_timedelta(rng.integers(0, 730, transactions), 'D'),
+    })
+    return propriedades, transacoes
+
+
+def main():
+    from ifrs_analytics import analyze_portfolio
+
+    parser = argparse.ArgumentParser(description='Benchmark da movimentação IAS 40')
+    parser.add_argument('--tamanhos', type=str, default='10000,100000,1000000',
+                        help='Quantidades de propriedades separadas por vírgula')
+    parser.add_argument('--transacoes-por-propriedade', type=float, default=5,
+                        help='Transações geradas por propriedade')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Execuções por tamanho (mostra a melhor)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark: movimentação do valor justo (IAS 40)")
+    print("-" * 72)
+    print(f"{'propriedades':>12} {'transações':>12} {'sem transações':>16} "
+          f"{'com transações':>16} {'diferença (¢)':>14}")
+
+    for rows in [int(size) for size in args.tamanhos.split(',')]:
+        transactions = int(rows * args.transacoes_por_propriedade)
+        propriedades, transacoes = generate_frames(rows, transactions, args.seed)
+
+        timings = {}
+        for label, ledger in (('sem', None), ('com', transacoes)):
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                analise = analyze_portfolio(propriedades, ledger)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+
+        conciliacao = analise['conciliacao']['valor'].to_numpy()
+        difference = int(conciliacao[:-1].sum() - conciliacao[-1])
+        print(f"{rows:>12,} {transactions:>12,} {timings['sem']:>15.3f}s "
+              f"{timings['com']:>15.3f}s {difference:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de tempo de inicialização da CLI (python -X importtime).
+Mede, para cada comando, o tempo de `bni <comando> --help` e do script
+equivalente chamado diretamente, e mostra os imports mais pesados. Com
+--limite-ms falha (código de saída 1) se `bni --help` ou `bni <comando>
+--help` passar do limite, o que permite usá-lo como verificação em CI.
+"""
+
+import sys
+import argparse
+import re
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)')
+
+
+def parse_importtime(stderr):
+    """Retorna (total em ms, [(ms cumulativo, módulo)] dos imports de primeiro nível)."""
+    top_level = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level.append((int(match.group(2)) / 1000, match.group(4)))
+    return sum(ms for ms, _ in top_level), top_level
+
+
+def measure(command, repeat):
+    """Mediana do tempo de parede e do tempo de import (ms) de `command`."""
+    wall, imports, top_level = [], [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', *command],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        wall.append((time.perf_counter() - start) * 1000)
+        total, top_level = parse_importtime(completed.stderr)
+        imports.append(total)
+    return statistics.median(wall), statistics.median(imports), top_level
+
+
+def main():
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    from bni import COMMANDS
+
+    parser = argparse.ArgumentParser(description='Benchmark de tempo de import da CLI')
+    parser.add_argument('comandos', nargs='*', default=list(COMMANDS),
+                        help='Comandos a medir (padrão: todos)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Execuções por medição (usa a mediana)')
+    parser.add_argument('--top', type=int, default=5,
+                        help='Imports mais pesados exibidos por comando (0 desativa)')
+    parser.add_argument('--limite-ms', type=float, default=None,
+                        help='Falha se o import de `bni --help` ou de qualquer '
+                             '`bni <comando> --help` passar deste tempo')
+    args = parser.parse_args()
+
+    bni = str(SCRIPTS_DIR / 'bni.py')
+    wall, imports, top_level = measure([bni, '--help'], args.repeat)
+    print(f"⏱️  bni --help: {wall:.0f} ms ({imports:.0f} ms em imports)")
+    print("-" * 72)
+    print(f"{'comando':<22} {'bni --help':>12} {'script --help':>14} {'imports bni':>12} "
+          f"{'imports script':>15}")
+
+    heaviest = {}
+    over_limit = {}
+    if args.limite_ms is not None and imports > args.limite_ms:
+        over_limit['bni --help'] = imports
+    for name in args.comandos:
+        module = COMMANDS[name][0]
+        bni_wall, bni_imports, _ = measure([bni, name, '--help'], args.repeat)
+        script_wall, script_imports, script_top = measure(
+            [str(SCRIPTS_DIR / f"{module}.py"), '--help'], args.repeat
+        )
+        heaviest[name] = sorted(script_top, reverse=True)[:args.top]
+        print(f"{name:<22} {bni_wall:>9.0f} ms {script_wall:>11.0f} ms "
+              f"{bni_imports:>9.0f} ms {script_imports:>12.0f} ms")
+        if args.limite_ms is not None and bni_imports > args.limite_ms:
+            over_limit[f"bni {name} --help"] = bni_imports
+
+    if args.top:
+        print("-" * 72)
+        for name, modules in heaviest.items():
+            print(f"{name}: " + ', '.join(f"{module} {ms:.0f} ms" for ms, module in modules))
+
+    if over_limit:
+        print()
+        for command, ms in over_limit.items():
+            print(f"❌ {command} importa em {ms:.0f} ms (limite {args.limite_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
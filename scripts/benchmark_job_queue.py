@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark da fila de jobs (scripts/job_queue.py).
+Enfileira N jobs sintéticos (tipo 'benchmark', que apenas dormem) e mede o
+tempo para esvaziar a fila com 1, 2, 4... workers. Jobs de 0s medem o custo
+da própria fila (reserva + conclusão); jobs com duração medem o ganho de
+paralelismo sobre a execução serial.
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+from job_queue import get_db_connection, enqueue_sync, has_open_jobs, run_workers
+
+
+def enqueue_batch(conn, jobs, seconds):
+    """Enfileira `jobs` jobs sintéticos de `seconds` segundos."""
+    for _ in range(jobs):
+        enqueue_sync(conn, 'manual', 'benchmark', parametros={'segundos': seconds})
+
+
+def cleanup(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("DELETE FROM sincronizacoes WHERE tipo_sincronizacao = 'benchmark'")
+        removed = cursor.rowcount
+    conn.commit()
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da fila de jobs')
+    parser.add_argument('--jobs', type=int, default=40,
+                        help='Jobs por rodada')
+    parser.add_argument('--segundos', type=float, default=0.25,
+                        help='Duração de cada job sintético')
+    parser.add_argument('--workers', type=str, default='1,2,4,8',
+                        help='Números de workers a testar (separados por vírgula)')
+    parser.add_argument('--overhead-jobs', type=int, default=500,
+                        help='Jobs de 0s para medir o custo da fila (0 desativa)')
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if has_open_jobs(conn):
+        print("❌ Há jobs pendentes ou em execução na fila; o benchmark os executaria. "
+              "Aguarde esvaziar (python scripts/job_queue.py status).")
+        sys.exit(1)
+
+    worker_counts = [int(w) for w in args.workers.split(',')]
+    print(f"⏱️  Fila de jobs: {args.jobs} jobs de {args.segundos}s "
+          f"(serial = {args.jobs * args.segundos:.1f}s)")
+    print(f"{'workers':>8} {'tempo (s)':>10} {'jobs/s':>8} {'speedup':>8}")
+
+    try:
+        baseline = None
+        for workers in worker_counts:
+            enqueue_batch(conn, args.jobs, args.segundos)
+            start = time.perf_counter()
+            run_workers(workers, until_empty=True, poll_interval=0.2, quiet=True)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed * worker_counts[0]
+            print(f"{workers:>8} {elapsed:>10.2f} {args.jobs / elapsed:>8.1f} "
+                  f"{baseline / elapsed:>7.1f}x")
+            cleanup(conn)
+
+        if args.overhead_jobs:
+            print(f"\n⏱️  Custo da fila: {args.overhead_jobs} jobs de 0s")
+            for workers in worker_counts:
+                enqueue_batch(conn, args.overhead_jobs, 0)
+                start = time.perf_counter()
+                run_workers(workers, until_empty=True, poll_interval=0.2, quiet=True)
+                elapsed = time.perf_counter() - start
+                print(f"{workers:>8} {elapsed:>10.2f} {args.overhead_jobs / elapsed:>8.1f}")
+                cleanup(conn)
+    finally:
+        cleanup(conn)
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos valores monetários em centavos (scripts/money.py).
+Gera em memória valores em R$ nos formatos dos CSVs ('1234.56', '1.234,56',
+'R$ 1.234,56') e compara leitura, soma e soma por grupo em centavos int64,
+em Decimal (um objeto por valor) e em float, mostrando quantos centavos a
+soma em float acumulada linha a linha (como um saldo corrente) erra em
+relação à soma exata.
+"""
+
+import re
+import sys
+import argparse
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Leituras conferidas antes das medições: (texto, centavos esperados)
+CASES = [
+    ('9.500,00', 950000),
+    ('R$ 1.234,56', 123456),
+    ('1234.56', 123456),
+    ('1234,5', 123450),
+    ('R$ 37.500', 3750000),
+    ('R$ 500.000', 50000000),
+    ('1.250.000', 125000000),
+    ('0.500', 50),
+    ('12.5', 1250),
+    ('-R$ 1.000', -100000),
+    ('abc', None),
+    ('9,500.00', None),
+    ('1,5.0', None),
+    ('1,234', None),
+]
+
+
+def check_cases():
+    """Confere to_cents e parse_cents contra CASES; retorna as divergências."""
+    from money import parse_cents, to_cents
+
+    parsed = parse_cents(pd.Series([text for text, _ in CASES], dtype=object))
+    wrong = []
+    for (text, expected), vectorized in zip(CASES, parsed):
+        vectorized = None if vectorized is pd.NA else int(vectorized)
+        if to_cents(text) != expected or vectorized != expected:
+            wrong.append(f"{text!r}: esperado {expected}, to_cents {to_cents(text)}, "
+                         f"parse_cents {vectorized}")
+    return wrong
+
+
+def generate_values(rows, groups=1000, seed=42):
+    """Série de valores em texto (formatos misturados) e os grupos de cada linha."""
+    rng = np.random.default_rng(seed)
+    cents = rng.integers(1, 5_000_000_00, rows)
+    reais = [f"{c // 100}.{c % 100:02d}" for c in cents.tolist()]
+    brazilian = [f"{c // 100:,}".replace(',', '.') + f",{c % 100:02d}" for c in cents.tolist()]
+    formato = rng.integers(0, 3, rows)
+    text = np.where(formato == 0, reais, brazilian)
+    text = np.where(formato == 2, np.char.add('R$ ', text.astype(str)), text)
+    return pd.Series(text, dtype=object), rng.integers(0, groups, rows), int(cents.sum())
+
+
+def parse_decimal(values):
+    """Leitura com um Decimal por valor (referência exata, linha a linha)."""
+    from money import IGNORED_CHARS, normalize_number
+
+    pattern = re.compile(IGNORED_CHARS)
+    return [Decimal(normalize_number(pattern.sub('', value))) for value in values]
+
+
+def parse_float(values):
+    """Leitura vetorizada direto para float (como era feito antes)."""
+    text = values.astype('string').str.replace(r'^R\$\s*', '', regex=True)
+    brazilian = text.str.contains(',', regex=False)
+    text = text.mask(brazilian, text.str.replace('.', '', regex=False)
+                                    .str.replace(',', '.', regex=False))
+    return pd.to_numeric(text).to_numpy(dtype=float)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    from money import parse_cents, sum_cents
+
+    parser = argparse.ArgumentParser(description='Benchmark de valores monetários em centavos')
+    parser.add_argument('--tamanhos', type=str, default='10000,100000,1000000',
+                        help='Quantidades de valores separadas por vírgula')
+    parser.add_argument('--grupos', type=int, default=1000,
+                        help='Quantidade de grupos na soma agrupada')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    wrong = check_cases()
+    if wrong:
+        raise SystemExit("❌ Leitura divergente:\n  " + "\n  ".join(wrong))
+
+    print("⏱️  Benchmark: valores monetários (centavos int64 x Decimal x float)")
+    print("-" * 86)
+    print(f"{'valores':>10} {'etapa':<14} {'centavos':>10} {'Decimal':>10} {'float':>10} "
+          f"{'erro float (¢)':>16}")
+
+    for rows in [int(size) for size in args.tamanhos.split(',')]:
+        values, groups, expected = generate_values(rows, args.grupos, args.seed)
+
+        cents, cents_parse = timed(parse_cents, values)
+        decimals, decimal_parse = timed(parse_decimal, values)
+        floats, float_parse = timed(parse_float, values)
+        print(f"{rows:>10,} {'leitura':<14} {cents_parse:>9.3f}s {decimal_parse:>9.3f}s "
+              f"{float_parse:>9.3f}s {'':>16}")
+
+        total, cents_sum = timed(sum_cents, cents)
+        decimal_total, decimal_sum = timed(sum, decimals, Decimal(0))
+        float_total, float_sum = timed(lambda: np.cumsum(floats)[-1])
+        if total != expected or decimal_total != Decimal(expected).scaleb(-2):
+            raise SystemExit("❌ Soma exata divergente")
+        error = round(float_total * 100) - expected
+        print(f"{rows:>10,} {'soma':<14} {cents_sum:>9.3f}s {decimal_sum:>9.3f}s "
+              f"{float_sum:>9.3f}s {error:>16}")
+
+        by_cents, cents_group = timed(lambda: cents.groupby(groups).sum())
+        by_decimal, decimal_group = timed(lambda: pd.Series(decimals).groupby(groups).sum())
+        by_float, float_group = timed(lambda: pd.Series(floats).groupby(groups).sum())
+        wrong = int((np.rint(by_float.to_numpy() * 100) != by_cents.to_numpy(dtype='int64')).sum())
+        print(f"{rows:>10,} {'soma/grupo':<14} {cents_group:>9.3f}s {decimal_group:>9.3f}s "
+              f"{float_group:>9.3f}s {f'{wrong} grupos':>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark do índice compacto de propriedades (scripts/property_index.py).
+Gera portfólios sintéticos no layout do banco e compara, por tamanho, o
+índice (construção, gravação e carga do snapshot mmap) com um DataFrame das
+mesmas colunas: memória por propriedade, abrir e buscar um lote de códigos
+(snapshot x Parquet + índice do pandas, o caso de um script que acabou de
+começar), busca de um código, busca em lote e consulta por faixa de
+valor_avaliacao.
+"""
+
+import sys
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def generate_frame(rows, seed=42):
+    """Portfólio sintético no layout do banco, com as colunas do índice."""
+    from generate_synthetic_data import generate_propriedades
+    from import_propriedades import prepare_frame
+    from property_index import SOURCE_COLUMNS
+
+    frame = prepare_frame(generate_propriedades(rows, seed).replace('N/A', None))
+    frame.insert(0, 'id', np.arange(1, len(frame) + 1))
+    return frame[SOURCE_COLUMNS].reset_index(drop=True)
+
+
+def best_of(repeat, func):
+    """Melhor tempo (s) de `repeat` execuções e o último resultado."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    from property_index import PropertyIndex
+
+    parser = argparse.ArgumentParser(description='Benchmark do índice compacto de propriedades')
+    parser.add_argument('--tamanhos', type=str, default='10000,100000,1000000',
+                        help='Quantidades de propriedades separadas por vírgula')
+    parser.add_argument('--lote', type=int, default=10000,
+                        help='Códigos por busca em lote')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Execuções por medição (mostra a melhor)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark: índice de propriedades (snapshot mmap) x DataFrame")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in [int(size) for size in args.tamanhos.split(',')]:
+            df = generate_frame(rows, args.seed)
+            rng = np.random.default_rng(args.seed)
+            keys = df['codigo'].astype(str).to_numpy()[rng.integers(0, len(df), args.lote)]
+            key = str(keys[0])
+            path = Path(tmp) / f'propriedades_{rows}.idx'
+            parquet_path = Path(tmp) / f'propriedades_{rows}.parquet'
+            df.to_parquet(parquet_path, index=False)
+
+            build, index = best_of(1, lambda: PropertyIndex.from_frame(df))
+            save, _ = best_of(1, lambda: index.save(path))
+            load, index = best_of(args.repeat, lambda: PropertyIndex.load(path))
+
+            by_code = df.set_index(df['codigo'].astype(str))
+            valores = df['valor_avaliacao']
+            timings = {
+                'abrir + lote': (
+                    best_of(args.repeat, lambda: PropertyIndex.load(path).rows(keys))[0],
+                    best_of(args.repeat, lambda: pd.Index(
+                        pd.read_parquet(parquet_path)['codigo'].astype(str)).get_indexer(keys))[0],
+                ),
+                'um código': (
+                    best_of(args.repeat, lambda: index.row(key))[0],
+                    best_of(args.repeat, lambda: by_code.index.get_loc(key))[0],
+                ),
+                f'lote de {args.lote:,}': (
+                    best_of(args.repeat, lambda: index.rows(keys))[0],
+                    best_of(args.repeat, lambda: by_code.index.get_indexer(keys))[0],
+                ),
+                'faixa de valor': (
+                    best_of(args.repeat, lambda: index.value_range(100_000, 200_000))[0],
+                    best_of(args.repeat, lambda: np.flatnonzero(
+                        ((valores >= 100_000) & (valores <= 200_000)).to_numpy()))[0],
+                ),
+            }
+            expected = int(((valores >= 100_000) & (valores <= 200_000)).sum())
+            if len(index.value_range(100_000, 200_000)) != expected:
+                raise SystemExit("❌ Consulta por faixa divergente do DataFrame")
+
+            frame_bytes = df.memory_usage(deep=True).sum()
+            print(f"\n{rows:,} propriedades")
+            print(f"  construção {build:.3f}s, gravação {save:.3f}s, carga {load * 1000:.2f} ms")
+            print(f"  memória: índice {index.nbytes / len(index):.0f} bytes/propriedade "
+                  f"(com as estruturas de busca), DataFrame {frame_bytes / len(df):.0f} "
+                  f"bytes/propriedade (só os dados)")
+            print(f"  {'consulta':<20} {'índice':>12} {'DataFrame':>12}")
+            for label, (index_s, frame_s) in timings.items():
+                print(f"  {label:<20} {index_s * 1000:>10.3f}ms {frame_s * 1000:>10.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Regressão de planos de consulta das views e consultas quentes.
+
+Carrega um portfólio sintético (scripts/generate_synthetic_data.py) no banco
+de benchmark pelos importadores de verdade, roda EXPLAIN (ANALYZE, BUFFERS)
+em cada view de init.sql e nas consultas mais frequentes dos scripts e da
+API, e compara o formato do plano e a latência com a linha de base gravada
+em data/benchmarks/planos.json. Sai com código 1 quando uma consulta passa
+a fazer Seq Scan em uma tabela que antes não varria (ou em uma consulta que
+nunca deveria varrer) ou fica mais lenta além da tolerância.
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+import psycopg2
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+DEFAULT_BASELINE = './data/benchmarks/planos.json'
+# Diferenças absolutas abaixo disso são ruído de medição, não regressão
+MIN_REGRESSION_MS = 2.0
+# Tabelas (ou partições) com menos páginas que isso são varridas por
+# escolha legítima do planejador e não contam como Seq Scan
+MIN_SEQ_SCAN_PAGES = 100
+
+
+def hot_queries():
+    """
+    Consultas medidas: nome -> (SQL, permite Seq Scan[, {parâmetro: chave de
+    sample_params()} quando os nomes diferem]). As views agregam a tabela
+    inteira e podem varrê-la; buscas pontuais e páginas nunca.
+    """
+    from cdc import FETCH_CHANGES_SQL
+    from export_dados import build_page_query
+
+    return {
+        'vw_resumo_portfolio': ("SELECT * FROM vw_resumo_portfolio", True),
+        'vw_propriedades_por_cidade': ("SELECT * FROM vw_propriedades_por_cidade", True),
+        'vw_transacoes_recentes': ("SELECT * FROM vw_transacoes_recentes", False),
+        'vw_avaliacao_atual': ("SELECT * FROM vw_avaliacao_atual", True),
+        'propriedade_por_codigo': (
+            "SELECT id FROM propriedades WHERE codigo = %(codigo)s", False),
+        'propriedade_por_id': (
+            "SELECT * FROM propriedades WHERE id = %(id)s", False),
+        'avaliacoes_da_propriedade': (
+            "SELECT * FROM avaliacoes WHERE propriedade_id = %(id)s "
+            "ORDER BY data_referencia", False),
+        'transacoes_da_propriedade': (
+            "SELECT * FROM transacoes WHERE propriedade_id = %(id)s "
+            "ORDER BY data_transacao DESC LIMIT 100", False),
+        'api_pagina_propriedades': (
+            "SELECT id, codigo, nome, valor_avaliacao FROM propriedades "
+            "WHERE id > %(after_id)s ORDER BY id LIMIT 51", False),
+        'exportacao_incremental': (build_page_query('propriedades', incremental=True), False),
+        'cdc_alteracoes': (FETCH_CHANGES_SQL, False,
+                           {'xid': 'alteracao_xid', 'id': 'alteracao_id'}),
+    }
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def load_data(properties, transactions, seed, work_dir=None):
+    """
+    Gera o portfólio sintético e o carrega pelos importadores. Snapshot e
+    índice de propriedades vão para o diretório temporário, não para os
+    caminhos do banco principal.
+    """
+    from generate_synthetic_data import generate_dataset
+    from import_propriedades import import_propriedades
+    from import_transacoes import import_transacoes
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        tmp = Path(tmp)
+        os.environ['PORTFOLIO_SNAPSHOT_PATH'] = str(tmp / 'snapshot')
+        os.environ['PROPERTY_INDEX_PATH'] = str(tmp / 'propriedades.idx')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_dataset(tmp, propriedades=properties, transacoes=transactions, seed=seed)
+            import_propriedades(tmp / 'raw' / 'propriedades.csv')
+            import_transacoes([tmp / 'raw' / 'transacoes.csv'])
+
+    conn = get_db_connection()
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+    conn.close()
+
+
+def sample_params(cursor):
+    """
+    Parâmetros das consultas: uma propriedade do meio da tabela e, para o
+    CDC, uma marca d'água no meio do log de alterações.
+    """
+    cursor.execute("""
+        SELECT id, codigo, updated_at FROM propriedades
+        ORDER BY id OFFSET (SELECT count(*) / 2 FROM propriedades) LIMIT 1
+    """)
+    row = cursor.fetchone()
+    if row is None:
+        print("❌ Tabela propriedades vazia (carregue os dados sem --sem-carga)")
+        sys.exit(1)
+    prop_id, codigo, updated_at = row
+    cursor.execute("""
+        SELECT xid::text, id FROM propriedades_alteracoes
+        ORDER BY xid, id OFFSET (SELECT count(*) / 2 FROM propriedades_alteracoes) LIMIT 1
+    """)
+    change_xid, change_id = cursor.fetchone() or ('0', 0)
+    return {'id': prop_id, 'codigo': codigo, 'after_id': prop_id, 'since': updated_at,
+            'alteracao_xid': change_xid, 'alteracao_id': change_id, 'limit': 1000}
+
+
+def plan_nodes(plan, depth=0):
+    """Percorre o plano JSON: (profundidade, nó) em pré-ordem."""
+    yield depth, plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child, depth + 1)
+
+
+def plan_shape(plan):
+    """Formato do plano sem custos nem contagens: um nó por linha, indentado."""
+    lines = []
+    for depth, node in plan_nodes(plan):
+        label = node['Node Type']
+        target = node.get('Index Name') or node.get('Relation Name')
+        lines.append('  ' * depth + (f"{label} ({target})" if target else label))
+    return lines
+
+
+def seq_scans(plan, relpages):
+    """Relações varridas por Seq Scan que têm pelo menos MIN_SEQ_SCAN_PAGES páginas."""
+    return sorted({node['Relation Name'] for _, node in plan_nodes(plan)
+                   if node['Node Type'] == 'Seq Scan'
+                   and relpages.get(node['Relation Name'], 0) >= MIN_SEQ_SCAN_PAGES})
+
+
+def explain(cursor, sql, params, repeat):
+    """
+    EXPLAIN (ANALYZE, BUFFERS) `repeat` vezes após uma execução de
+    aquecimento. Retorna o último plano e o melhor tempo de execução (o
+    menos afetado por outros processos da máquina).
+    """
+    statement = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"
+    cursor.execute(statement, params)
+    times, result = [], None
+    for _ in range(repeat):
+        cursor.execute(statement, params)
+        result = cursor.fetchone()[0][0]
+        times.append(result['Execution Time'])
+    return result, min(times)
+
+
+def measure(conn, repeat):
+    """Mede todas as consultas. Retorna {consulta: medição}."""
+    with conn.cursor() as cursor:
+        params = sample_params(cursor)
+        cursor.execute("SELECT relname, relpages FROM pg_class WHERE relkind = 'r'")
+        relpages = dict(cursor.fetchall())
+
+        results = {}
+        for name, (sql, allows_seq_scan, *renamed) in hot_queries().items():
+            query_params = {**params, **{k: params[v] for k, v in (renamed or [{}])[0].items()}}
+            result, best_ms = explain(cursor, sql, query_params, repeat)
+            plan = result['Plan']
+            results[name] = {
+                'tempo_ms': round(best_ms, 3),
+                'planejamento_ms': round(result['Planning Time'], 3),
+                'buffers_lidos': (plan.get('Shared Hit Blocks', 0)
+                                  + plan.get('Shared Read Blocks', 0)),
+                'seq_scans': seq_scans(plan, relpages),
+                'permite_seq_scan': allows_seq_scan,
+                'plano': plan_shape(plan),
+            }
+        conn.rollback()
+    return results
+
+
+def data_volume(conn):
+    """Linhas de cada tabela medida (para saber se a linha de base é comparável)."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT (SELECT count(*) FROM propriedades), (SELECT count(*) FROM transacoes),
+                   (SELECT count(*) FROM avaliacoes)
+        """)
+        propriedades, transacoes, avaliacoes = cursor.fetchone()
+    conn.rollback()
+    return {'propriedades': propriedades, 'transacoes': transacoes, 'avaliacoes': avaliacoes}
+
+
+def compare(baseline, current, tolerance):
+    """
+    Compara com a linha de base. Retorna a lista de falhas (texto); mudanças
+    de formato do plano sem Seq Scan novo só são informadas.
+    """
+    failures = []
+    same_volume = baseline.get('volume') == current['volume']
+    if not same_volume:
+        print(f"⚠️  Volume diferente da linha de base ({baseline.get('volume')}): "
+              f"latências não comparadas")
+
+    print(f"\n📈 Comparação com a linha de base ({baseline.get('executado_em', '?')}, "
+          f"commit {baseline.get('commit') or '?'})")
+    print(f"{'consulta':<28} {'antes':>10} {'agora':>10} {'Δ':>8}  plano")
+    for name, now in current['consultas'].items():
+        before = baseline.get('consultas', {}).get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>10} {now['tempo_ms']:>8.2f}ms {'':>8}  nova")
+            continue
+
+        new_scans = sorted(set(now['seq_scans']) - set(before['seq_scans']))
+        # Sem permissão, qualquer Seq Scan já foi apontado em main()
+        if new_scans and now['permite_seq_scan']:
+            failures.append(f"{name}: Seq Scan novo em {', '.join(new_scans)}")
+        regressed = (same_volume
+                     and now['tempo_ms'] > before['tempo_ms'] * (1 + tolerance)
+                     and now['tempo_ms'] - before['tempo_ms'] > MIN_REGRESSION_MS)
+        if regressed:
+            failures.append(f"{name}: {before['tempo_ms']:.2f}ms -> {now['tempo_ms']:.2f}ms")
+
+        delta = ((now['tempo_ms'] - before['tempo_ms']) / before['tempo_ms'] * 100
+                 if before['tempo_ms'] else 0.0)
+        shape = 'igual' if now['plano'] == before['plano'] else 'mudou'
+        marker = '  ⚠️' if regressed or new_scans else ''
+        print(f"{name:<28} {before['tempo_ms']:>8.2f}ms {now['tempo_ms']:>8.2f}ms "
+              f"{delta:>+7.1f}%  {shape}{marker}")
+        if shape == 'mudou':
+            for line in before['plano']:
+                print(f"      - {line}")
+            for line in now['plano']:
+                print(f"      + {line}")
+    return failures
+
+
+def print_results(results):
+    print(f"\n{'consulta':<28} {'tempo':>10} {'buffers':>9}  Seq Scan")
+    for name, result in results.items():
+        scans = ', '.join(result['seq_scans']) or '-'
+        print(f"{name:<28} {result['tempo_ms']:>8.2f}ms {result['buffers_lidos']:>9,}  {scans}")
+
+
+def main():
+    from benchmark_suite import current_commit, prepare_database, reset_database
+
+    parser = argparse.ArgumentParser(
+        description='Regressão de planos das views e consultas quentes')
+    parser.add_argument('--propriedades', type=int, default=20_000,
+                        help='Propriedades sintéticas carregadas')
+    parser.add_argument('--transacoes', type=int, default=1_000_000,
+                        help='Transações sintéticas carregadas')
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos dados sintéticos')
+    parser.add_argument('--db', type=str,
+                        default=os.getenv('BENCHMARK_POSTGRES_DB', 'bni_gestao_benchmark'),
+                        help='Banco dedicado ao benchmark (é esvaziado antes da carga)')
+    parser.add_argument('--sem-carga', action='store_true',
+                        help='Mede os dados já presentes no banco de benchmark')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Execuções de cada EXPLAIN ANALYZE (mostra a melhor)')
+    parser.add_argument('--linha-de-base', type=str, default=DEFAULT_BASELINE,
+                        help='Arquivo JSON com os planos e tempos de referência')
+    parser.add_argument('--tolerancia', type=float, default=0.5,
+                        help='Aumento relativo de latência tolerado (0.5 = 50%%)')
+    parser.add_argument('--gravar', action='store_true',
+                        help='Grava esta execução como a nova linha de base')
+    parser.add_argument('--work-dir', type=str, default=None,
+                        help='Diretório para os arquivos temporários (padrão: do sistema)')
+    args = parser.parse_args()
+
+    print("⏱️  Regressão de planos de consulta")
+    print(f"   Banco: {args.db}")
+    print("-" * 60)
+
+    prepare_database(args.db)
+    if not args.sem_carga:
+        print(f"📦 Carregando {args.propriedades:,} propriedades "
+              f"e {args.transacoes:,} transações...")
+        reset_database()
+        load_data(args.propriedades, args.transacoes, args.seed, args.work_dir)
+
+    conn = get_db_connection()
+    try:
+        run = {
+            'executado_em': datetime.now().isoformat(timespec='seconds'),
+            'commit': current_commit(),
+            'volume': data_volume(conn),
+            'consultas': measure(conn, args.repeticoes),
+        }
+    finally:
+        conn.close()
+    print_results(run['consultas'])
+
+    # Seq Scan em consulta que nunca deveria varrer falha mesmo sem linha de base
+    failures = [f"{name}: Seq Scan em {', '.join(result['seq_scans'])}"
+                for name, result in run['consultas'].items()
+                if result['seq_scans'] and not result['permite_seq_scan']]
+
+    baseline_path = Path(args.linha_de_base)
+    if baseline_path.exists() and not args.gravar:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            failures += compare(json.load(f), run, args.tolerancia)
+
+    if args.gravar or not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False, default=str)
+        print(f"\n💾 Linha de base gravada em {baseline_path}")
+
+    print("-" * 60)
+    if failures:
+        print(f"❌ {len(failures)} regressão(ões) de plano:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("✅ Planos sem regressão")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark do layout de armazenamento de propriedades (migração 008).
+Carrega o mesmo portfólio sintético em dois schemas isolados do banco: o
+layout anterior (colunas repetidas em metadata, GIN de metadata e índice
+extra em codigo) e o enxuto (metadata só com o ID da planilha). Compara
+tamanho da tabela e dos índices, tempo de carga e de uma reimportação
+(UPDATE de todas as linhas, como import_propriedades.py faz).
+"""
+
+import os
+import sys
+import argparse
+import json
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+from psycopg2.extras import execute_values
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCHEMAS = ('bench_layout_antigo', 'bench_layout_enxuto')
+
+TABLE_DDL = """
+    DROP SCHEMA IF EXISTS {schema} CASCADE;
+    CREATE SCHEMA {schema};
+    SET search_path TO {schema}, public;
+    CREATE TABLE propriedades (
+        id SERIAL PRIMARY KEY,
+        codigo VARCHAR(50) UNIQUE NOT NULL,
+        codigo_cc VARCHAR(50),
+        nome VARCHAR(500) NOT NULL,
+        tipo_estoque VARCHAR(50),
+        valor_avaliacao DECIMAL(12, 2),
+        valor_2023 DECIMAL(12, 2),
+        valor_2024 DECIMAL(12, 2),
+        preco_promessa DECIMAL(12, 2),
+        status VARCHAR(100) DEFAULT 'Concluído',
+        data_habite_se_prevista DATE,
+        observacoes TEXT,
+        metadata JSONB DEFAULT '{{}}',
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX ON propriedades(status);
+    CREATE INDEX ON propriedades(valor_avaliacao);
+    CREATE INDEX ON propriedades USING GIN(nome gin_trgm_ops);
+    CREATE INDEX ON propriedades USING GIN(codigo_cc gin_trgm_ops);
+    CREATE INDEX ON propriedades(updated_at, id);
+"""
+
+# Índices que a migração 008 removeu
+OLD_INDEXES_DDL = """
+    CREATE INDEX idx_propriedades_codigo ON propriedades(codigo);
+    CREATE INDEX idx_propriedades_metadata ON propriedades USING GIN(metadata);
+"""
+
+COLUMNS = ['codigo', 'codigo_cc', 'nome', 'tipo_estoque', 'valor_avaliacao', 'valor_2023',
+           'valor_2024', 'preco_promessa', 'status', 'data_habite_se_prevista',
+           'observacoes', 'metadata']
+
+INSERT_SQL = f"INSERT INTO propriedades ({', '.join(COLUMNS)}) VALUES %s"
+
+UPDATE_SQL = f"""
+    UPDATE propriedades p SET
+        {', '.join(f'{c} = v.{c}' for c in COLUMNS[1:])},
+        updated_at = CURRENT_TIMESTAMP
+    FROM (VALUES %s) AS v ({', '.join(COLUMNS)})
+    WHERE p.codigo = v.codigo
+"""
+
+UPDATE_TEMPLATE = ('(%s, %s, %s, %s, %s::numeric, %s::numeric, %s::numeric, %s::numeric, '
+                   '%s, %s::date, %s, %s::jsonb)')
+
+SIZE_SQL = """
+    SELECT pg_table_size('propriedades'), pg_indexes_size('propriedades'),
+           (SELECT pg_column_size(metadata) FROM propriedades LIMIT 1)
+"""
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def generate_rows(count, seed):
+    """Linhas de propriedades (layout do banco) nos dois formatos de metadata."""
+    from generate_synthetic_data import generate_propriedades
+    from import_propriedades import prepare_frame
+
+    raw = generate_propriedades(count, seed).replace('N/A', None)
+    frame = prepare_frame(raw)
+    frame = frame.astype(object).where(frame.notna(), None)
+
+    old_rows, lean_rows = [], []
+    for csv_id, record in zip(raw['ID'], frame.to_dict('records')):
+        values = [record[c] for c in COLUMNS[:-1]]
+        habite_se = record['data_habite_se_prevista']
+        lean_rows.append(values + [json.dumps({'id': int(csv_id)})])
+        old_rows.append(values + [json.dumps({
+            'id': int(csv_id),
+            'codigo_cc': record['codigo_cc'],
+            'valor_2023': record['valor_2023'],
+            'valor_2024': record['valor_2024'],
+            'preco_promessa': record['preco_promessa'],
+            'data_habite_se': str(habite_se) if habite_se else None,
+            'tipo_estoque': record['tipo_estoque'],
+        })])
+    return {'bench_layout_antigo': old_rows, 'bench_layout_enxuto': lean_rows}
+
+
+def run_benchmark(conn, schema, rows, page_size):
+    """Cria o schema, carrega e reimporta as linhas e mede tempos e tamanhos."""
+    results = {}
+    conn.autocommit = True
+
+    with conn.cursor() as cursor:
+        cursor.execute(TABLE_DDL.format(schema=schema))
+        if schema == 'bench_layout_antigo':
+            cursor.execute(OLD_INDEXES_DDL)
+
+        start = time.perf_counter()
+        execute_values(cursor, INSERT_SQL, rows, page_size=page_size)
+        results['carga_s'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        execute_values(cursor, UPDATE_SQL, rows, template=UPDATE_TEMPLATE, page_size=page_size)
+        results['reimportacao_s'] = time.perf_counter() - start
+
+        cursor.execute("VACUUM ANALYZE propriedades")
+        cursor.execute(SIZE_SQL)
+        table_bytes, index_bytes, metadata_bytes = cursor.fetchone()
+        results['tabela_mb'] = table_bytes / 1024 / 1024
+        results['indices_mb'] = index_bytes / 1024 / 1024
+        results['metadata_bytes_linha'] = metadata_bytes
+        cursor.execute("SET search_path TO public")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark do layout de armazenamento de propriedades')
+    parser.add_argument('--rows', type=int, default=100_000,
+                       help='Número de propriedades sintéticas')
+    parser.add_argument('--page-size', type=int, default=1000,
+                       help='Linhas por instrução na carga e na reimportação')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true',
+                       help='Mantém os schemas de benchmark ao final')
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark: layout de propriedades anterior x enxuto (migração 008)")
+    print(f"   {args.rows:,} propriedades sintéticas")
+    print("-" * 70)
+
+    rows = generate_rows(args.rows, args.seed)
+    conn = get_db_connection()
+    results = {}
+    try:
+        for schema in SCHEMAS:
+            print(f"▶️  {schema}...")
+            results[schema] = run_benchmark(conn, schema, rows[schema], args.page_size)
+    finally:
+        if not args.keep:
+            with conn.cursor() as cursor:
+                for schema in SCHEMAS:
+                    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.close()
+
+    print("-" * 70)
+    print(f"{'métrica':<28} {'anterior':>12} {'enxuto':>12} {'redução':>10}")
+    for metric in results[SCHEMAS[0]]:
+        old, lean = results[SCHEMAS[0]][metric], results[SCHEMAS[1]][metric]
+        reduction = f"{(1 - lean / old) * 100:.0f}%" if old else '-'
+        print(f"{metric:<28} {old:>12.2f} {lean:>12.2f} {reduction:>10}")
+
+
+if __name__ == '__main__':
+    main()
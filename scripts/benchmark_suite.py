@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmark ponta a ponta com dados sintéticos.
+Para cada tamanho (padrão 1k, 100k e 1M linhas) gera um portfólio com
+scripts/generate_synthetic_data.py e mede o caminho principal de cada script
+(validação, importação, transações, relatórios IFRS, Obsidian e sync HF)
+contra um banco PostgreSQL local dedicado. Os resultados são acumulados em
+um histórico JSON e comparados com a execução anterior; com
+--falhar-em-regressao a suíte sai com código 1 quando alguma etapa piora
+além da tolerância.
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+SCHEMAS_DIR = ROOT_DIR / 'data' / 'schemas'
+
+DEFAULT_SIZES = '1000,100000,1000000'
+DEFAULT_HISTORY = './data/benchmarks/historico.json'
+# Diferenças absolutas abaixo disso são ruído de medição, não regressão
+MIN_REGRESSION_SECONDS = 0.05
+
+TRUNCATE_SQL = """
+    TRUNCATE propriedades, transacoes, sincronizacoes, relatorios_ifrs,
+             propriedades_alteracoes, cdc_consumidores
+    RESTART IDENTITY CASCADE
+"""
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except Exception as e:
+        print(f"❌ Erro ao conectar ao banco: {e}")
+        sys.exit(1)
+
+
+def prepare_database(db_name):
+    """
+    Aponta POSTGRES_DB para o banco de benchmark e o inicializa com
+    init_database.py se o schema ainda não existir.
+    """
+    os.environ['POSTGRES_DB'] = db_name
+    if schema_exists():
+        return
+
+    print(f"🗄️  Inicializando o banco '{db_name}'...")
+    completed = subprocess.run(
+        [sys.executable, str(SCRIPT_DIR / 'init_database.py')],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    if completed.returncode != 0:
+        print(completed.stdout)
+        print(f"❌ Falha ao inicializar o banco '{db_name}'")
+        sys.exit(1)
+
+
+def schema_exists():
+    """True se o banco configurado existe e já tem a tabela propriedades."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+    except psycopg2.OperationalError:
+        return False
+    with conn, conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('propriedades') IS NOT NULL")
+        exists = cursor.fetchone()[0]
+    conn.close()
+    return exists
+
+
+def reset_database():
+    """Esvazia as tabelas de dados entre um tamanho e outro."""
+    conn = get_db_connection()
+    with conn, conn.cursor() as cursor:
+        cursor.execute(TRUNCATE_SQL)
+    conn.close()
+
+
+# ============================================
+# Etapas: cada uma recebe o contexto do tamanho atual e retorna True/False
+# ============================================
+
+def step_gerar(ctx):
+    from generate_synthetic_data import generate_dataset
+
+    generate_dataset(ctx['work_dir'], propriedades=ctx['tamanho'],
+                     transacoes=ctx['tamanho'], seed=ctx['seed'])
+    return True
+
+
+def step_validar(ctx):
+    from validate_schemas import validate_all_csvs
+
+    return validate_all_csvs(ctx['work_dir'] / 'raw', SCHEMAS_DIR)
+
+
+def step_importar(ctx):
+    from import_propriedades import import_propriedades
+
+    import_propriedades(ctx['work_dir'] / 'raw' / 'propriedades.csv')
+    return True
+
+
+def step_importar_transacoes(ctx):
+    from import_transacoes import import_transacoes
+
+    import_transacoes([ctx['work_dir'] / 'raw' / 'transacoes.csv'])
+    return True
+
+
+def step_relatorios(ctx):
+    from generate_ifrs_reports import (generate_ifrs_report_excel, generate_ifrs_report_pdf,
+                                       load_property_data)
+
+    df = load_property_data(ctx['work_dir'] / 'processed')
+    output_dir = ctx['work_dir'] / 'reports'
+    output_dir.mkdir(exist_ok=True)
+    generate_ifrs_report_pdf(df, output_dir / 'relatorio.pdf', ctx['periodo'])
+    generate_ifrs_report_excel(df, output_dir / 'relatorio.xlsx', ctx['periodo'])
+    return True
+
+
+def step_obsidian(ctx):
+    from export_to_obsidian import create_index_note, create_obsidian_note, load_property_data
+
+    df = load_property_data(ctx['work_dir'] / 'processed')
+    output_dir = ctx['work_dir'] / 'vault'
+    for _, prop in df.iterrows():
+        create_obsidian_note(prop, output_dir)
+    create_index_note(df, output_dir)
+    return True
+
+
+def step_sync_hf(ctx):
+    """Conversão para Dataset e envio delta para um hub local (sem rede)."""
+    import sync_huggingface as sync
+
+    data_dict = sync.load_data_from_directory(ctx['work_dir'] / 'processed')
+    if sync.create_dataset_from_data(data_dict) is None:
+        return False
+    return sync.push_delta_to_huggingface(
+        data_dict, 'benchmark/bni', None, ctx['work_dir'] / 'hub_manifest.json',
+        api=sync.LocalHubDirectory(ctx['work_dir'] / 'hub')
+    )
+
+
+# etapa: (função, etapas das quais depende, módulos importados antes da medição)
+STEPS = {
+    'gerar': (step_gerar, [], ['generate_synthetic_data', 'import_propriedades', 'pandas']),
+    'validar': (step_validar, ['gerar'], ['validate_schemas', 'jsonschema']),
+    'importar': (step_importar, ['gerar'], ['import_propriedades']),
+    'importar-transacoes': (step_importar_transacoes, ['importar'], ['import_transacoes']),
+    'relatorios': (step_relatorios, ['gerar'], ['generate_ifrs_reports', 'reportlab.platypus',
+                                                 'xlsxwriter']),
+    'obsidian': (step_obsidian, ['gerar'], ['export_to_obsidian', 'yaml']),
+    'sync-hf': (step_sync_hf, ['gerar'], ['sync_huggingface', 'datasets']),
+}
+
+
+def warm_imports(steps):
+    """
+    Importa de antemão os módulos das etapas: como os scripts importam
+    pandas, reportlab, datasets etc. sob demanda, a primeira medição
+    incluiria o tempo de import (ver benchmark_import_time.py).
+    """
+    for name in steps:
+        for module in STEPS[name][2]:
+            importlib.import_module(module)
+
+
+def run_step(name, ctx, verbose=False):
+    """Executa uma etapa e retorna (ok, segundos). A saída do script é descartada."""
+    func = STEPS[name][0]
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    try:
+        with output:
+            ok = func(ctx)
+    except SystemExit:
+        ok = False
+    return bool(ok), time.perf_counter() - start
+
+
+def estimate_seconds(name, size, results):
+    """Extrapola linearmente o tempo da etapa a partir do maior tamanho já medido."""
+    measured = [(int(s), steps[name]) for s, steps in results.items()
+                if isinstance(steps.get(name), (int, float))]
+    if not measured:
+        return None
+    previous_size, seconds = max(measured)
+    return seconds * size / previous_size
+
+
+def run_suite(sizes, steps, seed, limit_s=None, verbose=False, work_dir=None):
+    """
+    Executa as etapas para cada tamanho. Retorna {tamanho: {etapa: segundos}};
+    etapas puladas ou com falha são registradas como texto ('pulada', 'falhou').
+    """
+    if work_dir:
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    for size in sizes:
+        print(f"\n📏 {size:,} linhas".replace(',', '.'))
+        reset_database()
+        results[str(size)] = timings = {}
+
+        with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+            ctx = {'work_dir': Path(tmp), 'tamanho': size, 'seed': seed,
+                   'periodo': str(datetime.now().year)}
+
+            for name in steps:
+                blocked = [dep for dep in STEPS[name][1]
+                           if not isinstance(timings.get(dep), float)]
+                if blocked:
+                    timings[name] = 'pulada'
+                    print(f"  ⏭️  {name:<22} pulada (depende de {', '.join(blocked)})")
+                    continue
+
+                # 'gerar' é pré-requisito de todas as etapas e nunca é pulada
+                estimate = estimate_seconds(name, size, results) if name != 'gerar' else None
+                if limit_s is not None and estimate is not None and estimate > limit_s:
+                    timings[name] = 'pulada'
+                    print(f"  ⏭️  {name:<22} pulada (estimativa {estimate:.0f}s "
+                          f"> limite {limit_s:.0f}s)")
+                    continue
+
+                ok, seconds = run_step(name, ctx, verbose)
+                if ok:
+                    timings[name] = round(seconds, 4)
+                    print(f"  ✓ {name:<24} {seconds:>9.2f}s")
+                else:
+                    timings[name] = 'falhou'
+                    print(f"  ❌ {name:<23} falhou após {seconds:.2f}s")
+    return results
+
+
+def current_commit():
+    """Commit atual do repositório (ou None fora de um checkout git)."""
+    completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return completed.stdout.strip() or None
+
+
+def load_history(history_path):
+    path = Path(history_path)
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_history(history, history_path):
+    path = Path(history_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+
+
+def compare_runs(previous, current, tolerance):
+    """
+    Compara duas execuções e retorna a lista de regressões
+    [(tamanho, etapa, antes, depois)]. Só compara medições numéricas
+    presentes nas duas.
+    """
+    regressions = []
+    print("\n📈 Comparação com a execução anterior "
+          f"({previous.get('executado_em', '?')}, commit {previous.get('commit') or '?'})")
+    print(f"{'tamanho':>10} {'etapa':<22} {'antes':>10} {'agora':>10} {'Δ':>8}")
+    for size, timings in current['resultados'].items():
+        before_timings = previous.get('resultados', {}).get(size, {})
+        for name, seconds in timings.items():
+            before = before_timings.get(name)
+            if not isinstance(seconds, float) or not isinstance(before, (int, float)):
+                continue
+            delta = (seconds - before) / before * 100 if before else 0.0
+            regressed = (seconds > before * (1 + tolerance)
+                         and seconds - before > MIN_REGRESSION_SECONDS)
+            marker = '  ⚠️' if regressed else ''
+            print(f"{size:>10} {name:<22} {before:>9.2f}s {seconds:>9.2f}s {delta:>+7.1f}%{marker}")
+            if regressed:
+                regressions.append((size, name, before, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Suíte de benchmark ponta a ponta com dados sintéticos')
+    parser.add_argument('--tamanhos', type=str, default=DEFAULT_SIZES,
+                        help='Tamanhos (linhas de propriedades e de transações) '
+                             'separados por vírgula')
+    parser.add_argument('--etapas', nargs='+', default=list(STEPS), metavar='ETAPA',
+                        help=f"Etapas a medir (padrão: todas — {', '.join(STEPS)})")
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos dados sintéticos')
+    parser.add_argument('--db', type=str,
+                        default=os.getenv('BENCHMARK_POSTGRES_DB', 'bni_gestao_benchmark'),
+                        help='Banco dedicado ao benchmark (é esvaziado a cada tamanho)')
+    parser.add_argument('--limite-s', type=float, default=300,
+                        help='Pula a etapa quando a estimativa para o tamanho passar deste tempo')
+    parser.add_argument('--historico', type=str, default=DEFAULT_HISTORY,
+                        help='Arquivo JSON com o histórico de execuções')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='Aumento relativo tolerado antes de apontar regressão (0.2 = 20%%)')
+    parser.add_argument('--falhar-em-regressao', action='store_true',
+                        help='Sai com código 1 se alguma etapa regredir')
+    parser.add_argument('--nao-salvar', action='store_true',
+                        help='Não grava a execução no histórico')
+    parser.add_argument('--work-dir', type=str, default=None,
+                        help='Diretório para os arquivos temporários (padrão: do sistema)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Mostra a saída dos scripts medidos')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.etapas if name not in STEPS]
+    if unknown:
+        parser.error(f"etapa(s) desconhecida(s): {', '.join(unknown)}")
+    try:
+        sizes = [int(size) for size in args.tamanhos.split(',') if size.strip()]
+    except ValueError:
+        parser.error(f"--tamanhos inválido: {args.tamanhos}")
+
+    # A ordem das etapas é a do pipeline; 'gerar' é sempre necessária
+    steps = [name for name in STEPS if name == 'gerar' or name in args.etapas]
+
+    print("⏱️  Suíte de benchmark")
+    print(f"   Tamanhos: {', '.join(f'{s:,}'.replace(',', '.') for s in sizes)}")
+    print(f"   Banco: {args.db}  Seed: {args.seed}")
+    print("-" * 50)
+
+    prepare_database(args.db)
+    warm_imports(steps)
+    results = run_suite(sizes, steps, args.seed, args.limite_s, args.verbose, args.work_dir)
+
+    run = {
+        'executado_em': datetime.now().isoformat(timespec='seconds'),
+        'commit': current_commit(),
+        'seed': args.seed,
+        'resultados': results,
+    }
+    history = load_history(args.historico)
+    regressions = compare_runs(history[-1], run, args.tolerancia) if history else []
+
+    if not args.nao_salvar:
+        history.append(run)
+        save_history(history, args.historico)
+        print(f"\n💾 Execução registrada em {args.historico}")
+
+    failed = [(size, name) for size, timings in results.items()
+              for name, value in timings.items() if value == 'falhou']
+    print("-" * 50)
+    if failed:
+        print(f"❌ {len(failed)} etapa(s) falharam: "
+              + ', '.join(f"{name} ({size})" for size, name in failed))
+    if regressions:
+        print(f"⚠️  {len(regressions)} regressão(ões) acima de {args.tolerancia:.0%}")
+        if args.falhar_em_regressao:
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+    print("✅ Suíte concluída")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark de transacoes: tabela simples (heap) vs particionada por ano
+(como a migração 001; --granularity month mede partições mensais).
+Carrega transações sintéticas em dois schemas isolados do banco e compara
+carga, consulta de transações recentes, agregação mensal e VACUUM.
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCHEMAS = ('bench_heap', 'bench_part')
+
+COMMON_DDL = """
+    DROP SCHEMA IF EXISTS {schema} CASCADE;
+    CREATE SCHEMA {schema};
+    SET search_path TO {schema}, public;
+    CREATE TABLE propriedades (
+        id SERIAL PRIMARY KEY,
+        codigo VARCHAR(50) UNIQUE NOT NULL,
+        nome VARCHAR(500) NOT NULL
+    );
+    INSERT INTO propriedades (codigo, nome)
+    SELECT 'B' || g, 'IMOVEL ' || g FROM generate_series(1, %(properties)s) g;
+"""
+
+HEAP_DDL = """
+    CREATE TABLE transacoes (
+        id SERIAL PRIMARY KEY,
+        propriedade_id INTEGER NOT NULL REFERENCES propriedades(id),
+        tipo_transacao VARCHAR(50) NOT NULL,
+        valor DECIMAL(12, 2) NOT NULL,
+        data_transacao DATE NOT NULL,
+        categoria VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX ON transacoes(propriedade_id);
+    CREATE INDEX ON transacoes(data_transacao);
+    CREATE INDEX ON transacoes(tipo_transacao);
+    CREATE INDEX ON transacoes(categoria);
+"""
+
+PARTITIONED_DDL = """
+    CREATE TABLE transacoes (
+        id SERIAL,
+        propriedade_id INTEGER NOT NULL REFERENCES propriedades(id),
+        tipo_transacao VARCHAR(50) NOT NULL,
+        valor DECIMAL(12, 2) NOT NULL,
+        data_transacao DATE NOT NULL,
+        categoria VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, data_transacao)
+    ) PARTITION BY RANGE (data_transacao);
+    CREATE TABLE transacoes_default PARTITION OF transacoes DEFAULT;
+    CREATE INDEX ON transacoes(propriedade_id);
+    CREATE INDEX ON transacoes(data_transacao, created_at);
+    CREATE INDEX ON transacoes(tipo_transacao);
+    CREATE INDEX ON transacoes(categoria);
+    DO $$
+    DECLARE m DATE;
+    BEGIN
+        FOR m IN SELECT generate_series(
+                date_trunc(%(granularity)s, %(start)s::date), %(end)s::date,
+                ('1 ' || %(granularity)s)::interval)::date LOOP
+            EXECUTE format(
+                'CREATE TABLE %%I PARTITION OF transacoes FOR VALUES FROM (%%L) TO (%%L)',
+                'transacoes_' || to_char(m, 'YYYY_MM'), m,
+                (m + ('1 ' || %(granularity)s)::interval)::date
+            );
+        END LOOP;
+    END $$;
+"""
+
+LOAD_SQL = """
+    INSERT INTO transacoes (propriedade_id, tipo_transacao, valor, data_transacao, categoria)
+    SELECT
+        1 + (g %% %(properties)s),
+        (ARRAY['compra','venda','aluguel','manutencao','reforma','outro'])[1 + (g %% 6)],
+        round((random() * 50000)::numeric, 2),
+        %(start)s::date + ((g::bigint * %(days)s) / %(rows)s)::int,
+        'cat_' || (g %% 20)
+    FROM generate_series(1, %(rows)s) g
+"""
+
+UPDATE_RECENT_SQL = """
+    UPDATE transacoes SET categoria = 'revisada'
+    WHERE data_transacao >= %(last_month)s::date AND id %% 100 = 0
+"""
+
+QUERIES = {
+    'recentes_top100': """
+        SELECT t.id, t.valor, t.data_transacao, p.codigo
+        FROM (
+            SELECT id, valor, data_transacao, created_at, propriedade_id
+            FROM transacoes
+            ORDER BY data_transacao DESC, created_at DESC
+            LIMIT 100
+        ) t
+        JOIN propriedades p ON p.id = t.propriedade_id
+    """,
+    'recentes_top100_join_original': """
+        SELECT t.id, t.valor, t.data_transacao, p.codigo
+        FROM transacoes t
+        JOIN propriedades p ON p.id = t.propriedade_id
+        ORDER BY t.data_transacao DESC, t.created_at DESC
+        LIMIT 100
+    """,
+    'agregado_ultimo_mes': """
+        SELECT tipo_transacao, count(*), sum(valor)
+        FROM transacoes
+        WHERE data_transacao >= %(last_month)s::date
+          AND data_transacao < (%(last_month)s::date + INTERVAL '1 month')
+        GROUP BY tipo_transacao
+    """,
+}
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def timed(cursor, statement, params=None, repeat=1):
+    """Executa a instrução `repeat` vezes e retorna o melhor tempo em ms."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(statement, params)
+        if cursor.description:
+            cursor.fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(conn, schema, params, repeat):
+    """Cria o schema, carrega os dados e mede as operações."""
+    partitioned = schema == 'bench_part'
+    results = {}
+    conn.autocommit = True
+
+    with conn.cursor() as cursor:
+        cursor.execute(COMMON_DDL.format(schema=schema), params)
+        cursor.execute(PARTITIONED_DDL if partitioned else HEAP_DDL, params)
+
+        results['carga_ms'] = timed(cursor, LOAD_SQL, params)
+        results['vacuum_analyze_ms'] = timed(cursor, "VACUUM ANALYZE transacoes")
+
+        # Simula a atividade recente: atualiza 1% das linhas do último mês e
+        # mede o VACUUM da tabela que o autovacuum precisaria percorrer
+        cursor.execute(UPDATE_RECENT_SQL, params)
+        hot_table = 'transacoes'
+        if partitioned:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM transacoes WHERE data_transacao = %s LIMIT 1",
+                (params['last_month'],)
+            )
+            hot_table = cursor.fetchone()[0]
+        results['vacuum_tabela_ativa_ms'] = timed(cursor, f"VACUUM {hot_table}")
+        for name, query in QUERIES.items():
+            results[f"{name}_ms"] = timed(cursor, query, params, repeat)
+
+        cursor.execute("""
+            SELECT COALESCE(SUM(pg_total_relation_size(inhrelid)), 0)
+                   + pg_total_relation_size('transacoes')
+            FROM pg_inherits WHERE inhparent = 'transacoes'::regclass
+        """)
+        results['tamanho_mb'] = cursor.fetchone()[0] / 1024 / 1024
+        cursor.execute("SET search_path TO public")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de transacoes heap vs particionada')
+    parser.add_argument('--rows', type=int, default=10_000_000,
+                       help='Número de transações sintéticas')
+    parser.add_argument('--properties', type=int, default=10_000,
+                       help='Número de propriedades sintéticas')
+    parser.add_argument('--years', type=int, default=10,
+                       help='Anos de histórico distribuídos uniformemente')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Repetições de cada consulta (melhor tempo)')
+    parser.add_argument('--granularity', choices=['month', 'year'], default='year',
+                       help='Tamanho das partições na tabela particionada')
+    parser.add_argument('--keep', action='store_true',
+                       help='Mantém os schemas de benchmark ao final')
+
+    args = parser.parse_args()
+
+    end = datetime_today_month()
+    start = end.replace(year=end.year - args.years)
+    params = {
+        'rows': args.rows,
+        'properties': args.properties,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'days': (end - start).days + 27,
+        'last_month': end.isoformat(),
+        'granularity': args.granularity,
+    }
+
+    print("⏱️  Benchmark: transacoes heap vs particionada")
+    print(f"   {args.rows:,} transações, {args.properties:,} propriedades, "
+          f"{args.years} anos ({start} a {end}), partições por {args.granularity}")
+    print("-" * 70)
+
+    conn = get_db_connection()
+    results = {}
+    try:
+        for schema in SCHEMAS:
+            print(f"▶️  {schema}...")
+            results[schema] = run_benchmark(conn, schema, params, args.repeat)
+    finally:
+        if not args.keep:
+            with conn.cursor() as cursor:
+                for schema in SCHEMAS:
+                    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.close()
+
+    print("-" * 70)
+    print(f"{'métrica':<40} {'heap':>12} {'particionada':>14}")
+    for metric in results[SCHEMAS[0]]:
+        heap, part = results['bench_heap'][metric], results['bench_part'][metric]
+        print(f"{metric:<40} {heap:>12.1f} {part:>14.1f}")
+
+
+def datetime_today_month():
+    """Primeiro dia do mês corrente."""
+    from datetime import date
+    return date.today().replace(day=1)
+
+
+if __name__ == '__main__':
+    main()
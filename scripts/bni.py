@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+CLI unificada do BNI Gestão Imobiliária.
+
+    python scripts/bni.py <comando> [argumentos do script]
+
+Cada comando executa o main() de um script de scripts/, com os mesmos
+argumentos. Este módulo só importa a biblioteca padrão: pandas, reportlab,
+datasets, psycopg2 etc. são importados apenas pelo módulo do comando
+executado, e a configuração (pydantic-settings) é carregada uma única vez,
+somente quando um comando vai de fato rodar. `bni --help` e
+`bni <comando> --help` não carregam a configuração.
+"""
+
+import sys
+import argparse
+import importlib
+
+# comando: (módulo em scripts/, descrição)
+COMMANDS = {
+    'init-db': ('init_database', 'Inicializa o banco e aplica migrações pendentes'),
+    'validar': ('validate_schemas', 'Valida os CSVs contra os schemas JSON'),
+    'importar': ('import_propriedades', 'Importa propriedades do CSV para o PostgreSQL'),
+    'importar-transacoes': ('import_transacoes', 'Importa transações em massa (COPY)'),
+    'extrair-observacoes': ('extract_observacoes', 'Extrai aluguéis das observações financeiras'),
+    'gerar-dados': ('generate_synthetic_data', 'Gera portfólio e transações sintéticos'),
+    'relatorios': ('generate_ifrs_reports', 'Gera relatórios IFRS (PDF/Excel)'),
+    'consolidar': ('consolidated_reports', 'Relatório IFRS consolidado de vários portfólios'),
+    'obsidian': ('export_to_obsidian', 'Exporta propriedades para o vault Obsidian'),
+    'sync-hf': ('sync_huggingface', 'Sincroniza com o dataset do Hugging Face'),
+    'buscar': ('buscar_propriedades', 'Busca aproximada de propriedades'),
+    'indice': ('property_index', 'Índice compacto de propriedades (snapshot mmap)'),
+    'snapshot': ('portfolio_snapshot', 'Snapshot Arrow do portfólio (memory-map)'),
+    'exportar': ('export_dados', 'Exportação em massa (NDJSON/CSV/Parquet)'),
+    'cdc': ('cdc', 'Log de alterações de propriedades (CDC)'),
+    'fila': ('job_queue', 'Fila de jobs: enfileirar, worker, status'),
+    'pipeline': ('pipeline', 'Pipeline de dados (DAG de etapas)'),
+    'api': ('api_portfolio', 'API somente leitura do portfólio'),
+    'portfolios': ('portfolios', 'Registro de portfólios e execução por portfólio'),
+}
+
+# bni benchmark <nome>
+BENCHMARKS = {
+    'api': 'benchmark_api',
+    'busca': 'benchmark_busca_propriedades',
+    'hf': 'benchmark_hf_loading',
+    'fila': 'benchmark_job_queue',
+    'transacoes': 'benchmark_transacoes',
+    'importacao': 'benchmark_import_time',
+    'ifrs': 'benchmark_ifrs_analytics',
+    'dinheiro': 'benchmark_money',
+    'indice': 'benchmark_property_index',
+    'armazenamento': 'benchmark_storage_layout',
+    'planos': 'benchmark_query_plans',
+    'suite': 'benchmark_suite',
+}
+
+
+def build_parser():
+    commands = '\n'.join(f"  {name:<22}{description}"
+                         for name, (_, description) in COMMANDS.items())
+    commands += f"\n  {'benchmark':<22}Benchmarks ({', '.join(BENCHMARKS)})"
+    parser = argparse.ArgumentParser(
+        prog='bni',
+        usage='bni <comando> [argumentos]',
+        description='BNI Gestão Imobiliária - CLI unificada',
+        epilog=f"comandos:\n{commands}\n\n"
+               "Use 'bni <comando> --help' para os argumentos de cada comando.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('comando', metavar='comando',
+                        choices=list(COMMANDS) + ['benchmark'])
+    return parser
+
+
+def resolve(argv):
+    """Retorna (nome exibido, módulo, argumentos do script)."""
+    parser = build_parser()
+    if not argv:
+        parser.print_help()
+        sys.exit(0)
+    args = parser.parse_args(argv[:1])
+    rest = argv[1:]
+
+    if args.comando != 'benchmark':
+        return args.comando, COMMANDS[args.comando][0], rest
+
+    if not rest or rest[0] not in BENCHMARKS:
+        parser.error(f"benchmark: escolha um de: {', '.join(BENCHMARKS)}")
+    return f"benchmark {rest[0]}", BENCHMARKS[rest[0]], rest[1:]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    name, module_name, args = resolve(argv)
+
+    if not {'-h', '--help'} & set(args):
+        from config import export_to_environment
+        export_to_environment()
+
+    # O parser do script passa a se identificar como "bni <comando>"
+    sys.argv = [f"bni {name}", *args]
+    module = importlib.import_module(module_name)
+    return module.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Busca aproximada de propriedades por nome, endereço ou código do centro de custo.
+Usa a função buscar_propriedades() do banco (índices de trigramas pg_trgm),
+tolerando abreviações, pontuação e erros de digitação.
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+DEFAULT_LIMIT = 20
+DEFAULT_THRESHOLD = 0.4
+MAX_LIMIT = 200
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def search_properties(conn, termo, limite=DEFAULT_LIMIT, limiar=DEFAULT_THRESHOLD):
+    """
+    Retorna as propriedades mais parecidas com `termo`, da maior para a menor
+    similaridade (0 a 1).
+
+    Args:
+        conn: Conexão psycopg2
+        termo: Texto buscado (ex.: "emilio bumachar", "CC-0042")
+        limite: Número máximo de resultados (até MAX_LIMIT)
+        limiar: Similaridade mínima para um campo ser considerado
+
+    Returns:
+        Lista de dicts com id, codigo, codigo_cc, nome, endereco, cidade e similaridade
+    """
+    termo = (termo or '').strip()
+    if not termo:
+        raise ValueError("Termo de busca vazio")
+    if not 0 < limiar <= 1:
+        raise ValueError("limiar deve estar entre 0 e 1")
+    limite = max(1, min(int(limite), MAX_LIMIT))
+
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(
+            "SELECT * FROM buscar_propriedades(%s, %s, %s)",
+            (termo, limite, limiar)
+        )
+        results = cursor.fetchall()
+    # set_config() da função vale até o fim da transação
+    conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Busca aproximada de propriedades')
+    parser.add_argument('termo', type=str,
+                       help='Nome, endereço ou codigo_cc (aceita erros de digitação)')
+    parser.add_argument('--limite', type=int, default=DEFAULT_LIMIT,
+                       help=f'Número máximo de resultados (até {MAX_LIMIT})')
+    parser.add_argument('--limiar', type=float, default=DEFAULT_THRESHOLD,
+                       help='Similaridade mínima (0-1); menor = mais resultados')
+
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    try:
+        start = time.perf_counter()
+        results = search_properties(conn, args.termo, args.limite, args.limiar)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except (ValueError, psycopg2.Error) as e:
+        print(f"❌ Erro na busca: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if not results:
+        print(f"⚠️  Nenhuma propriedade encontrada para '{args.termo}' ({elapsed_ms:.1f} ms)")
+        return
+
+    print(f"🔍 {len(results)} resultado(s) para '{args.termo}' ({elapsed_ms:.1f} ms)")
+    print("-" * 90)
+    for row in results:
+        print(f"{row['similaridade']:.2f}  {row['codigo']:<12} {row['codigo_cc'] or '-':<10} "
+              f"{row['nome'][:40]:<40} {row['cidade'] or ''}")
+        if row['endereco']:
+            print(f"      {row['endereco'][:80]}")
+
+
+if __name__ == '__main__':
+    main()
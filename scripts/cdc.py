@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Consumo do log de alterações de propriedades (CDC).
+Cada consumidor (obsidian, huggingface, relatórios...) guarda sua marca d'água
+em cdc_consumidores e processa apenas as propriedades alteradas desde a
+última execução, em vez de reprocessar a tabela inteira.
+
+Uso típico num script downstream:
+
+    conn = get_db_connection()
+    if get_position(conn, 'obsidian') is None:
+        register_consumer(conn, 'obsidian')   # marca d'água = agora
+        ...carga completa...
+    else:
+        changed, deleted, position = changed_properties(conn, 'obsidian')
+        ...processa `changed` (ids) e `deleted` (códigos)...
+        commit_position(conn, 'obsidian', position)
+"""
+
+import os
+import sys
+import argparse
+import select
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+CDC_CHANNEL = 'propriedades_alteracoes'
+BATCH_SIZE = 10_000
+
+# Só entram alterações de transações com xid abaixo do xmin do snapshot
+# atual, isto é, já encerradas. Uma transação ainda aberta (com xid menor)
+# jamais terá suas linhas puladas: elas ficam acima da marca d'água.
+# ORDER BY qualificado: sem o nome da tabela, xid seria a coluna de saída
+# (texto), ordenada como texto ('10000' < '9999') e sem usar o índice
+FETCH_CHANGES_SQL = """
+    SELECT id, xid::text AS xid, operacao, propriedade_id, codigo, colunas, alterado_em
+    FROM propriedades_alteracoes
+    WHERE (xid, id) > (%(xid)s::xid8, %(id)s)
+      AND xid < pg_snapshot_xmin(pg_current_snapshot())
+    ORDER BY propriedades_alteracoes.xid, propriedades_alteracoes.id
+    LIMIT %(limit)s
+"""
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def register_consumer(conn, consumer, reset=False):
+    """
+    Registra o consumidor com a marca d'água no instante atual.
+
+    Alterações anteriores ao registro não serão entregues: o consumidor deve
+    fazer uma carga completa logo após registrar-se (alterações durante a
+    carga serão entregues de novo, o que é seguro). Retorna True se criou
+    ou reiniciou o registro.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO cdc_consumidores (consumidor, ultimo_xid, ultimo_id)
+            VALUES (%s, pg_snapshot_xmin(pg_current_snapshot()), 0)
+            ON CONFLICT (consumidor) DO {'UPDATE SET ultimo_xid = EXCLUDED.ultimo_xid, '
+                                        'ultimo_id = 0, alteracoes_processadas = 0, '
+                                        'registrado_em = CURRENT_TIMESTAMP, '
+                                        'atualizado_em = CURRENT_TIMESTAMP'
+                                        if reset else 'NOTHING'}
+        """, (consumer,))
+        created = cursor.rowcount > 0
+    conn.commit()
+    return created
+
+
+def get_position(conn, consumer):
+    """Marca d'água (xid, id) do consumidor, ou None se não registrado."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT ultimo_xid::text, ultimo_id FROM cdc_consumidores WHERE consumidor = %s",
+            (consumer,)
+        )
+        row = cursor.fetchone()
+    conn.rollback()
+    return (row[0], row[1]) if row else None
+
+
+def fetch_changes(conn, consumer, position=None, limit=BATCH_SIZE):
+    """
+    Lê até `limit` alterações após a marca d'água do consumidor.
+
+    Retorna (alterações, nova posição). A posição só é gravada por
+    commit_position(), depois que o consumidor processou as alterações.
+    """
+    if position is None:
+        position = get_position(conn, consumer)
+        if position is None:
+            raise ValueError(f"Consumidor não registrado: {consumer}")
+
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(FETCH_CHANGES_SQL,
+                       {'xid': position[0], 'id': position[1], 'limit': limit})
+        changes = cursor.fetchall()
+    conn.rollback()
+
+    if changes:
+        position = (changes[-1]['xid'], changes[-1]['id'])
+    return changes, position
+
+
+def changed_properties(conn, consumer, limit=None):
+    """
+    Resume todas as alterações pendentes do consumidor.
+
+    Várias alterações da mesma propriedade colapsam na última: retorna
+    (ids alterados/inseridos, códigos excluídos, nova posição).
+    """
+    position = get_position(conn, consumer)
+    if position is None:
+        raise ValueError(f"Consumidor não registrado: {consumer}")
+
+    latest = {}
+    read = 0
+    while limit is None or read < limit:
+        batch = BATCH_SIZE if limit is None else min(BATCH_SIZE, limit - read)
+        changes, position = fetch_changes(conn, consumer, position, batch)
+        for change in changes:
+            latest[change['propriedade_id']] = change
+        read += len(changes)
+        if len(changes) < batch:
+            break
+
+    changed = {pid for pid, c in latest.items() if c['operacao'] != 'D'}
+    deleted = {c['codigo'] for c in latest.values() if c['operacao'] == 'D'}
+    return changed, deleted, position
+
+
+def commit_position(conn, consumer, position, processed=0):
+    """Grava a nova marca d'água do consumidor (após processar as alterações)."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            UPDATE cdc_consumidores
+            SET ultimo_xid = %s::xid8,
+                ultimo_id = %s,
+                alteracoes_processadas = alteracoes_processadas + %s,
+                atualizado_em = CURRENT_TIMESTAMP
+            WHERE consumidor = %s
+        """, (position[0], position[1], processed, consumer))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Consumidor não registrado: {consumer}")
+    conn.commit()
+
+
+def wait_for_changes(conn, timeout=None):
+    """
+    Bloqueia até um NOTIFY de alteração (ou o timeout, em segundos).
+
+    Usa uma conexão em autocommit dedicada ao LISTEN. Retorna True se houve
+    notificação.
+    """
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f"LISTEN {CDC_CHANNEL}")
+    if select.select([conn], [], [], timeout) == ([], [], []):
+        return False
+    conn.poll()
+    conn.notifies.clear()
+    return True
+
+
+def purge_changes(conn, keep_days=30):
+    """
+    Remove do log as alterações já lidas por todos os consumidores e mais
+    antigas que `keep_days`. Retorna o número de linhas removidas.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            DELETE FROM propriedades_alteracoes a
+            WHERE a.alterado_em < CURRENT_TIMESTAMP - make_interval(days => %s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM cdc_consumidores c
+                  WHERE (a.xid, a.id) > (c.ultimo_xid, c.ultimo_id)
+              )
+        """, (keep_days,))
+        removed = cursor.rowcount
+    conn.commit()
+    return removed
+
+
+def show_status(conn):
+    """Lista consumidores, alterações pendentes e tamanho do log."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.consumidor, c.alteracoes_processadas, c.atualizado_em,
+                   (SELECT count(*) FROM propriedades_alteracoes a
+                    WHERE (a.xid, a.id) > (c.ultimo_xid, c.ultimo_id)) AS pendentes
+            FROM cdc_consumidores c
+            ORDER BY c.consumidor
+        """)
+        consumers = cursor.fetchall()
+        cursor.execute(
+            "SELECT count(*), min(alterado_em), max(alterado_em) FROM propriedades_alteracoes"
+        )
+        total, first, last = cursor.fetchone()
+    conn.rollback()
+
+    print(f"📜 Log de alterações: {total:,} registro(s)"
+          + (f" ({first:%d/%m/%Y %H:%M} a {last:%d/%m/%Y %H:%M})" if total else ""))
+    if not consumers:
+        print("⚠️  Nenhum consumidor registrado")
+        return
+    print(f"{'consumidor':<24} {'pendentes':>10} {'processadas':>12}  atualizado em")
+    for consumer, processed, updated_at, pending in consumers:
+        print(f"{consumer:<24} {pending:>10,} {processed:>12,}  {updated_at:%d/%m/%Y %H:%M:%S}")
+
+
+def print_changes(changes):
+    for c in changes:
+        columns = f" [{', '.join(c['colunas'])}]" if c['colunas'] else ''
+        print(f"  {c['alterado_em']:%d/%m/%Y %H:%M:%S}  {c['operacao']}  "
+              f"{c['codigo']:<16}{columns}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log de alterações (CDC) de propriedades')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    subparsers.add_parser('status', help='Consumidores e alterações pendentes')
+
+    register = subparsers.add_parser('registrar', help='Registra um consumidor (marca = agora)')
+    register.add_argument('consumidor')
+    register.add_argument('--reset', action='store_true',
+                          help='Reinicia a marca d\'água de um consumidor existente')
+
+    tail = subparsers.add_parser('ler', help='Mostra (e consome) as alterações pendentes')
+    tail.add_argument('consumidor')
+    tail.add_argument('--follow', action='store_true',
+                      help='Continua aguardando novas alterações (LISTEN)')
+    tail.add_argument('--peek', action='store_true',
+                      help='Apenas mostra, sem avançar a marca d\'água')
+
+    purge = subparsers.add_parser('purgar', help='Remove alterações já consumidas')
+    purge.add_argument('--dias', type=int, default=30,
+                       help='Mantém as alterações mais recentes que N dias')
+
+    args = parser.parse_args()
+    conn = get_db_connection()
+
+    try:
+        if args.comando == 'status':
+            show_status(conn)
+        elif args.comando == 'registrar':
+            created = register_consumer(conn, args.consumidor, reset=args.reset)
+            print(f"✅ Consumidor '{args.consumidor}' registrado" if created
+                  else f"ℹ️  Consumidor '{args.consumidor}' já existe (use --reset)")
+        elif args.comando == 'purgar':
+            removed = purge_changes(conn, args.dias)
+            print(f"🗑️  {removed:,} alteração(ões) removida(s) do log")
+        elif args.comando == 'ler':
+            listener = get_db_connection() if args.follow else None
+            while True:
+                changes, position = fetch_changes(conn, args.consumidor)
+                while changes:
+                    print_changes(changes)
+                    if not args.peek:
+                        commit_position(conn, args.consumidor, position, len(changes))
+                    changes, position = fetch_changes(conn, args.consumidor, position)
+                if not args.follow:
+                    break
+                wait_for_changes(listener, timeout=30)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Configuração centralizada (pydantic-settings).
+Lê variáveis de ambiente e o arquivo .env uma única vez e valida os tipos.
+Usado pela CLI unificada (scripts/bni.py), que exporta os valores para o
+ambiente antes de executar o subcomando; os scripts continuam lendo
+os.getenv() e, portanto, também funcionam isoladamente.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ENV_FILE = Path(__file__).parent.parent / '.env'
+
+
+class Settings(BaseSettings):
+    """Variáveis de ambiente do projeto (ver .env.example), com os mesmos padrões dos scripts."""
+
+    model_config = SettingsConfigDict(env_file=ENV_FILE, env_file_encoding='utf-8',
+                                      extra='ignore')
+
+    # Database
+    postgres_host: str = 'localhost'
+    postgres_port: int = 5432
+    postgres_db: str = 'bni_gestao'
+    postgres_user: str = 'postgres'
+    postgres_password: str = 'postgres'
+
+    # Hugging Face
+    hf_token: Optional[str] = None
+    hf_dataset_name: str = 'senal88/bni-gestao-imobiliaria'
+    hf_dataset_revision: Optional[str] = None
+
+    # Caminhos
+    data_raw_path: str = './data/raw'
+    data_processed_path: str = './data/processed'
+    data_schemas_path: str = './data/schemas'
+    ifrs_reports_path: str = './reports/ifrs'
+    ifrs_reports_format: str = 'pdf'
+    obsidian_vault_path: str = './obsidian/vault_backup'
+    data_synthetic_path: str = './data/synthetic'
+    pipeline_state_path: str = './data/.pipeline_state.json'
+    property_index_path: str = './data/index/propriedades.idx'
+    portfolio_snapshot_path: str = './data/snapshot'
+    portfolios_path: str = './portfolios.yaml'
+    portfolio_pool_max_size: int = 4
+
+    # API
+    api_host: str = '0.0.0.0'
+    api_port: int = 8000
+    api_cache_ttl: float = 300
+    api_cache_maxsize: int = 1024
+    api_cache_check_interval: float = 5
+    api_pool_min_size: int = 2
+    api_pool_max_size: int = 10
+
+    # Fila de jobs
+    job_workers: int = 2
+
+    # Benchmarks
+    benchmark_postgres_db: str = 'bni_gestao_benchmark'
+
+
+@lru_cache(maxsize=1)
+def get_settings():
+    """Configuração carregada uma única vez por processo."""
+    return Settings()
+
+
+def export_to_environment(settings=None):
+    """
+    Publica a configuração em os.environ (sem sobrescrever o que já existe),
+    para que os scripts que leem os.getenv() vejam os valores do .env.
+    """
+    settings = settings or get_settings()
+    for name, value in settings.model_dump().items():
+        if value is not None:
+            os.environ.setdefault(name.upper(), str(value))
+    return settings
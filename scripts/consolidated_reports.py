@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Relatório IFRS consolidado de vários portfólios (ver portfolios.py).
+
+Cada portfólio é analisado em paralelo, numa thread com uma conexão do seu
+pool: as propriedades, as avaliações de 31/12 dos dois últimos exercícios
+(tabela avaliacoes) e as transações do período, já somadas por propriedade
+e tipo no banco, passam por ifrs_analytics.analyze_portfolio.
+Do resultado só sai o parcial do portfólio: quantidade, valor total, a
+conciliação e a movimentação por tipo_estoque/status. Todos em centavos, e
+todos aditivos: o consolidado é a soma dos parciais, exata, sem juntar as
+propriedades dos portfólios num único DataFrame.
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+PROPERTIES_SQL = """
+    SELECT codigo, nome, tipo_estoque, status, valor_avaliacao
+    FROM propriedades
+"""
+
+# Saldos de abertura e fechamento: última avaliação de cada propriedade nos
+# dois 31/12 mais recentes da série (idx_avaliacoes_ultima), em vez de
+# valor_2023/valor_2024, que não acompanham novos exercícios
+YEAR_END_VALUATIONS_SQL = """
+    SELECT DISTINCT ON (a.propriedade_id, a.data_referencia)
+           p.codigo, a.data_referencia, a.valor
+    FROM avaliacoes a
+    JOIN propriedades p ON p.id = a.propriedade_id
+    WHERE a.data_referencia IN (
+        SELECT DISTINCT data_referencia FROM avaliacoes
+        WHERE to_char(data_referencia, 'MM-DD') = '12-31'
+        ORDER BY data_referencia DESC
+        LIMIT 2
+    )
+    ORDER BY a.propriedade_id, a.data_referencia DESC, a.id DESC
+"""
+
+# Transações do período (inicio, fim] somadas por propriedade e tipo; a
+# data é a última do grupo, para summarize_transactions aplicar o mesmo filtro
+TRANSACTIONS_SQL = """
+    SELECT p.codigo, t.tipo_transacao, sum(t.valor) AS valor,
+           max(t.data_transacao) AS data_transacao
+    FROM transacoes t
+    JOIN propriedades p ON p.id = t.propriedade_id
+    WHERE t.data_transacao > %(inicio)s AND t.data_transacao <= %(fim)s
+      AND t.tipo_transacao = ANY(%(tipos)s)
+    GROUP BY p.codigo, t.tipo_transacao
+"""
+
+
+def fetch_frame(conn, query, params=None):
+    """Resultado de uma consulta como DataFrame."""
+    import pandas as pd
+
+    with conn.cursor() as cursor:
+        cursor.execute(query, params)
+        columns = [c.name for c in cursor.description]
+        rows = cursor.fetchall()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def analyze_portfolio_partial(portfolio, conn):
+    """
+    Parcial de um portfólio: quantidade e valor total (centavos), período,
+    conciliação e movimentação por grupo de ifrs_analytics.
+    """
+    from ifrs_analytics import (ADDITION_TYPES, analyze_portfolio, valuation_period,
+                                with_year_end_valuations)
+    from generate_ifrs_reports import portfolio_cents
+    from money import sum_cents
+
+    start = time.perf_counter()
+    df = with_year_end_valuations(fetch_frame(conn, PROPERTIES_SQL),
+                                  fetch_frame(conn, YEAR_END_VALUATIONS_SQL))
+    _, _, inicio, fim = valuation_period(df)
+    transacoes = fetch_frame(conn, TRANSACTIONS_SQL, {
+        'inicio': inicio, 'fim': fim, 'tipos': ADDITION_TYPES + ['aluguel', 'venda'],
+    })
+    analise = analyze_portfolio(df, transacoes)
+    return {
+        'portfolio': portfolio.nome,
+        'propriedades': len(df),
+        'valor_total': sum_cents(portfolio_cents(df)),
+        'inicio': analise['inicio'],
+        'fim': analise['fim'],
+        'conciliacao': analise['conciliacao'],
+        'por_grupo': analise['por_grupo'],
+        'segundos': time.perf_counter() - start,
+    }
+
+
+def merge_partials(partials):
+    """
+    Consolida os parciais: soma a conciliação linha a linha e a movimentação
+    por tipo_estoque/status. Os portfólios precisam ter o mesmo período.
+    """
+    import pandas as pd
+    from ifrs_analytics import GROUP_COLUMNS
+
+    periods = {(p['inicio'], p['fim']) for p in partials}
+    if len(periods) > 1:
+        detail = ', '.join(f"{p['portfolio']}: {p['inicio']:%Y}-{p['fim']:%Y}" for p in partials)
+        raise ValueError(f"Portfólios com períodos de avaliação diferentes ({detail})")
+
+    conciliacao = partials[0]['conciliacao'].copy()
+    for partial in partials[1:]:
+        conciliacao['valor'] += partial['conciliacao']['valor'].to_numpy()
+
+    por_grupo = (
+        pd.concat([p['por_grupo'] for p in partials], ignore_index=True)
+        .groupby(GROUP_COLUMNS, sort=True).sum()
+        .reset_index()
+    )
+    por_portfolio = pd.DataFrame({
+        'portfolio': [p['portfolio'] for p in partials],
+        'propriedades': [p['propriedades'] for p in partials],
+        'valor_total': [p['valor_total'] for p in partials],
+        'saldo_final': [int(p['conciliacao']['valor'].iloc[-1]) for p in partials],
+    })
+    return {
+        'inicio': partials[0]['inicio'],
+        'fim': partials[0]['fim'],
+        'propriedades': sum(p['propriedades'] for p in partials),
+        'valor_total': sum(p['valor_total'] for p in partials),
+        'conciliacao': conciliacao,
+        'por_grupo': por_grupo,
+        'por_portfolio': por_portfolio,
+    }
+
+
+def consolidate(portfolios, workers=None):
+    """Analisa os portfólios em paralelo e consolida; sai com erro se algum falhar."""
+    from portfolios import close_pools, fan_out
+
+    try:
+        results = fan_out(portfolios, analyze_portfolio_partial, workers)
+    finally:
+        close_pools()
+
+    failed = {name: result for name, result in results.items() if isinstance(result, Exception)}
+    for name, error in failed.items():
+        print(f"❌ {name}: {str(error).strip().splitlines()[0]}")
+    if failed:
+        print("❌ Consolidação cancelada: o consolidado precisa de todos os portfólios")
+        sys.exit(1)
+
+    partials = [results[p.nome] for p in portfolios]
+    for partial in partials:
+        print(f"   {partial['portfolio']:<20} {partial['propriedades']:>8,} propriedades "
+              f"({partial['segundos']:.2f}s)")
+    try:
+        return merge_partials(partials)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+def portfolio_rows(consolidado):
+    """Linhas (com cabeçalho e total) da tabela por portfólio."""
+    from money import format_cents
+
+    frame = consolidado['por_portfolio']
+    rows = [['Portfólio', 'Propriedades', 'Valor de avaliação (R$)', 'Saldo final IAS 40 (R$)']]
+    rows += [[nome, f"{quantidade:,}", format_cents(valor), format_cents(saldo)]
+             for nome, quantidade, valor, saldo in frame.itertuples(index=False)]
+    rows.append(['Consolidado', f"{consolidado['propriedades']:,}",
+                 format_cents(consolidado['valor_total']),
+                 format_cents(int(frame['saldo_final'].sum()))])
+    return rows
+
+
+def generate_consolidated_pdf(consolidado, output_path, periodo):
+    """Gera o relatório consolidado em PDF."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from generate_ifrs_reports import movement_tables
+
+    doc = SimpleDocTemplate(str(output_path), pagesize=A4)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    header_style = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]
+
+    story = [
+        Paragraph(f"Relatório IFRS Consolidado - Portfólios BNI<br/>{periodo}", title_style),
+        Spacer(1, 0.3*inch),
+        Paragraph("<b>PORTFÓLIOS</b>", styles['Heading2']),
+        Spacer(1, 0.2*inch),
+    ]
+    portfolio_table = Table(portfolio_rows(consolidado),
+                            colWidths=[1.8*inch, 1*inch, 1.8*inch, 1.8*inch])
+    portfolio_table.setStyle(TableStyle(header_style + [('ALIGN', (1, 1), (-1, -1), 'RIGHT')]))
+    story += [portfolio_table, Spacer(1, 0.3*inch)]
+
+    reconciliation, groups = movement_tables(consolidado)
+    story += [
+        Paragraph(
+            f"<b>MOVIMENTAÇÃO DO VALOR JUSTO CONSOLIDADA (IAS 40)</b> — "
+            f"{consolidado['inicio']:%d/%m/%Y} a {consolidado['fim']:%d/%m/%Y}", styles['Heading2']
+        ),
+        Spacer(1, 0.2*inch),
+    ]
+    reconciliation_table = Table(reconciliation, colWidths=[4*inch, 2*inch])
+    reconciliation_table.setStyle(TableStyle(header_style + [('ALIGN', (1, 1), (1, -1), 'RIGHT')]))
+    story += [reconciliation_table, Spacer(1, 0.2*inch)]
+
+    group_table = Table(groups, colWidths=[0.9*inch, 1.25*inch, 0.45*inch, 0.95*inch,
+                                           0.85*inch, 0.9*inch, 0.95*inch])
+    group_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+    ]))
+    story += [group_table, Spacer(1, 0.3*inch)]
+
+    footer_text = f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+    story.append(Paragraph(footer_text, styles['Normal']))
+
+    doc.build(story)
+    print(f"✅ Relatório PDF consolidado gerado: {output_path}")
+
+
+def generate_consolidated_excel(consolidado, output_path):
+    """Gera o relatório consolidado em Excel."""
+    import pandas as pd
+    from ifrs_analytics import in_reais
+    from money import cents_to_float
+
+    por_portfolio = consolidado['por_portfolio']
+    with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
+        por_portfolio.assign(
+            valor_total=cents_to_float(por_portfolio['valor_total']),
+            saldo_final=cents_to_float(por_portfolio['saldo_final']),
+        ).to_excel(writer, sheet_name='Portfólios', index=False)
+        in_reais(consolidado['conciliacao']).to_excel(writer, sheet_name='Conciliação IAS 40',
+                                                      index=False)
+        in_reais(consolidado['por_grupo']).to_excel(writer, sheet_name='Movimentação', index=False)
+
+        writer.sheets['Portfólios'].set_column('A:A', 25)
+        writer.sheets['Portfólios'].set_column('B:D', 20)
+        writer.sheets['Conciliação IAS 40'].set_column('A:A', 45)
+        writer.sheets['Conciliação IAS 40'].set_column('B:B', 20)
+
+    print(f"✅ Relatório Excel consolidado gerado: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Relatório IFRS consolidado de vários portfólios')
+    parser.add_argument('--portfolio', nargs='+', default=None, metavar='NOME',
+                       help='Portfólios consolidados (padrão: todos do registro)')
+    parser.add_argument('--output-dir', type=str,
+                       default=os.getenv('IFRS_REPORTS_PATH', './reports/ifrs'),
+                       help='Diretório para salvar relatórios')
+    parser.add_argument('--format', type=str, choices=['pdf', 'xlsx', 'both'],
+                       default=os.getenv('IFRS_REPORTS_FORMAT', 'pdf'),
+                       help='Formato do relatório')
+    parser.add_argument('--periodo', type=str,
+                       default=datetime.now().strftime('%Y-%m'),
+                       help='Período do relatório (YYYY-MM)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Portfólios analisados ao mesmo tempo (padrão: todos)')
+    args = parser.parse_args()
+
+    from portfolios import select_portfolios
+
+    portfolios = select_portfolios(args.portfolio)
+
+    print(f"📊 Relatório IFRS Consolidado ({len(portfolios)} portfólios)")
+    print("-" * 50)
+
+    start = time.perf_counter()
+    consolidado = consolidate(portfolios, args.workers)
+    print(f"⏱️  Análise em {time.perf_counter() - start:.2f}s")
+
+    from money import format_cents
+
+    for label, value in consolidado['conciliacao'].itertuples(index=False):
+        print(f"   {label:<45} R$ {format_cents(value):>18}")
+
+    output_path = Path(args.output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if args.format in ['pdf', 'both']:
+        pdf_path = output_path / f"relatorio_ifrs_consolidado_{args.periodo}_{timestamp}.pdf"
+        generate_consolidated_pdf(consolidado, pdf_path, args.periodo)
+
+    if args.format in ['xlsx', 'both']:
+        xlsx_path = output_path / f"relatorio_ifrs_consolidado_{args.periodo}_{timestamp}.xlsx"
+        generate_consolidated_excel(consolidado, xlsx_path)
+
+    print("-" * 50)
+    print("✅ Consolidação concluída!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Exportação em massa de propriedades e transações (NDJSON, CSV ou Parquet).
+Pagina por chave (keyset) em vez de OFFSET e lê cada página por um cursor
+no servidor, então a memória usada não depende do tamanho da tabela.
+Com --since, exporta apenas o que mudou desde a última marca recebida.
+"""
+
+import os
+import sys
+import argparse
+import csv
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+from dotenv import load_dotenv
+import psycopg2
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+PAGE_ROWS = 50_000
+CURSOR_ITERSIZE = 5_000
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+# Tabela -> coluna de data usada na exportação incremental (--since).
+# transacoes não tem updated_at: as linhas só são inseridas, então
+# created_at marca a mudança. Ambas têm índice (coluna, id) (migração 004).
+EXPORT_TABLES = {
+    'propriedades': 'updated_at',
+    'transacoes': 'created_at',
+}
+
+# OID do tipo PostgreSQL -> tipo Arrow (demais tipos viram texto)
+PG_INT4, PG_INT8, PG_INT2 = 23, 20, 21
+PG_NUMERIC, PG_FLOAT4, PG_FLOAT8 = 1700, 700, 701
+PG_BOOL, PG_DATE, PG_TIMESTAMP, PG_TIMESTAMPTZ = 16, 1082, 1114, 1184
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def json_default(value):
+    """Serializa tipos vindos do banco que o json padrão não conhece."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def build_page_query(table, incremental):
+    """
+    Consulta de uma página, com a chave da última linha da página anterior.
+
+    Sem --since a chave é o id; com --since é (coluna de data, id), o que
+    permite retomar exatamente de onde parou mesmo com datas repetidas.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Tabela não exportável: {table}")
+    if not incremental:
+        return (f"SELECT * FROM {table} WHERE id > %(after_id)s "
+                f"ORDER BY id LIMIT %(limit)s")
+    column = EXPORT_TABLES[table]
+    return (f"SELECT * FROM {table} "
+            f"WHERE ({column}, id) > (%(since)s, %(after_id)s) "
+            f"ORDER BY {column}, id LIMIT %(limit)s")
+
+
+def iter_pages(conn, table, since=None, after_id=0, page_rows=PAGE_ROWS,
+               max_rows=None):
+    """
+    Gera (colunas, linhas) página a página, em ordem de chave.
+
+    Cada página é lida por um cursor nomeado (no servidor) em blocos de
+    CURSOR_ITERSIZE linhas e roda na sua própria transação, para não segurar
+    um snapshot durante a exportação inteira.
+    """
+    incremental = since is not None
+    query = build_page_query(table, incremental)
+    exported = 0
+    key = (since, after_id)
+
+    while max_rows is None or exported < max_rows:
+        limit = page_rows if max_rows is None else min(page_rows, max_rows - exported)
+        with conn.cursor(name=f"export_{table}") as cursor:
+            cursor.itersize = CURSOR_ITERSIZE
+            cursor.execute(query, {'since': key[0], 'after_id': key[1], 'limit': limit})
+            rows = [row for row in cursor]
+            columns = cursor.description
+        conn.commit()
+
+        if not rows:
+            break
+
+        names = [c.name for c in columns]
+        id_index = names.index('id')
+        if incremental:
+            ts_index = names.index(EXPORT_TABLES[table])
+            key = (rows[-1][ts_index], rows[-1][id_index])
+        else:
+            key = (None, rows[-1][id_index])
+        exported += len(rows)
+        yield columns, rows
+
+        if len(rows) < limit:
+            break
+
+
+def page_watermark(table, columns, rows):
+    """Maior (data, id) da página: a marca para a próxima exportação incremental."""
+    names = [c.name for c in columns]
+    ts_index, id_index = names.index(EXPORT_TABLES[table]), names.index('id')
+    keys = [(row[ts_index], row[id_index]) for row in rows if row[ts_index] is not None]
+    return max(keys) if keys else None
+
+
+class NdjsonWriter:
+    """Uma linha JSON por registro."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, columns, rows):
+        names = [c.name for c in columns]
+        for row in rows:
+            self.stream.write(json.dumps(dict(zip(names, row)), default=json_default,
+                                         ensure_ascii=False))
+            self.stream.write('\n')
+
+    def close(self):
+        self.stream.flush()
+
+
+class CsvWriter:
+    """CSV com cabeçalho; JSONB é gravado como texto JSON."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.writer(stream)
+        self.header_written = False
+
+    def write(self, columns, rows):
+        if not self.header_written:
+            self.writer.writerow([c.name for c in columns])
+            self.header_written = True
+        for row in rows:
+            self.writer.writerow([
+                json.dumps(v, default=json_default, ensure_ascii=False)
+                if isinstance(v, (dict, list)) else v
+                for v in row
+            ])
+
+    def close(self):
+        self.stream.flush()
+
+
+class ParquetWriter:
+    """Um row group por página; schema derivado dos tipos do PostgreSQL."""
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.schema = None
+
+    @staticmethod
+    def arrow_type(column):
+        import pyarrow as pa
+        code = column.type_code
+        if code == PG_INT2 or code == PG_INT4:
+            return pa.int32()
+        if code == PG_INT8:
+            return pa.int64()
+        if code == PG_NUMERIC:
+            if column.precision and column.precision <= 38:
+                return pa.decimal128(column.precision, column.scale or 0)
+            return pa.float64()
+        if code in (PG_FLOAT4, PG_FLOAT8):
+            return pa.float64()
+        if code == PG_BOOL:
+            return pa.bool_()
+        if code == PG_DATE:
+            return pa.date32()
+        if code == PG_TIMESTAMP:
+            return pa.timestamp('us')
+        if code == PG_TIMESTAMPTZ:
+            return pa.timestamp('us', tz='UTC')
+        return pa.string()
+
+    @classmethod
+    def arrow_schema(cls, columns):
+        """Schema Arrow das colunas de um cursor."""
+        import pyarrow as pa
+        return pa.schema([(c.name, cls.arrow_type(c)) for c in columns])
+
+    @staticmethod
+    def arrow_table(schema, rows):
+        """Linhas de uma página -> pyarrow.Table no schema (JSONB vira texto JSON)."""
+        import pyarrow as pa
+
+        arrays = []
+        for i, field in enumerate(schema):
+            values = [row[i] for row in rows]
+            if pa.types.is_string(field.type):
+                values = [
+                    None if v is None
+                    else v if isinstance(v, str)
+                    else json.dumps(v, default=json_default, ensure_ascii=False)
+                    for v in values
+                ]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def write(self, columns, rows):
+        import pyarrow.parquet as pq
+
+        if self.schema is None:
+            self.schema = self.arrow_schema(columns)
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression='zstd')
+        self.writer.write_table(self.arrow_table(self.schema, rows))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(fmt, output):
+    """Cria o writer do formato; `output` '-' é a saída padrão."""
+    if fmt == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet exige um arquivo de saída (--output)")
+        return ParquetWriter(output)
+    stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8', newline='')
+    return NdjsonWriter(stream) if fmt == 'ndjson' else CsvWriter(stream)
+
+
+def export_table(table, fmt, output, since=None, after_id=0, page_rows=PAGE_ROWS,
+                 max_rows=None):
+    """Exporta a tabela e retorna (linhas exportadas, marca (data, id) para --since)."""
+    # Mensagens vão para stderr quando os dados saem em stdout
+    log = sys.stderr if output == '-' else sys.stdout
+    conn = get_db_connection()
+    writer = open_writer(fmt, output)
+    exported = 0
+    watermark = None
+    started = time.perf_counter()
+
+    try:
+        for columns, rows in iter_pages(conn, table, since, after_id, page_rows, max_rows):
+            writer.write(columns, rows)
+            exported += len(rows)
+            page_mark = page_watermark(table, columns, rows)
+            if page_mark and (watermark is None or page_mark > watermark):
+                watermark = page_mark
+            elapsed = time.perf_counter() - started
+            print(f"  ✓ {exported:,} linhas ({exported / elapsed:,.0f} linhas/s)", file=log)
+    finally:
+        writer.close()
+        conn.close()
+
+    return exported, watermark
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta propriedades/transações em massa')
+    parser.add_argument('tabela', choices=sorted(EXPORT_TABLES),
+                       help='Tabela a exportar')
+    parser.add_argument('--format', choices=FORMATS, default='ndjson',
+                       help='Formato de saída')
+    parser.add_argument('--output', '-o', type=str, default='-',
+                       help='Arquivo de saída ("-" = stdout, padrão)')
+    parser.add_argument('--since', type=str, default=None,
+                       help='Exporta só linhas alteradas a partir desta data/hora '
+                            '(updated_at em propriedades, created_at em transacoes)')
+    parser.add_argument('--after-id', type=int, default=0,
+                       help='Retoma após este id (com --since, desempata a data)')
+    parser.add_argument('--page-rows', type=int, default=PAGE_ROWS,
+                       help='Linhas por página (uma transação curta por página)')
+    parser.add_argument('--max-rows', type=int, default=None,
+                       help='Limita o total de linhas exportadas')
+
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        try:
+            since = datetime.fromisoformat(args.since)
+        except ValueError:
+            print(f"❌ --since inválido (use ISO 8601): {args.since}", file=sys.stderr)
+            sys.exit(1)
+
+    log = sys.stderr if args.output == '-' else sys.stdout
+    print(f"📤 Exportando {args.tabela} ({args.format})"
+          + (f" alteradas desde {since.isoformat()}" if since else ""), file=log)
+
+    try:
+        exported, watermark = export_table(args.tabela, args.format, args.output, since,
+                                          args.after_id, args.page_rows, args.max_rows)
+    except BrokenPipeError:
+        # Leitor da saída padrão fechou (ex.: `| head`)
+        sys.stderr.close()
+        sys.exit(0)
+    except (ValueError, psycopg2.Error) as e:
+        print(f"❌ Erro na exportação: {e}", file=log)
+        sys.exit(1)
+
+    print(f"✅ {exported:,} linhas exportadas", file=log)
+    if watermark:
+        last_ts, last_id = watermark
+        print(f"   Próxima exportação incremental: --since {last_ts.isoformat()} "
+              f"--after-id {last_id}", file=log)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,17 +10,20 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-import pandas as pd
-import yaml
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 load_dotenv()
 
+# Nome do consumidor no log de alterações (scripts/cdc.py)
+CDC_CONSUMER = 'obsidian'
+
 
 def load_property_data(data_dir):
     """Carrega dados das propriedades."""
+    import pandas as pd
+
     data_path = Path(data_dir)
     csv_files = list(data_path.glob("*propriedades*.csv"))
 
@@ -32,17 +35,49 @@ def load_property_data(data_dir):
     return df
 
 
+def load_property_data_from_db(conn, ids=None):
+    """Carrega propriedades do banco (todas, ou apenas os `ids` informados)."""
+    import pandas as pd
+
+    query = "SELECT * FROM propriedades"
+    params = None
+    if ids is not None:
+        query += " WHERE id = ANY(%s)"
+        params = (list(ids),)
+    with conn.cursor() as cursor:
+        cursor.execute(query + " ORDER BY id", params)
+        columns = [c.name for c in cursor.description]
+        df = pd.DataFrame(cursor.fetchall(), columns=columns)
+    conn.rollback()
+
+    for column in ('area_total', 'area_construida', 'valor_avaliacao'):
+        df[column] = pd.to_numeric(df[column])
+    return df
+
+
+def note_filename(code):
+    """Nome do arquivo .md da nota de uma propriedade."""
+    safe_filename = "".join(c for c in str(code) if c.isalnum() or c in (' ', '-', '_')).strip()
+    return f"{safe_filename.replace(' ', '_')}.md"
+
+
+def note_filenames(codes):
+    """Versão vetorizada de note_filename (sem a extensão .md), para uma série de códigos."""
+    # dtype object: regex do Python, em que \w é isalnum() mais '_' (como em note_filename)
+    safe = codes.astype(str).astype(object).str.replace(r'[^\w \-]', '', regex=True).str.strip()
+    return safe.str.replace(' ', '_', regex=False)
+
+
 def create_obsidian_note(property_data, output_dir, template=None):
     """Cria uma nota Obsidian para uma propriedade."""
+    import yaml
+
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Nome do arquivo baseado no código ou nome
     code = str(property_data.get('codigo', property_data.get('nome', 'propriedade')))
-    safe_filename = "".join(c for c in code if c.isalnum() or c in (' ', '-', '_')).strip()
-    safe_filename = safe_filename.replace(' ', '_')
-    filename = f"{safe_filename}.md"
-    filepath = output_path / filename
+    filepath = output_path / note_filename(code)
 
     # Frontmatter YAML
     frontmatter = {
@@ -104,6 +139,8 @@ def create_index_note(properties_df, output_dir):
     output_path.mkdir(parents=True, exist_ok=True)
 
     index_path = output_path / "00_Índice_Propriedades.md"
+    total_value = (properties_df['valor_avaliacao'].sum()
+                   if 'valor_avaliacao' in properties_df.columns else 0)
 
     content = f"""# Índice de Propriedades - BNI
 
@@ -112,21 +149,21 @@ def create_index_note(properties_df, output_dir):
 ## Resumo
 
 - **Total de Propriedades**: {len(properties_df)}
-- **Valor Total do Portfólio**: R$ {properties_df['valor_avaliacao'].sum():,.2f if 'valor_avaliacao' in properties_df.columns else 0:,.2f}
+- **Valor Total do Portfólio**: R$ {total_value:,.2f}
 
 ## Lista de Propriedades
 
 """
 
-    # Adiciona links para cada propriedade
+    # Adiciona links para cada propriedade (nome do arquivo já calculado no
+    # índice de propriedades, quando disponível)
     if 'codigo' in properties_df.columns and 'nome' in properties_df.columns:
-        for _, prop in properties_df.iterrows():
-            code = str(prop.get('codigo', prop.get('nome', 'propriedade')))
-            safe_filename = "".join(c for c in code if c.isalnum() or c in (' ', '-', '_')).strip()
-            safe_filename = safe_filename.replace(' ', '_')
-            link = f"[[{safe_filename}]]"
-            name = prop.get('nome', 'Sem nome')
-            content += f"- {link} - {name}\n"
+        if 'arquivo' in properties_df.columns:
+            files = properties_df['arquivo']
+        else:
+            files = note_filenames(properties_df['codigo'])
+        names = properties_df['nome'].fillna('Sem nome')
+        content += ''.join(f"- [[{file}]] - {name}\n" for file, name in zip(files, names))
 
     content += f"""
 ---
@@ -152,14 +189,31 @@ def main():
                        help='Diretório do vault Obsidian')
     parser.add_argument('--create-index', action='store_true',
                        help='Cria nota índice com todas as propriedades')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Lê do PostgreSQL e exporta só as propriedades alteradas '
+                            'desde a última execução (log de alterações/CDC)')
+    parser.add_argument('--snapshot', action='store_true',
+                       help='Lê as propriedades do snapshot Arrow do portfólio (ver '
+                            'portfolio_snapshot.py) em vez do CSV processado')
+    parser.add_argument('--codigos', nargs='+', default=None, metavar='CODIGO',
+                       help='Exporta só as notas destes códigos')
 
     args = parser.parse_args()
 
     print("📝 Exportação para Obsidian")
     print("-" * 50)
 
+    if args.incremental:
+        export_incremental(args.output_dir, args.create_index)
+        return
+
     # Carrega dados
-    df = load_property_data(args.data_dir)
+    if args.snapshot:
+        from portfolio_snapshot import load_portfolio
+        df, origem = load_portfolio()
+        print(f"🗂️  Propriedades lidas do {origem}")
+    else:
+        df = load_property_data(args.data_dir)
 
     if df is None or df.empty:
         print("❌ Nenhum dado encontrado para exportar")
@@ -167,9 +221,14 @@ def main():
 
     print(f"📁 Carregados {len(df)} registros de propriedades")
 
+    notes = df
+    if args.codigos:
+        notes = df[df['codigo'].astype(str).isin(args.codigos)]
+        print(f"🔎 {len(notes)} de {len(args.codigos)} código(s) encontrado(s)")
+
     # Cria notas para cada propriedade
     created_files = []
-    for _, prop in df.iterrows():
+    for _, prop in notes.iterrows():
         filepath = create_obsidian_note(prop, args.output_dir)
         created_files.append(filepath)
         print(f"  ✓ Criado: {filepath.name}")
@@ -183,6 +242,58 @@ def main():
     print(f"✅ Exportação concluída! {len(created_files)} nota(s) criada(s)")
 
 
+def export_incremental(output_dir, create_index=False):
+    """
+    Exporta a partir do banco apenas o que mudou desde a última execução.
+
+    Na primeira execução registra o consumidor e exporta tudo. A marca
+    d'água só avança depois que as notas foram gravadas.
+    """
+    from cdc import (get_db_connection, get_position, register_consumer,
+                     changed_properties, commit_position)
+
+    conn = get_db_connection()
+    try:
+        position = None
+        deleted = set()
+        if get_position(conn, CDC_CONSUMER) is None:
+            register_consumer(conn, CDC_CONSUMER)
+            print("🆕 Primeira execução incremental: exportando todas as propriedades")
+            df = load_property_data_from_db(conn)
+        else:
+            changed, deleted, position = changed_properties(conn, CDC_CONSUMER)
+            print(f"🔄 {len(changed)} propriedade(s) alterada(s), {len(deleted)} excluída(s)")
+            df = load_property_data_from_db(conn, sorted(changed))
+
+        # Exclusões antes das criações: um código excluído e recriado fica com nota
+        for code in sorted(deleted):
+            filepath = Path(output_dir) / note_filename(code)
+            if filepath.exists():
+                filepath.unlink()
+                print(f"  🗑️  Removido: {filepath.name}")
+
+        for _, prop in df.iterrows():
+            filepath = create_obsidian_note(prop, output_dir)
+            print(f"  ✓ Atualizado: {filepath.name}")
+
+        if create_index and (position is None or len(df) or deleted):
+            from property_index import PropertyIndex
+
+            properties = PropertyIndex.from_postgres(conn)
+            conn.rollback()
+            properties.save()
+            index_path = create_index_note(properties.to_frame(), output_dir)
+            print(f"  ✓ Índice criado: {index_path.name}")
+
+        if position is not None:
+            commit_position(conn, CDC_CONSUMER, position, len(df) + len(deleted))
+    finally:
+        conn.close()
+
+    print("-" * 50)
+    print(f"✅ Exportação incremental concluída! {len(df)} nota(s) atualizada(s)")
+
+
 if __name__ == '__main__':
     main()
 
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Extrai fatos financeiros das observações das propriedades.
+
+Notas de OBSERVACOES_FINANCEIRAS como "Gerou R$ 9.500,00 de aluguel em
+Jan/2025" viram transações do tipo aluguel (valor e mês de referência), no
+formato de import_transacoes.py. Os padrões são regex pré-compilados
+aplicados de uma vez à coluna inteira (str.extractall, um aluguel por
+ocorrência), só sobre as notas que citam aluguel ou R$; as que citam e não
+casam com nenhum padrão são reportadas como não reconhecidas.
+"""
+
+import os
+import re
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+MESES = {'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+         'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12}
+
+VALOR = r'R\$\s*(?P<valor>[0-9][0-9.]*(?:,[0-9]{1,2})?)'
+MES = (r'(?P<mes>' + '|'.join(MESES) + r')[a-zç]*\.?\s*(?:/|de\s+)'
+       r'(?P<ano>(?:19|20)[0-9]{2})')
+
+# Aplicados em ordem; cada um só vê as notas que os anteriores não reconheceram
+RENT_PATTERNS = [
+    # "Gerou R$ 9.500,00 de aluguel em Jan/2025"
+    re.compile(rf'{VALOR}\s+(?:de|em)\s+aluguel\s+(?:em|de|referente\s+a)\s+{MES}', re.IGNORECASE),
+    # "Gera aluguel (R$ 5.661,22 em Out/2024)", "Aluguel de R$ 1.200,00 em março de 2025"
+    re.compile(rf'aluguel\s*(?:\(|de|:)?\s*{VALOR}\s*(?:em|de|ref\.?)\s+{MES}', re.IGNORECASE),
+]
+
+# Notas que podem conter um fato financeiro
+CANDIDATE = re.compile(r'aluguel|R\$', re.IGNORECASE)
+
+TRANSACTION_COLUMNS = ['codigo', 'data_transacao', 'tipo_transacao', 'valor',
+                       'descricao', 'categoria', 'documento']
+CATEGORIA = 'observacoes_financeiras'
+
+
+def note_columns(df):
+    """(codigo, observação) no layout do CSV bruto ou no layout do banco."""
+    import pandas as pd
+
+    if 'CODIGO_CC' in df.columns:
+        return df['CODIGO_CC'], df.get('OBSERVACOES_FINANCEIRAS', pd.Series(index=df.index))
+    return df['codigo'], df.get('observacoes', pd.Series(index=df.index))
+
+
+def extract_rent(df):
+    """
+    Extrai os aluguéis das observações de um DataFrame de propriedades.
+
+    Retorna (transações, não reconhecidas): as transações no formato de
+    import_transacoes.py (data no dia 1º do mês, valor como no texto), uma
+    por aluguel citado (uma nota pode citar vários meses), e as notas
+    candidatas (citam aluguel ou R$) sem padrão correspondente.
+    """
+    import pandas as pd
+
+    codigos, notes = note_columns(df)
+    codigos = codigos.astype('string[pyarrow]').str.strip()
+    notes = notes.astype('string[pyarrow]')
+
+    pending = notes[notes.str.contains(CANDIDATE, na=False)]
+    matches = []
+    for pattern in RENT_PATTERNS:
+        if pending.empty:
+            break
+        # Índice (linha, ocorrência): todas as ocorrências de cada nota
+        found = pending.str.extractall(pattern)
+        matches.append(found)
+        pending = pending[~pending.index.isin(found.index.get_level_values(0))]
+
+    found = pd.concat(matches) if matches else pd.DataFrame(
+        columns=['valor', 'mes', 'ano'], dtype='string[pyarrow]')
+    rows = found.index.get_level_values(0)
+    mes = found['mes'].str.lower().map(MESES).astype('Int64').astype('string')
+    competencia = found['ano'] + '-' + mes.str.zfill(2)
+    codigo = codigos[rows].set_axis(found.index)
+    transacoes = pd.DataFrame({
+        'codigo': codigo,
+        'data_transacao': competencia + '-01',
+        'tipo_transacao': 'aluguel',
+        'valor': found['valor'],
+        'descricao': notes[rows].set_axis(found.index),
+        'categoria': CATEGORIA,
+        'documento': 'OBS-' + codigo + '-' + competencia,
+    }, columns=TRANSACTION_COLUMNS).sort_index()
+
+    nao_reconhecidas = pd.DataFrame({'codigo': codigos[pending.index], 'observacao': pending})
+    return transacoes.reset_index(drop=True), nao_reconhecidas.reset_index(drop=True)
+
+
+def load_rent_transactions(cursor, transacoes):
+    """
+    Carrega os aluguéis extraídos em transacoes pelo mesmo caminho de
+    import_transacoes.py (staging, COPY e ON CONFLICT): reimportar as mesmas
+    observações não duplica nada. Retorna (inseridas, rejeitadas).
+    """
+    from import_transacoes import (create_staging_table, load_chunk, load_property_lookup,
+                                   prepare_chunk)
+
+    if transacoes.empty:
+        return 0, 0
+    valid, rejected = prepare_chunk(transacoes, load_property_lookup(cursor))
+    if valid.empty:
+        return 0, len(rejected)
+    cursor.execute("SELECT to_regclass('pg_temp.stg_transacoes')")
+    if cursor.fetchone()[0] is None:
+        create_staging_table(cursor)
+    return load_chunk(cursor, valid), len(rejected)
+
+
+def print_unmatched(nao_reconhecidas, limit=10):
+    """Lista as primeiras notas não reconhecidas."""
+    if nao_reconhecidas.empty:
+        return
+    print(f"⚠️  {len(nao_reconhecidas):,} observações citam valores/aluguel "
+          "sem padrão reconhecido:")
+    for codigo, observacao in nao_reconhecidas.head(limit).itertuples(index=False):
+        print(f"   {codigo}: {observacao}")
+    if len(nao_reconhecidas) > limit:
+        print(f"   ... e mais {len(nao_reconhecidas) - limit:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extrai aluguéis das observações financeiras das propriedades'
+    )
+    parser.add_argument('--csv', type=str,
+                        default=os.getenv('DATA_RAW_PATH', './data/raw') + '/propriedades.csv',
+                        help='CSV de propriedades')
+    parser.add_argument('--saida', type=str, default=None,
+                        help='CSV de transações (formato de import_transacoes.py) a gerar')
+    parser.add_argument('--nao-reconhecidas', type=str, default=None,
+                        help='CSV onde gravar as observações não reconhecidas')
+    parser.add_argument('--importar', action='store_true',
+                        help='Carrega os aluguéis extraídos na tabela transacoes')
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv)
+    if not csv_path.exists():
+        print(f"❌ Arquivo CSV não encontrado: {csv_path}")
+        sys.exit(1)
+
+    import pandas as pd
+
+    print(f"🔎 Extraindo aluguéis das observações de {csv_path}")
+    print("-" * 50)
+    started = time.perf_counter()
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=['', 'N/A'])
+    transacoes, nao_reconhecidas = extract_rent(df)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {len(transacoes):,} aluguéis extraídos de {len(df):,} propriedades "
+          f"({len(df) / elapsed if elapsed else 0:,.0f} linhas/s)")
+    print_unmatched(nao_reconhecidas)
+
+    if args.saida:
+        Path(args.saida).parent.mkdir(parents=True, exist_ok=True)
+        transacoes.to_csv(args.saida, index=False)
+        print(f"💾 Transações gravadas em {args.saida}")
+    if args.nao_reconhecidas:
+        Path(args.nao_reconhecidas).parent.mkdir(parents=True, exist_ok=True)
+        nao_reconhecidas.to_csv(args.nao_reconhecidas, index=False)
+        print(f"💾 Observações não reconhecidas gravadas em {args.nao_reconhecidas}")
+
+    if args.importar:
+        from import_transacoes import get_db_connection
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            inserted, rejected = load_rent_transactions(cursor, transacoes)
+            conn.commit()
+            print(f"✅ Transações inseridas: {inserted:,} (rejeitadas: {rejected:,}, "
+                  f"já importadas: {len(transacoes) - inserted - rejected:,})")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Erro ao importar aluguéis: {e}")
+            sys.exit(1)
+        finally:
+            cursor.close()
+            conn.close()
+
+
+if __name__ == '__main__':
+    main()
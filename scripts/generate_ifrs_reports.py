@@ -10,13 +10,6 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-import pandas as pd
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,6 +19,8 @@ load_dotenv()
 
 def load_property_data(data_dir):
     """Carrega dados das propriedades."""
+    import pandas as pd
+
     data_path = Path(data_dir)
     csv_files = list(data_path.glob("*propriedades*.csv"))
 
@@ -38,15 +33,84 @@ def load_property_data(data_dir):
     return df
 
 
-def calculate_portfolio_value(df):
-    """Calcula o valor total do portfólio."""
+def portfolio_cents(df):
+    """Valores de avaliação em centavos (int64, ausentes ignorados)."""
+    import pandas as pd
+    from money import parse_cents
+
     if 'valor_avaliacao' in df.columns:
-        return df['valor_avaliacao'].sum()
-    return 0
+        return parse_cents(df['valor_avaliacao']).dropna()
+    return pd.Series([], dtype='Int64')
+
+
+def calculate_portfolio_value(df):
+    """Calcula o valor total do portfólio (Decimal exato, com duas casas)."""
+    from money import cents_to_decimal, sum_cents
+
+    return cents_to_decimal(sum_cents(portfolio_cents(df)))
+
+
+def calculate_average_value(df):
+    """Valor médio por propriedade (Decimal arredondado ao centavo)."""
+    from money import cents_to_decimal, divide_cents, sum_cents
+
+    if len(df) == 0:
+        return cents_to_decimal(0)
+    return cents_to_decimal(divide_cents(sum_cents(portfolio_cents(df)), len(df)))
+
+
+def analyze_movements(df, transacoes=None):
+    """
+    Movimentação do valor justo (IAS 40) via ifrs_analytics, ou None se os
+    dados não tiverem status e duas colunas valor_AAAA.
+    """
+    from ifrs_analytics import analyze_portfolio
+
+    if 'status' not in df.columns:
+        return None
+    try:
+        return analyze_portfolio(df, transacoes)
+    except ValueError as e:
+        print(f"⚠️  Movimentação do valor justo não calculada: {e}")
+        return None
+
+
+def movement_tables(analise):
+    """Linhas (com cabeçalho) das tabelas de conciliação e de movimentação por grupo."""
+    from money import format_cents
+
+    reconciliation = [['Movimentação', 'Valor (R$)']] + [
+        [label, format_cents(value)]
+        for label, value in analise['conciliacao'].itertuples(index=False)
+    ]
+    grouped = analise['por_grupo']
+    groups = [['Tipo de estoque', 'Status', 'Qtde', 'Saldo inicial', 'Variação VJ',
+               'Baixas/Reclass.', 'Saldo final']]
+    groups += [
+        [tipo, status, f"{quantidade}", format_cents(inicial), format_cents(variacao),
+         format_cents(saidas), format_cents(final)]
+        for tipo, status, quantidade, inicial, variacao, saidas, final in zip(
+            grouped['tipo_estoque'], grouped['status'], grouped['quantidade'],
+            grouped['saldo_inicial'] + grouped['adicoes'],
+            grouped['ganhos_valor_justo'] + grouped['perdas_valor_justo'],
+            grouped['baixas'] + grouped['reclassificacoes'], grouped['saldo_final'],
+        )
+    ]
+    return reconciliation, groups
+
 
+def generate_ifrs_report_pdf(df, output_path, periodo, analise=None):
+    """
+    Gera relatório IFRS em PDF. `analise` é o resultado de analyze_movements
+    (calculado aqui se omitido).
+    """
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 
-def generate_ifrs_report_pdf(df, output_path, periodo):
-    """Gera relatório IFRS em PDF."""
     doc = SimpleDocTemplate(str(output_path), pagesize=A4)
     story = []
 
@@ -77,7 +141,7 @@ def generate_ifrs_report_pdf(df, output_path, periodo):
         ['Métrica', 'Valor'],
         ['Total de Propriedades', f"{total_properties}"],
         ['Valor Total do Portfólio', f"R$ {total_value:,.2f}"],
-        ['Valor Médio por Propriedade', f"R$ {total_value/total_properties:,.2f}" if total_properties > 0 else "R$ 0,00"],
+        ['Valor Médio por Propriedade', f"R$ {calculate_average_value(df):,.2f}"],
     ]
 
     summary_table = Table(summary_data, colWidths=[4*inch, 2*inch])
@@ -95,6 +159,45 @@ def generate_ifrs_report_pdf(df, output_path, periodo):
     story.append(summary_table)
     story.append(Spacer(1, 0.3*inch))
 
+    # Movimentação do valor justo (IAS 40)
+    analise = analise if analise is not None else analyze_movements(df)
+    if analise is not None:
+        reconciliation, groups = movement_tables(analise)
+        story.append(Paragraph(
+            f"<b>MOVIMENTAÇÃO DO VALOR JUSTO (IAS 40)</b> — "
+            f"{analise['inicio']:%d/%m/%Y} a {analise['fim']:%d/%m/%Y}", styles['Heading2']
+        ))
+        story.append(Spacer(1, 0.2*inch))
+
+        reconciliation_table = Table(reconciliation, colWidths=[4*inch, 2*inch])
+        reconciliation_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(reconciliation_table)
+        story.append(Spacer(1, 0.2*inch))
+
+        group_table = Table(groups, colWidths=[0.9*inch, 1.25*inch, 0.45*inch, 0.95*inch,
+                                               0.85*inch, 0.9*inch, 0.95*inch])
+        group_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]))
+        story.append(group_table)
+        story.append(Spacer(1, 0.3*inch))
+
     # Detalhamento por Propriedade
     story.append(Paragraph("<b>DETALHAMENTO POR PROPRIEDADE</b>", styles['Heading2']))
     story.append(Spacer(1, 0.2*inch))
@@ -137,8 +240,16 @@ def generate_ifrs_report_pdf(df, output_path, periodo):
     print(f"✅ Relatório PDF gerado: {output_path}")
 
 
-def generate_ifrs_report_excel(df, output_path, periodo):
-    """Gera relatório IFRS em Excel."""
+def generate_ifrs_report_excel(df, output_path, periodo, analise=None):
+    """
+    Gera relatório IFRS em Excel. `analise` é o resultado de analyze_movements
+    (calculado aqui se omitido).
+    """
+    import pandas as pd
+    from ifrs_analytics import in_reais
+
+    analise = analise if analise is not None else analyze_movements(df)
+
     with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
         workbook = writer.book
 
@@ -148,11 +259,19 @@ def generate_ifrs_report_excel(df, output_path, periodo):
             'Valor': [
                 len(df),
                 calculate_portfolio_value(df),
-                calculate_portfolio_value(df) / len(df) if len(df) > 0 else 0
+                calculate_average_value(df),
             ]
         })
         summary_df.to_excel(writer, sheet_name='Resumo', index=False)
 
+        # Movimentação do valor justo (IAS 40)
+        if analise is not None:
+            in_reais(analise['conciliacao']).to_excel(writer, sheet_name='Conciliação IAS 40',
+                                                      index=False)
+            in_reais(analise['por_grupo']).to_excel(writer, sheet_name='Movimentação', index=False)
+            writer.sheets['Conciliação IAS 40'].set_column('A:A', 45)
+            writer.sheets['Conciliação IAS 40'].set_column('B:B', 20)
+
         # Detalhamento
         df.to_excel(writer, sheet_name='Propriedades', index=False)
 
@@ -178,6 +297,12 @@ def main():
     parser.add_argument('--periodo', type=str,
                        default=datetime.now().strftime('%Y-%m'),
                        help='Período do relatório (YYYY-MM)')
+    parser.add_argument('--transacoes', nargs='+', default=None, metavar='CSV',
+                       help='CSVs de transações (formato de import_transacoes.py) usados '
+                            'nas adições e receitas da movimentação IAS 40')
+    parser.add_argument('--snapshot', action='store_true',
+                       help='Lê as propriedades do snapshot Arrow do portfólio (ver '
+                            'portfolio_snapshot.py) em vez do CSV processado')
 
     args = parser.parse_args()
 
@@ -189,7 +314,12 @@ def main():
     output_path.mkdir(parents=True, exist_ok=True)
 
     # Carrega dados
-    df = load_property_data(args.data_dir)
+    if args.snapshot:
+        from portfolio_snapshot import load_portfolio
+        df, origem = load_portfolio()
+        print(f"🗂️  Propriedades lidas do {origem}")
+    else:
+        df = load_property_data(args.data_dir)
 
     if df is None or df.empty:
         print("❌ Nenhum dado encontrado para gerar relatórios")
@@ -197,16 +327,30 @@ def main():
 
     print(f"📁 Carregados {len(df)} registros de propriedades")
 
+    transacoes = None
+    if args.transacoes:
+        from ifrs_analytics import load_transactions_csv
+        transacoes = load_transactions_csv(args.transacoes)
+        print(f"📁 Carregadas {len(transacoes)} transações")
+
+    # Movimentação do valor justo, calculada uma vez para os dois formatos
+    analise = analyze_movements(df, transacoes)
+    if analise is not None:
+        from money import format_cents
+
+        for label, value in analise['conciliacao'].itertuples(index=False):
+            print(f"   {label:<45} R$ {format_cents(value):>18}")
+
     # Gera relatórios
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
     if args.format in ['pdf', 'both']:
         pdf_path = output_path / f"relatorio_ifrs_{args.periodo}_{timestamp}.pdf"
-        generate_ifrs_report_pdf(df, pdf_path, args.periodo)
+        generate_ifrs_report_pdf(df, pdf_path, args.periodo, analise)
 
     if args.format in ['xlsx', 'both']:
         xlsx_path = output_path / f"relatorio_ifrs_{args.periodo}_{timestamp}.xlsx"
-        generate_ifrs_report_excel(df, xlsx_path, args.periodo)
+        generate_ifrs_report_excel(df, xlsx_path, args.periodo, analise)
 
     print("-" * 50)
     print("✅ Geração de relatórios concluída!")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos do portfólio.
+Produz, de forma determinística (seed), um propriedades.csv válido pelo
+data/schemas/propriedades_schema.json, com as mesmas convenções do arquivo
+real (códigos de 5 dígitos e SCP, 'N/A', datas ISO, observações com valores
+em R$), um razão de transações compatível com import_transacoes.py e a
+versão processada (layout da tabela propriedades) usada por relatórios,
+Obsidian e Hugging Face.
+
+    raw/propriedades.csv        layout do CSV original (validate/import)
+    raw/transacoes.csv          extrato de transações (import_transacoes)
+    processed/propriedades.csv  layout do banco (relatórios/obsidian/sync)
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+# Códigos de centro de custo de 5 dígitos (padrão ^[0-9]{5}$): 51001..99999 e
+# depois 10000..51000. Acima disso o schema só admite códigos 'SCP...'.
+FIRST_CODE = 51001
+CODE_CAPACITY = 90000
+
+TIPOS_ESTOQUE = (['Concluídos', 'De Terceiros', 'N/D'], [0.5, 0.4, 0.1])
+STATUS = (
+    ['Concluído', 'Locado', 'Vendido/Reclassificado', 'Concluído/Locado',
+     'Promessa_Compra_Venda', 'Aporte SCP'],
+    [0.55, 0.25, 0.08, 0.04, 0.05, 0.03],
+)
+EDIFICIOS = ['EMILIO BUMACHAR', 'PENSYLVANIA SJC', 'VILLA LOBOS', 'A7 VIX', 'YOUNIVERSE',
+             'PALAZZI BACUTIA', 'ILHA TRINDADE', 'PRAIA', 'MATA DA RESERVA', 'PALAIS D\'AZUR']
+BAIRROS = ['ENSEADA AZUL', 'PRAIA DA COSTA', 'ALPHAVILLE JACUHY', 'GUARAPARI', 'C.ITAPEMIRIM',
+           'JARDIM CAMBURI', 'BENTO FERREIRA', 'ITAPARICA', 'MATA DA PRAIA']
+SHOPPINGS = ['THE POINT PLAZA', 'VITORIA MALL', 'PRAIA SHOPPING']
+MESES = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+TIPOS_TRANSACAO = (
+    ['Aluguel', 'aluguel', 'Manutenção', 'manutencao', 'Reforma', 'Compra', 'Venda', 'Outro'],
+    [0.35, 0.15, 0.15, 0.1, 0.08, 0.05, 0.05, 0.07],
+)
+
+RAW_COLUMNS = [
+    'ID', 'CODIGO_CC', 'NOME_IMOVEL', 'TIPO_ESTOQUE', 'VALOR_31_12_2023_R$',
+    'VALOR_31_12_2024_R$', 'STATUS_ATUAL', 'PRECO_TOTAL_PROMESSA_R$',
+    'DATA_HABITE_SE_PREVISTA', 'OBSERVACOES_FINANCEIRAS',
+]
+
+
+def format_brl(value):
+    """1234.5 -> '1.234,50'"""
+    return f"{value:,.2f}".translate(str.maketrans(',.', '.,'))
+
+
+def property_names(rng, rows):
+    import numpy as np
+
+    kind = rng.integers(0, 6, rows)
+    number = rng.integers(1, 2000, rows)
+    quadra = rng.integers(1, 40, rows)
+    edificio = np.array(EDIFICIOS)[rng.integers(0, len(EDIFICIOS), rows)]
+    bairro = np.array(BAIRROS)[rng.integers(0, len(BAIRROS), rows)]
+    shopping = np.array(SHOPPINGS)[rng.integers(0, len(SHOPPINGS), rows)]
+    patterns = [
+        lambda n, q, e, b, s: f"APTO {n} EDF.{e}",
+        lambda n, q, e, b, s: f"TERRENO {n % 100:02d} QD {q} {b}",
+        lambda n, q, e, b, s: f"LOJA {n % 60:02d} SHOPPING {s}",
+        lambda n, q, e, b, s: f"LT.{n % 30} QD.{q}W {b}",
+        lambda n, q, e, b, s: f"SALA {n} ED.{e}",
+        lambda n, q, e, b, s: f"CASA {n % 50} - RESERVA {b}",
+    ]
+    return [patterns[k](n, q, e, b, s) for k, n, q, e, b, s in
+            zip(kind.tolist(), number.tolist(), quadra.tolist(),
+                edificio.tolist(), bairro.tolist(), shopping.tolist())]
+
+
+def rent_observation(rng_values, value):
+    """Observações de imóveis locados, nos formatos que aparecem no CSV real."""
+    kind, month, year, day = rng_values
+    rent = round(value * 0.006, 2)
+    return [
+        f"Gerou R$ {format_brl(rent)} de aluguel em {MESES[month]}/{year}",
+        f"Gera aluguel (R$ {format_brl(rent)} em {MESES[month]}/{year})",
+        f"Locado — contrato até {day:02d}/{month + 1:02d}/{year + 2}",
+        f"Locação de longo prazo ({kind + 5} anos) — aluguel avaliado em R$ {format_brl(rent)}/mês",
+    ][kind % 4]
+
+
+def generate_propriedades(rows, seed=42):
+    """Gera o DataFrame de propriedades no layout do CSV original."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, rows + 1)
+
+    status = rng.choice(STATUS[0], rows, p=STATUS[1])
+    tipo = rng.choice(TIPOS_ESTOQUE[0], rows, p=TIPOS_ESTOQUE[1])
+
+    # Participações SCP: ~0,5% das linhas, mais tudo o que exceder os
+    # códigos de 5 dígitos disponíveis
+    scp = (status == 'Aporte SCP') & (rng.random(rows) < 0.2)
+    numeric_slots = np.cumsum(~scp) - 1
+    scp |= numeric_slots >= CODE_CAPACITY
+    status = np.where(scp & (rng.random(rows) < 0.5), 'Aporte SCP', status)
+    tipo = np.where(status == 'Aporte SCP', 'N/D', tipo)
+
+    codes = (FIRST_CODE - 10000 + numeric_slots) % CODE_CAPACITY + 10000
+    edificio = np.array(EDIFICIOS)[rng.integers(0, len(EDIFICIOS), rows)]
+    codigo_cc = np.where(
+        scp,
+        np.char.add(np.char.add('SCP ', edificio.astype(str)), np.char.add(' ', ids.astype(str))),
+        codes.astype(str),
+    )
+
+    valor_2023 = np.round(rng.lognormal(np.log(300_000), 0.9, rows), 2)
+    valor_2024 = np.round(valor_2023 * (1 + rng.normal(0.03, 0.05, rows)).clip(0.5), 2)
+    valor_2024 = np.where(status == 'Vendido/Reclassificado', 0.0, valor_2024)
+    missing_2023 = (rng.random(rows) < 0.06) | (status == 'Aporte SCP')
+    missing_2024 = missing_2023 & (status != 'Aporte SCP')
+
+    promessa = np.isin(status, ['Promessa_Compra_Venda', 'Vendido/Reclassificado'])
+    preco_promessa = np.round(valor_2023 * rng.uniform(1.0, 1.3, rows), 2)
+    habite_se = pd.to_datetime('2025-01-01') + pd.to_timedelta(rng.integers(0, 1460, rows), 'D')
+    has_habite_se = (status == 'Promessa_Compra_Venda') & (rng.random(rows) < 0.6)
+
+    obs_random = rng.integers(0, 12, (rows, 3))
+    observacoes = []
+    for i, (st, tp, v) in enumerate(zip(status.tolist(), tipo.tolist(), valor_2023.tolist())):
+        if missing_2023[i] and st != 'Aporte SCP':
+            observacoes.append('Sem valor contábil explícito nas fontes')
+        elif st in ('Locado', 'Concluído/Locado'):
+            kind, month, day = obs_random[i]
+            observacoes.append(rent_observation(
+                (int(kind), int(month), 2023 + int(kind) % 3, int(day) + 1), v
+            ))
+        elif st == 'Vendido/Reclassificado':
+            observacoes.append('Pagamentos parcelados em 2025')
+        elif st == 'Promessa_Compra_Venda':
+            observacoes.append(f"Matrícula {200000 + i} — Promitente Comprador")
+        elif st == 'Aporte SCP':
+            observacoes.append('Aporte refletido em Participações Societárias')
+        elif tp == 'De Terceiros':
+            observacoes.append('Estoque de Imóveis de Terceiros')
+        else:
+            observacoes.append('Estoque de imóveis concluídos')
+
+    def money(values, missing):
+        return np.where(missing, 'N/A', np.char.mod('%.2f', values))
+
+    return pd.DataFrame({
+        'ID': ids,
+        'CODIGO_CC': codigo_cc,
+        'NOME_IMOVEL': property_names(rng, rows),
+        'TIPO_ESTOQUE': tipo,
+        'VALOR_31_12_2023_R$': money(valor_2023, missing_2023),
+        'VALOR_31_12_2024_R$': money(valor_2024, missing_2024),
+        'STATUS_ATUAL': status,
+        'PRECO_TOTAL_PROMESSA_R$': money(preco_promessa, ~promessa),
+        'DATA_HABITE_SE_PREVISTA': np.where(has_habite_se, habite_se.strftime('%Y-%m-%d'), 'N/A'),
+        'OBSERVACOES_FINANCEIRAS': observacoes,
+    }, columns=RAW_COLUMNS)
+
+
+def generate_transacoes(propriedades, rows, seed=42):
+    """
+    Gera um extrato de transações das propriedades informadas, misturando os
+    formatos aceitos por import_transacoes.py (datas ISO e DD/MM/YYYY, valores
+    '1234.56' e 'R$ 1.234,56', tipos com e sem acento).
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed + 1)
+    codes = propriedades['CODIGO_CC'].to_numpy()
+    rented = codes[propriedades['STATUS_ATUAL'].isin(['Locado', 'Concluído/Locado']).to_numpy()]
+
+    tipo = rng.choice(TIPOS_TRANSACAO[0], rows, p=TIPOS_TRANSACAO[1])
+    is_rent = np.char.lower(tipo.astype(str)) == 'aluguel'
+    codigo = codes[rng.integers(0, len(codes), rows)]
+    if len(rented):
+        codigo = np.where(is_rent, rented[rng.integers(0, len(rented), rows)], codigo)
+
+    data = pd.to_datetime('2023-01-01') + pd.to_timedelta(rng.integers(0, 1095, rows), 'D')
+    brazilian_date = rng.random(rows) < 0.3
+    data_text = np.where(brazilian_date, data.strftime('%d/%m/%Y'), data.strftime('%Y-%m-%d'))
+
+    valor = np.round(np.where(is_rent, rng.uniform(800, 40_000, rows),
+                              rng.lognormal(np.log(5_000), 1.2, rows)), 2)
+    brazilian_value = rng.random(rows) < 0.3
+    valor_text = np.array([f"R$ {format_brl(v)}" if br else f"{v:.2f}"
+                           for v, br in zip(valor.tolist(), brazilian_value.tolist())])
+
+    return pd.DataFrame({
+        'codigo_cc': codigo,
+        'data': data_text,
+        'tipo': tipo,
+        'valor': valor_text,
+        'historico': np.char.add(np.char.add(tipo.astype(str), ' - '), codigo.astype(str)),
+        'categoria': np.where(np.isin(tipo, ['Aluguel', 'aluguel', 'Venda']), 'Receita', 'Despesa'),
+        'documento': np.char.add(f"SINT{seed}-", np.char.zfill(np.arange(rows).astype(str), 9)),
+    })
+
+
+def generate_dataset(output_dir, propriedades=1000, transacoes=None, seed=42):
+    """
+    Grava raw/ e processed/ em `output_dir`. Retorna {arquivo: linhas}.
+    Por padrão gera 10 transações por propriedade.
+    """
+    from import_propriedades import prepare_frame
+
+    output_path = Path(output_dir)
+    (output_path / 'raw').mkdir(parents=True, exist_ok=True)
+    (output_path / 'processed').mkdir(parents=True, exist_ok=True)
+    transacoes = propriedades * 10 if transacoes is None else transacoes
+
+    props = generate_propriedades(propriedades, seed)
+    props.to_csv(output_path / 'raw' / 'propriedades.csv', index=False)
+
+    # Mesmo caminho de conversão do import_propriedades.py
+    processed = prepare_frame(props.replace('N/A', None))
+    processed.to_csv(output_path / 'processed' / 'propriedades.csv', index=False)
+
+    files = {'raw/propriedades.csv': len(props), 'processed/propriedades.csv': len(processed)}
+    if transacoes:
+        ledger = generate_transacoes(props, transacoes, seed)
+        ledger.to_csv(output_path / 'raw' / 'transacoes.csv', index=False)
+        files['raw/transacoes.csv'] = len(ledger)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos do portfólio')
+    parser.add_argument('--propriedades', type=int, default=1000,
+                        help='Número de propriedades')
+    parser.add_argument('--transacoes', type=int, default=None,
+                        help='Número de transações (padrão: 10 por propriedade; 0 desativa)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Semente (mesma semente, mesmos arquivos)')
+    parser.add_argument('--output-dir', type=str,
+                        default=os.getenv('DATA_SYNTHETIC_PATH', './data/synthetic'),
+                        help='Diretório de saída (cria raw/ e processed/)')
+
+    args = parser.parse_args()
+
+    print("🧪 Geração de dados sintéticos")
+    print("-" * 50)
+    start = time.perf_counter()
+    files = generate_dataset(args.output_dir, args.propriedades, args.transacoes, args.seed)
+    for name, rows in files.items():
+        print(f"  ✓ {name}: {rows:,} linhas")
+    print("-" * 50)
+    print(f"✅ Dados gerados em {args.output_dir} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Movimentação do valor justo das propriedades para investimento (IFRS / IAS 40).
+
+Concilia o saldo inicial com o saldo final do período, por tipo_estoque e
+status: adições (aquisições e benfeitorias), ganhos e perdas de valor justo,
+baixas (Vendido/Reclassificado) e reclassificações (Aporte SCP,
+Promessa_Compra_Venda). As transações do período são somadas por
+propriedade com group-by; todo o cálculo é vetorizado (sem loop por linha).
+Valores em centavos (int64, via money.py): somas e a conciliação são exatas;
+in_reais() converte para a saída. Usado por generate_ifrs_reports.py nos
+relatórios PDF e Excel.
+"""
+
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Status -> classe da movimentação; os demais status continuam no portfólio
+STATUS_CLASSES = {
+    'Vendido/Reclassificado': 'baixa',
+    'Aporte SCP': 'reclassificacao',
+    'Promessa_Compra_Venda': 'reclassificacao',
+}
+
+# Tipos de transação (import_transacoes.TIPOS_TRANSACAO) tratados como adições
+ADDITION_TYPES = ['compra', 'reforma']
+
+MOVEMENT_COLUMNS = [
+    'saldo_inicial', 'adicoes', 'ganhos_valor_justo', 'perdas_valor_justo',
+    'baixas', 'reclassificacoes', 'saldo_final',
+]
+TRANSACTION_COLUMNS = ['receita_aluguel', 'receita_venda', 'resultado_baixa']
+GROUP_COLUMNS = ['tipo_estoque', 'status']
+
+# Linhas da conciliação: (rótulo, coluna)
+RECONCILIATION_LINES = [
+    ('Saldo inicial', 'saldo_inicial'),
+    ('Adições (aquisições e benfeitorias)', 'adicoes'),
+    ('Ganhos de valor justo', 'ganhos_valor_justo'),
+    ('Perdas de valor justo', 'perdas_valor_justo'),
+    ('Baixas (vendas)', 'baixas'),
+    ('Reclassificações (SCP e promessas de venda)', 'reclassificacoes'),
+    ('Saldo final', 'saldo_final'),
+]
+
+VALUE_COLUMN = re.compile(r'^valor_(\d{4})$')
+
+
+def valuation_period(df):
+    """
+    Colunas de abertura e fechamento do período: as duas valor_AAAA mais
+    recentes do layout processado (import_propriedades.prepare_frame emite
+    uma por exercício do CSV; do banco, ver with_year_end_valuations).
+    Retorna (abertura, fechamento, inicio, fim), com as datas em 31/12 de
+    cada ano.
+    """
+    years = []
+    for column in df.columns:
+        match = VALUE_COLUMN.match(str(column))
+        if match:
+            years.append(int(match.group(1)))
+    if len(years) < 2:
+        raise ValueError("São necessárias duas colunas valor_AAAA (abertura e fechamento)")
+    opening, closing = sorted(years)[-2:]
+    return f'valor_{opening}', f'valor_{closing}', date(opening, 12, 31), date(closing, 12, 31)
+
+
+def with_year_end_valuations(df, avaliacoes):
+    """
+    Substitui as colunas valor_AAAA de `df` pelas avaliações de 31/12 da
+    série histórica (codigo, data_referencia, valor; ver tabela avaliacoes),
+    uma coluna por exercício. Havendo mais de uma linha por propriedade e
+    data, vale a última. Propriedades sem avaliação no exercício ficam vazias.
+    """
+    datas = pd.to_datetime(avaliacoes['data_referencia'])
+    year_end = ((datas.dt.month == 12) & (datas.dt.day == 31)).to_numpy()
+    wide = (
+        pd.DataFrame({
+            'codigo': avaliacoes['codigo'].astype(str).to_numpy()[year_end],
+            'ano': datas.dt.year.to_numpy()[year_end],
+            'valor': avaliacoes['valor'].to_numpy()[year_end],
+        })
+        .drop_duplicates(['codigo', 'ano'], keep='last')
+        .pivot(index='codigo', columns='ano', values='valor')
+        .reindex(df['codigo'].astype(str))
+    )
+    base = df.drop(columns=[column for column in df.columns if VALUE_COLUMN.match(str(column))])
+    return base.assign(**{f'valor_{year}': wide[year].to_numpy() for year in wide.columns})
+
+
+def load_transactions_csv(paths):
+    """
+    Lê CSVs de transações no formato aceito por import_transacoes.py e
+    devolve codigo, tipo_transacao (normalizado), valor e data_transacao.
+    Linhas com valor ou data inválidos são descartadas.
+    """
+    from import_transacoes import normalize_tipo, parse_data, parse_valor, resolve_columns
+
+    frames = []
+    for path in paths:
+        raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+        df = raw.rename(columns=resolve_columns(raw.columns))
+        frames.append(pd.DataFrame({
+            'codigo': df['codigo'].str.strip(),
+            'tipo_transacao': normalize_tipo(df['tipo_transacao']),
+            'valor': parse_valor(df['valor']),
+            'data_transacao': parse_data(df['data_transacao']),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['codigo', 'tipo_transacao', 'valor', 'data_transacao'])
+    return pd.concat(frames, ignore_index=True).dropna(subset=['valor', 'data_transacao'])
+
+
+def summarize_transactions(transacoes, inicio=None, fim=None):
+    """
+    Soma das transações no período (inicio, fim] por propriedade e tipo, em
+    centavos: DataFrame indexado por codigo, com uma coluna por tipo_transacao.
+    """
+    from money import parse_cents
+
+    frame = transacoes.assign(valor=parse_cents(transacoes['valor']).fillna(0))
+    if inicio is not None or fim is not None:
+        datas = pd.to_datetime(frame['data_transacao'])
+        mask = np.ones(len(frame), dtype=bool)
+        if inicio is not None:
+            mask &= (datas > pd.Timestamp(inicio)).to_numpy()
+        if fim is not None:
+            mask &= (datas <= pd.Timestamp(fim)).to_numpy()
+        frame = frame.loc[mask]
+    return (
+        frame.groupby([frame['codigo'].astype(str), 'tipo_transacao'], sort=False)['valor']
+        .sum()
+        .unstack(fill_value=0)
+    )
+
+
+def property_movements(df, transacoes=None):
+    """
+    Movimentação de cada propriedade no período de valuation_period(df), em
+    centavos.
+
+    - Propriedade sem valor de abertura entra como adição pelo valor do
+      período, sem ganho ou perda.
+    - O valor do período é o de fechamento; sem ele (vazio ou zero, como nas
+      vendidas), o saldo inicial mais as adições.
+    - Ganho/perda = valor do período - saldo inicial - adições.
+    - Baixas e reclassificações retiram o valor do período do saldo.
+    - resultado_baixa = receita de venda - valor baixado (só com receita).
+    """
+    from money import cents_array
+
+    opening_col, closing_col, inicio, fim = valuation_period(df)
+    saldo_inicial, new = cents_array(df[opening_col])
+    closing, _ = cents_array(df[closing_col])
+    classe = df['status'].map(STATUS_CLASSES).fillna('continuada').to_numpy()
+
+    sums = np.zeros((len(df), 4), dtype='int64')
+    if transacoes is not None and len(transacoes):
+        sums = (
+            summarize_transactions(transacoes, inicio, fim)
+            .reindex(index=df['codigo'].astype(str), columns=ADDITION_TYPES + ['aluguel', 'venda'])
+            .fillna(0)
+            .to_numpy(dtype='int64')
+        )
+    capex = sums[:, 0] + sums[:, 1]
+    rent, sale = sums[:, 2], sums[:, 3]
+
+    valor = np.where(closing > 0, closing, saldo_inicial + capex)
+    adicoes = np.where(new, valor, capex)
+    variacao = valor - saldo_inicial - adicoes
+    is_disposal = classe == 'baixa'
+    baixas = np.where(is_disposal, -valor, 0)
+    reclassificacoes = np.where(classe == 'reclassificacao', -valor, 0)
+
+    return pd.DataFrame({
+        'codigo': df['codigo'].to_numpy(),
+        'tipo_estoque': df['tipo_estoque'].fillna('N/D').to_numpy(),
+        'status': df['status'].fillna('N/D').to_numpy(),
+        'classe': classe,
+        'saldo_inicial': saldo_inicial,
+        'adicoes': adicoes,
+        'ganhos_valor_justo': np.maximum(variacao, 0),
+        'perdas_valor_justo': np.minimum(variacao, 0),
+        'baixas': baixas,
+        'reclassificacoes': reclassificacoes,
+        'saldo_final': valor + baixas + reclassificacoes,
+        'receita_aluguel': rent,
+        'receita_venda': sale,
+        'resultado_baixa': np.where(is_disposal & (sale > 0), sale - valor, 0),
+    })
+
+
+def movements_by_group(movements, by=GROUP_COLUMNS):
+    """Soma as movimentações por grupo (padrão: tipo_estoque e status)."""
+    grouped = movements.groupby(list(by), sort=True)
+    result = grouped[MOVEMENT_COLUMNS + TRANSACTION_COLUMNS].sum()
+    result.insert(0, 'quantidade', grouped.size())
+    return result.reset_index()
+
+
+def reconciliation(movements):
+    """Conciliação do saldo inicial com o final (uma linha por movimentação, em centavos)."""
+    totals = movements[MOVEMENT_COLUMNS].sum()
+    return pd.DataFrame({
+        'movimentacao': [label for label, _ in RECONCILIATION_LINES],
+        'valor': np.array([totals[column] for _, column in RECONCILIATION_LINES], dtype='int64'),
+    })
+
+
+def in_reais(frame):
+    """Cópia de um resultado de analyze_portfolio com os centavos em R$ (float), para saída."""
+    from money import cents_to_float
+
+    columns = [column for column in frame.columns
+               if column in MOVEMENT_COLUMNS + TRANSACTION_COLUMNS + ['valor']]
+    return frame.assign(**{column: cents_to_float(frame[column]) for column in columns})
+
+
+def analyze_portfolio(df, transacoes=None):
+    """
+    Calcula tudo o que os relatórios usam: movimentação por propriedade,
+    por tipo_estoque/status e a conciliação do período (em centavos).
+    """
+    _, _, inicio, fim = valuation_period(df)
+    movements = property_movements(df, transacoes)
+    return {
+        'inicio': inicio,
+        'fim': fim,
+        'propriedades': movements,
+        'por_grupo': movements_by_group(movements),
+        'conciliacao': reconciliation(movements),
+    }
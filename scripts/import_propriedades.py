@@ -5,12 +5,12 @@ Processa o arquivo CSV e insere/atualiza dados no banco de dados.
 """
 
 import os
+import re
 import sys
 import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 from dotenv import load_dotenv
-import pandas as pd
 import psycopg2
 from psycopg2.extras import execute_values, Json
 from psycopg2 import sql
@@ -39,6 +39,8 @@ def get_db_connection():
 
 def normalize_value(value):
     """Normaliza valores N/A e strings numéricas."""
+    import pandas as pd
+
     if pd.isna(value) or value == 'N/A' or value == '':
         return None
     if isinstance(value, str):
@@ -46,15 +48,17 @@ def normalize_value(value):
         value = value.strip()
         if value == 'N/A' or value == '':
             return None
-        try:
-            return float(value.replace(',', '.'))
-        except ValueError:
-            return value
+        from money import cents_to_float, to_cents
+
+        cents = to_cents(value)
+        return value if cents is None else float(cents_to_float(cents))
     return value
 
 
 def normalize_date(value):
     """Normaliza datas."""
+    import pandas as pd
+
     if pd.isna(value) or value == 'N/A' or value == '':
         return None
     if isinstance(value, str):
@@ -64,9 +68,164 @@ def normalize_date(value):
     return value
 
 
+PROPRIEDADES_COLUMNS = [
+    'codigo', 'codigo_cc', 'nome', 'tipo_estoque', 'valor_avaliacao',
+    'valor_2023', 'valor_2024', 'preco_promessa', 'status',
+    'data_habite_se_prevista', 'observacoes',
+]
+
+
+# Colunas de avaliação do CSV: VALOR_31_12_2024_R$ -> 2024-12-31
+VALUATION_COLUMN = re.compile(r'^VALOR_(\d{2})_(\d{2})_(\d{4})_R\$$')
+
+INSERT_AVALIACOES_SQL = """
+    INSERT INTO avaliacoes (propriedade_id, data_referencia, valor, fonte)
+    SELECT p.id, v.data_referencia, v.valor, v.fonte
+    FROM (VALUES %s) AS v (codigo, data_referencia, valor, fonte)
+    JOIN propriedades p ON p.codigo = v.codigo
+    WHERE v.valor IS DISTINCT FROM (
+        SELECT a.valor FROM avaliacoes a
+        WHERE a.propriedade_id = p.id AND a.data_referencia = v.data_referencia
+        ORDER BY a.id DESC
+        LIMIT 1
+    )
+    RETURNING 1
+"""
+
+
+def valuation_columns(columns):
+    """Colunas VALOR_DD_MM_AAAA_R$ presentes, em ordem cronológica: [(coluna, data)]."""
+    found = []
+    for column in columns:
+        match = VALUATION_COLUMN.match(str(column))
+        if not match:
+            continue
+        day, month, year = (int(group) for group in match.groups())
+        try:
+            found.append((column, date(year, month, day)))
+        except ValueError:
+            print(f"⚠️  Coluna de avaliação com data inválida ignorada: {column}")
+    return sorted(found, key=lambda item: item[1])
+
+
+def latest_valuation(values):
+    """
+    Valor de avaliação a partir dos valores em ordem cronológica: o mais
+    recente diferente de zero/vazio (generaliza `valor_2024 or valor_2023`).
+    """
+    result = values[0] if values else None
+    for value in values[1:]:
+        result = value or result
+    return result
+
+
+def normalize_numeric_column(series):
+    """
+    Versão vetorizada de normalize_value para colunas numéricas: valores em
+    R$ ('9.500,00', '1234.56') arredondados ao centavo; inválidos viram NaN.
+    """
+    from money import cents_to_float, parse_cents
+
+    return cents_to_float(parse_cents(series))
+
+
+def prepare_frame(df):
+    """
+    Converte o DataFrame do CSV em colunas da tabela propriedades, sem loop por linha.
+
+    Aceita tanto o layout do CSV bruto (CODIGO_CC, NOME_IMOVEL, ...) quanto
+    dados já no layout do banco (codigo, nome, ...), como os publicados no
+    Hugging Face. Linhas totalmente vazias são descartadas. Do CSV bruto sai
+    também um valor_AAAA para cada exercício além de 2023 e 2024 (fora da
+    tabela; no banco eles ficam em avaliacoes).
+    """
+    import pandas as pd
+
+    df = df.dropna(how='all')
+    if 'codigo' in df.columns and 'CODIGO_CC' not in df.columns:
+        frame = df.reindex(columns=PROPRIEDADES_COLUMNS).copy()
+        for column in ('valor_avaliacao', 'valor_2023', 'valor_2024', 'preco_promessa'):
+            frame[column] = normalize_numeric_column(frame[column])
+        frame['codigo'] = frame['codigo'].astype(str)
+        frame['codigo_cc'] = frame['codigo_cc'].fillna(frame['codigo']).astype(str)
+    else:
+        columns = valuation_columns(df.columns)
+        valuations = [normalize_numeric_column(df[column]) for column, _ in columns]
+        valor_avaliacao = valuations[0] if valuations else pd.Series(index=df.index, dtype=float)
+        for values in valuations[1:]:
+            valor_avaliacao = values.where(values.fillna(0) != 0, valor_avaliacao)
+        # Um valor_AAAA por exercício (31/12), para ifrs_analytics.valuation_period;
+        # valor_2023 e valor_2024 são colunas do banco e existem mesmo sem o exercício
+        yearly = {f'valor_{reference.year}': values
+                  for (_, reference), values in zip(columns, valuations)
+                  if (reference.month, reference.day) == (12, 31)}
+        empty = pd.Series(index=df.index, dtype=float)
+        valor_2023 = yearly.pop('valor_2023', empty)
+        valor_2024 = yearly.pop('valor_2024', empty)
+        codigo = df['CODIGO_CC'].astype(str)
+        frame = pd.DataFrame({
+            'codigo': codigo,
+            'codigo_cc': codigo,
+            'nome': df['NOME_IMOVEL'].astype(str),
+            'tipo_estoque': df.get('TIPO_ESTOQUE', pd.Series('N/D', index=df.index)).astype(str),
+            # Mesma regra de prepare_data (latest_valuation)
+            'valor_avaliacao': valor_avaliacao,
+            'valor_2023': valor_2023,
+            'valor_2024': valor_2024,
+            'preco_promessa': normalize_numeric_column(
+                df.get('PRECO_TOTAL_PROMESSA_R$', pd.Series(index=df.index))
+            ),
+            'status': df.get('STATUS_ATUAL', pd.Series('Concluído', index=df.index)).astype(str),
+            'data_habite_se_prevista': df.get('DATA_HABITE_SE_PREVISTA', pd.Series(index=df.index)),
+            'observacoes': df.get('OBSERVACOES_FINANCEIRAS', pd.Series('', index=df.index)),
+            **yearly,
+        })
+
+    frame['data_habite_se_prevista'] = pd.to_datetime(
+        frame['data_habite_se_prevista'], format='%Y-%m-%d', errors='coerce'
+    ).dt.date
+    return frame
+
+
+def prepare_avaliacoes(df):
+    """
+    Converte as colunas VALOR_DD_MM_AAAA_R$ do CSV bruto em linhas
+    (codigo, data_referencia, valor) para a tabela avaliacoes.
+    """
+    import pandas as pd
+
+    columns = valuation_columns(df.columns)
+    if not columns or 'CODIGO_CC' not in df.columns:
+        return pd.DataFrame(columns=['codigo', 'data_referencia', 'valor'])
+
+    wide = pd.DataFrame({reference: normalize_numeric_column(df[column])
+                         for column, reference in columns})
+    wide['codigo'] = df['CODIGO_CC'].astype(str)
+    long = wide.melt(id_vars='codigo', var_name='data_referencia', value_name='valor')
+    return long.dropna(subset=['valor']).reset_index(drop=True)
+
+
+def insert_avaliacoes(cursor, avaliacoes, fonte='importacao', page_size=1000):
+    """
+    Acrescenta as avaliações ao histórico. Uma linha só é inserida se o
+    valor for diferente da última avaliação registrada para a mesma
+    propriedade e data, então reimportar o mesmo CSV não duplica nada.
+    Retorna o número de linhas inseridas.
+    """
+    rows = [(codigo, reference, float(valor), fonte)
+            for codigo, reference, valor in avaliacoes.itertuples(index=False, name=None)]
+    if not rows:
+        return 0
+    inserted = execute_values(cursor, INSERT_AVALIACOES_SQL, rows,
+                              template='(%s, %s::date, %s::numeric, %s)',
+                              page_size=page_size, fetch=True)
+    return len(inserted)
+
+
 def prepare_data(df):
     """Prepara dados do DataFrame para inserção no banco."""
     records = []
+    valuations = valuation_columns(df.columns)
 
     for _, row in df.iterrows():
         valor_2023 = normalize_value(row.get('VALOR_31_12_2023_R$'))
@@ -89,36 +248,49 @@ def prepare_data(df):
             'nome': str(row['NOME_IMOVEL']),
             'tipo_propriedade': None,  # Pode ser inferido do nome depois
             'tipo_estoque': str(row.get('TIPO_ESTOQUE', 'N/D')),
-            'valor_avaliacao': valor_2024 or valor_2023,
+            'valor_avaliacao': latest_valuation(
+                [normalize_value(row.get(column)) for column, _ in valuations]
+            ),
             'valor_2023': valor_2023,
             'valor_2024': valor_2024,
             'preco_promessa': preco_promessa,
             'status': str(row.get('STATUS_ATUAL', 'Concluído')),
             'data_habite_se_prevista': data_habite_se,
             'observacoes': str(row.get('OBSERVACOES_FINANCEIRAS', '')),
-            'metadata': {
-                'id': int(row['ID']),
-                'codigo_cc': str(row['CODIGO_CC']),
-                'valor_2023': valor_2023,
-                'valor_2024': valor_2024,
-                'preco_promessa': preco_promessa,
-                'data_habite_se': str(data_habite_se) if data_habite_se else None,
-                'tipo_estoque': str(row.get('TIPO_ESTOQUE', 'N/D'))
-            }
+            # Só o que não tem coluna própria (ver migração 008)
+            'metadata': {'id': int(row['ID'])}
         }
         records.append(record)
 
     return records
 
 
-def import_propriedades(csv_path, dry_run=False):
-    """Importa propriedades do CSV para o banco de dados."""
+def record_import(cursor, processed, inserted, updated, metadata):
+    """Registra a importação concluída em sincronizacoes (versão do snapshot)."""
+    cursor.execute("""
+        INSERT INTO sincronizacoes (
+            origem, tipo_sincronizacao, status, registros_processados,
+            registros_inseridos, registros_atualizados, metadata, concluido_em
+        ) VALUES ('manual', 'import_propriedades', 'concluido', %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    """, (processed, inserted, updated, Json(metadata)))
+
+
+def import_propriedades(csv_path, dry_run=False, read_csv=None):
+    """
+    Importa propriedades do CSV para o banco de dados. `read_csv` permite
+    reaproveitar um DataFrame já carregado (ver scripts/pipeline.py);
+    padrão pd.read_csv.
+    """
+    import pandas as pd
+
+    read_csv = read_csv or pd.read_csv
+
     print(f"📊 Importando propriedades de {csv_path}")
     print("-" * 50)
 
     # Carrega CSV
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv(csv_path)
         print(f"✅ CSV carregado: {len(df)} registros")
     except Exception as e:
         print(f"❌ Erro ao carregar CSV: {e}")
@@ -128,6 +300,13 @@ def import_propriedades(csv_path, dry_run=False):
     records = prepare_data(df)
     print(f"✅ Dados preparados: {len(records)} registros")
 
+    # Aluguéis citados em OBSERVACOES_FINANCEIRAS viram transações
+    from extract_observacoes import extract_rent, load_rent_transactions, print_unmatched
+
+    alugueis, nao_reconhecidas = extract_rent(df)
+    print(f"✅ Aluguéis extraídos das observações: {len(alugueis)}")
+    print_unmatched(nao_reconhecidas)
+
     if dry_run:
         print("\n🔍 DRY RUN - Dados que seriam inseridos:")
         for i, record in enumerate(records[:5], 1):
@@ -144,17 +323,18 @@ def import_propriedades(csv_path, dry_run=False):
     cursor = conn.cursor()
 
     try:
-        # Insere ou atualiza propriedades
+        from property_index import PropertyIndex
+
+        # Insere ou atualiza propriedades; os códigos existentes vêm do índice
+        # de propriedades (uma consulta), não de um SELECT por registro
         inserted = 0
         updated = 0
+        existing_rows = PropertyIndex.from_postgres(conn).rows([r['codigo'] for r in records])
+        seen = set()
 
-        for record in records:
-            # Verifica se já existe
-            cursor.execute(
-                "SELECT id FROM propriedades WHERE codigo = %s",
-                (record['codigo'],)
-            )
-            existing = cursor.fetchone()
+        for record, existing_row in zip(records, existing_rows):
+            existing = existing_row >= 0 or record['codigo'] in seen
+            seen.add(record['codigo'])
 
             if existing:
                 # Atualiza
@@ -213,13 +393,36 @@ def import_propriedades(csv_path, dry_run=False):
                 ))
                 inserted += 1
 
+        avaliacoes = insert_avaliacoes(cursor, prepare_avaliacoes(df))
+        alugueis_inseridos, _ = load_rent_transactions(cursor, alugueis)
+        record_import(cursor, len(records), inserted, updated, {
+            'arquivo': str(csv_path),
+            'avaliacoes': avaliacoes,
+            'alugueis': alugueis_inseridos,
+        })
+
         conn.commit()
 
         print(f"\n✅ Importação concluída!")
         print(f"   Inseridos: {inserted}")
         print(f"   Atualizados: {updated}")
+        print(f"   Avaliações registradas: {avaliacoes}")
+        print(f"   Aluguéis registrados em transações: {alugueis_inseridos}")
         print(f"   Total processado: {len(records)}")
 
+        # Snapshot Arrow e índice atualizados para os demais scripts. A
+        # importação já foi gravada: uma falha aqui só gera aviso (o snapshot
+        # defasado é regravado na próxima leitura; o índice, com `bni indice construir`)
+        from portfolio_snapshot import refresh_after_import
+
+        try:
+            snapshot_dir, index_path = refresh_after_import(conn)
+            print(f"   Snapshot do portfólio: {snapshot_dir}")
+            print(f"   Índice de propriedades: {index_path}")
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️  Snapshot/índice não atualizados: {e}")
+
     except Exception as e:
         conn.rollback()
         print(f"❌ Erro durante importação: {e}")
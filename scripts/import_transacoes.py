@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Script para importar transações (extratos bancários / ERP) para PostgreSQL.
+Lê os CSVs em blocos, resolve o código da propriedade, valida os dados de
+forma vetorizada e carrega via COPY, ignorando transações já importadas.
+"""
+
+import os
+import sys
+import io
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+from psycopg2.extras import Json
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+CHUNK_ROWS = 200_000
+
+# Valores aceitos pela constraint chk_tipo_transacao (scripts/init.sql)
+TIPOS_TRANSACAO = ('compra', 'venda', 'aluguel', 'manutencao', 'reforma', 'outro')
+
+# Nome da coluna no banco -> nomes aceitos no CSV (comparação sem maiúsculas)
+COLUMN_ALIASES = {
+    'codigo': ('codigo_cc', 'codigo', 'cc', 'centro_custo'),
+    'data_transacao': ('data_transacao', 'data', 'dt_lancamento', 'data_lancamento'),
+    'tipo_transacao': ('tipo_transacao', 'tipo'),
+    'valor': ('valor', 'valor_r$', 'valor_rs'),
+    'descricao': ('descricao', 'historico', 'descricao_lancamento'),
+    'categoria': ('categoria', 'conta'),
+    'documento': ('documento', 'id_transacao', 'id_externo', 'num_documento'),
+}
+
+STAGING_COLUMNS = [
+    'propriedade_id', 'codigo', 'tipo_transacao', 'valor', 'data_transacao',
+    'descricao', 'categoria', 'documento',
+]
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def load_property_lookup(cursor):
+    """
+    Monta o dicionário código -> propriedade_id uma única vez.
+
+    Tanto `codigo` quanto `codigo_cc` resolvem para o id da propriedade.
+    """
+    cursor.execute("SELECT id, codigo, codigo_cc FROM propriedades")
+    lookup = {}
+    for prop_id, codigo, codigo_cc in cursor.fetchall():
+        if codigo_cc:
+            lookup[str(codigo_cc)] = prop_id
+        lookup[str(codigo)] = prop_id
+    return lookup
+
+
+def resolve_columns(columns):
+    """Mapeia as colunas do CSV para os nomes usados no banco."""
+    normalized = {c.strip().lower(): c for c in columns}
+    mapping = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                mapping[normalized[alias]] = target
+                break
+
+    missing = {'codigo', 'data_transacao', 'tipo_transacao', 'valor'} - set(mapping.values())
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes no CSV: {', '.join(sorted(missing))}")
+    return mapping
+
+
+def parse_valor(series):
+    """
+    Converte valores monetários em float de forma vetorizada.
+
+    Aceita '1234.56', '1.234,56' e 'R$ 1.234,56'; inválidos viram NaN. O
+    valor é lido em centavos inteiros (money.parse_cents) e só então
+    convertido, então cada float é exatamente o valor com duas casas.
+    """
+    from money import cents_to_float, parse_cents
+
+    return cents_to_float(parse_cents(series))
+
+
+def parse_data(series):
+    """Converte datas ISO (YYYY-MM-DD) ou brasileiras (DD/MM/YYYY)."""
+    import pandas as pd
+
+    text = series.astype('string').str.strip()
+    parsed = pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+    return parsed.fillna(pd.to_datetime(text, format='%d/%m/%Y', errors='coerce'))
+
+
+def normalize_tipo(series):
+    """Normaliza o tipo: minúsculas, sem acentos e sem espaços nas bordas."""
+    return (
+        series.astype('string').str.strip().str.lower()
+        .str.normalize('NFKD').str.encode('ascii', errors='ignore').str.decode('ascii')
+    )
+
+
+def prepare_chunk(chunk, lookup):
+    """
+    Valida e converte um bloco do CSV, sem loops por linha.
+
+    Retorna (válidos, rejeitados); os rejeitados recebem a coluna `motivo`.
+    """
+    import pandas as pd
+
+    df = chunk.rename(columns=resolve_columns(chunk.columns))
+    for optional in ('descricao', 'categoria', 'documento'):
+        if optional not in df.columns:
+            df[optional] = pd.NA
+
+    df['codigo'] = df['codigo'].astype('string').str.strip()
+    df['propriedade_id'] = df['codigo'].map(lookup)
+    df['tipo_transacao'] = normalize_tipo(df['tipo_transacao'])
+    df['valor'] = parse_valor(df['valor'])
+    df['data_transacao'] = parse_data(df['data_transacao'])
+
+    motivo = pd.Series(pd.NA, index=df.index, dtype='string')
+    motivo = motivo.mask(df['data_transacao'].isna(), 'data inválida')
+    motivo = motivo.mask(df['valor'].isna(), 'valor inválido')
+    motivo = motivo.mask(~df['tipo_transacao'].isin(TIPOS_TRANSACAO), 'tipo_transacao inválido')
+    motivo = motivo.mask(df['propriedade_id'].isna(), 'propriedade não encontrada')
+
+    rejected = chunk.loc[motivo.notna()].assign(motivo=motivo[motivo.notna()])
+    valid = df.loc[motivo.isna(), STAGING_COLUMNS].copy()
+    valid['propriedade_id'] = valid['propriedade_id'].astype('int64')
+    valid['data_transacao'] = valid['data_transacao'].dt.strftime('%Y-%m-%d')
+    return valid, rejected
+
+
+def create_staging_table(cursor):
+    """Tabela temporária que recebe cada bloco via COPY."""
+    cursor.execute("""
+        CREATE TEMP TABLE stg_transacoes (
+            propriedade_id INTEGER,
+            codigo TEXT,
+            tipo_transacao VARCHAR(50),
+            valor DECIMAL(12, 2),
+            data_transacao DATE,
+            descricao TEXT,
+            categoria VARCHAR(100),
+            documento TEXT
+        )
+    """)
+
+
+def load_chunk(cursor, valid):
+    """
+    Carrega um bloco validado: COPY para staging e INSERT idempotente.
+
+    O hash da chave natural é calculado no banco (md5 estável entre versões);
+    linhas já importadas são ignoradas por ON CONFLICT. Retorna o número de
+    linhas inseridas.
+    """
+    cursor.execute("TRUNCATE stg_transacoes")
+    buffer = io.StringIO()
+    valid.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY stg_transacoes ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+    cursor.execute("""
+        SELECT garantir_particoes_transacoes(MIN(data_transacao), MAX(data_transacao))
+        FROM stg_transacoes
+    """)
+
+    cursor.execute("""
+        INSERT INTO transacoes (
+            propriedade_id, tipo_transacao, valor, data_transacao,
+            descricao, categoria, metadata, hash_natural
+        )
+        SELECT
+            propriedade_id, tipo_transacao, valor, data_transacao,
+            descricao, categoria,
+            CASE WHEN documento IS NULL THEN '{}'::jsonb
+                 ELSE jsonb_build_object('documento', documento) END,
+            md5(concat_ws('|', codigo, data_transacao, tipo_transacao, valor,
+                          descricao, documento))::uuid
+        FROM stg_transacoes
+        ON CONFLICT (hash_natural, data_transacao) DO NOTHING
+    """)
+    return cursor.rowcount
+
+
+def record_import(cursor, status, processed, inserted, errors, message, metadata):
+    """Registra o resultado da importação em sincronizacoes."""
+    cursor.execute("""
+        INSERT INTO sincronizacoes (
+            origem, tipo_sincronizacao, status, registros_processados,
+            registros_inseridos, registros_erro, mensagem_erro, metadata, concluido_em
+        ) VALUES ('manual', 'import_transacoes', %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    """, (status, processed, inserted, errors, message, Json(metadata)))
+
+
+def import_transacoes(csv_paths, chunk_rows=CHUNK_ROWS, rejected_path=None, dry_run=False):
+    """Importa um ou mais CSVs de transações."""
+    import pandas as pd
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    processed = inserted = rejected_count = 0
+    started = time.perf_counter()
+    wrote_rejected_header = False
+
+    try:
+        lookup = load_property_lookup(cursor)
+        print(f"🗂️  {len(lookup)} códigos de propriedade carregados")
+        create_staging_table(cursor)
+
+        for csv_path in csv_paths:
+            print(f"📊 Importando transações de {csv_path}")
+            reader = pd.read_csv(csv_path, dtype=str, chunksize=chunk_rows,
+                                 keep_default_na=False, na_values=[''])
+
+            for chunk in reader:
+                valid, rejected = prepare_chunk(chunk, lookup)
+                processed += len(chunk)
+                rejected_count += len(rejected)
+
+                if rejected_path and not rejected.empty:
+                    rejected.to_csv(rejected_path, mode='a', index=False,
+                                    header=not wrote_rejected_header)
+                    wrote_rejected_header = True
+
+                if not dry_run and not valid.empty:
+                    inserted += load_chunk(cursor, valid)
+                    conn.commit()
+
+                elapsed = time.perf_counter() - started
+                print(f"  ✓ {processed:,} linhas lidas, {inserted:,} inseridas, "
+                      f"{rejected_count:,} rejeitadas ({processed / elapsed:,.0f} linhas/s)")
+
+        elapsed = time.perf_counter() - started
+        throughput = processed / elapsed if elapsed else 0
+        duplicates = processed - inserted - rejected_count
+
+        if not dry_run:
+            record_import(cursor, 'concluido', processed, inserted, rejected_count, None, {
+                'arquivos': [str(p) for p in csv_paths],
+                'ja_importadas': duplicates,
+                'duracao_s': round(elapsed, 3),
+                'linhas_por_s': round(throughput),
+            })
+            conn.commit()
+
+            # A nova sincronização invalida o snapshot do portfólio: regrava
+            from portfolio_snapshot import write_snapshot
+
+            write_snapshot(conn)
+
+        print(f"\n✅ Importação {'simulada' if dry_run else 'concluída'}!")
+        print(f"   Lidas: {processed:,}")
+        print(f"   Inseridas: {inserted:,}")
+        print(f"   Já importadas: {duplicates if not dry_run else 0:,}")
+        print(f"   Rejeitadas: {rejected_count:,}"
+              + (f" (ver {rejected_path})" if rejected_path and rejected_count else ""))
+        print(f"   Vazão: {throughput:,.0f} linhas/s em {elapsed:.1f}s")
+
+    except Exception as e:
+        conn.rollback()
+        try:
+            record_import(cursor, 'erro', processed, inserted, rejected_count, str(e),
+                          {'arquivos': [str(p) for p in csv_paths]})
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+        print(f"❌ Erro durante importação: {e}")
+        sys.exit(1)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa transações de CSV para PostgreSQL')
+    parser.add_argument('csv', type=str, nargs='+',
+                       help='Arquivo(s) CSV de transações')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                       help='Linhas por bloco de leitura/COPY')
+    parser.add_argument('--rejeitados', type=str, default=None,
+                       help='CSV onde gravar as linhas rejeitadas com o motivo')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Apenas valida, sem inserir no banco')
+
+    args = parser.parse_args()
+
+    csv_paths = [Path(p) for p in args.csv]
+    missing = [p for p in csv_paths if not p.exists()]
+    if missing:
+        print(f"❌ Arquivo(s) CSV não encontrado(s): {', '.join(map(str, missing))}")
+        sys.exit(1)
+
+    if args.rejeitados:
+        rejected_path = Path(args.rejeitados)
+        rejected_path.parent.mkdir(parents=True, exist_ok=True)
+        if rejected_path.exists():
+            rejected_path.unlink()
+
+    import_transacoes(csv_paths, chunk_rows=args.chunk_rows,
+                      rejected_path=args.rejeitados, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,20 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm"; -- Para busca de texto
 
+-- ============================================
+-- Tabela: schema_migrations
+-- ============================================
+-- Controle de versão do schema (ver scripts/migrations/).
+-- Este arquivo representa o schema completo; as versões que ele já contém
+-- são registradas no final, para que init_database.py não as reaplique.
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    versao VARCHAR(20) PRIMARY KEY,
+    nome VARCHAR(200) NOT NULL,
+    checksum VARCHAR(64),
+    aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duracao_ms INTEGER
+);
+
 -- ============================================
 -- Tabela: propriedades
 -- ============================================
@@ -45,8 +59,11 @@ CREATE TABLE IF NOT EXISTS propriedades (
 -- ============================================
 -- Tabela: transacoes
 -- ============================================
+-- Particionada por faixa anual de data_transacao (partições
+-- transacoes_YYYY, criadas por garantir_particoes_transacoes()).
+-- A partição default recebe datas ainda sem partição.
 CREATE TABLE IF NOT EXISTS transacoes (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     propriedade_id INTEGER NOT NULL REFERENCES propriedades(id) ON DELETE CASCADE,
     tipo_transacao VARCHAR(50) NOT NULL,
     valor DECIMAL(12, 2) NOT NULL,
@@ -55,9 +72,13 @@ CREATE TABLE IF NOT EXISTS transacoes (
     categoria VARCHAR(100),
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    hash_natural UUID, -- md5 da chave natural (import_transacoes.py)
 
+    PRIMARY KEY (id, data_transacao),
     CONSTRAINT chk_tipo_transacao CHECK (tipo_transacao IN ('compra', 'venda', 'aluguel', 'manutencao', 'reforma', 'outro'))
-);
+) PARTITION BY RANGE (data_transacao);
+
+CREATE TABLE IF NOT EXISTS transacoes_default PARTITION OF transacoes DEFAULT;
 
 -- ============================================
 -- Tabela: relatorios_ifrs
@@ -71,6 +92,15 @@ CREATE TABLE IF NOT EXISTS relatorios_ifrs (
     parametros JSONB DEFAULT '{}',
     data_geracao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     status VARCHAR(50) DEFAULT 'pendente',
+    -- Fila de jobs (scripts/job_queue.py)
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL DEFAULT 3,
+    executar_apos TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    worker VARCHAR(100),
+    heartbeat_em TIMESTAMP,
+    iniciado_em TIMESTAMP,
+    concluido_em TIMESTAMP,
+    mensagem_erro TEXT,
 
     CONSTRAINT chk_status CHECK (status IN ('pendente', 'processando', 'concluido', 'erro'))
 );
@@ -91,38 +121,104 @@ CREATE TABLE IF NOT EXISTS sincronizacoes (
     metadata JSONB DEFAULT '{}',
     iniciado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     concluido_em TIMESTAMP,
+    -- Fila de jobs (scripts/job_queue.py)
+    parametros JSONB DEFAULT '{}',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL DEFAULT 3,
+    executar_apos TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    worker VARCHAR(100),
+    heartbeat_em TIMESTAMP,
 
     CONSTRAINT chk_origem CHECK (origem IN ('huggingface', 'obsidian', 'api', 'manual')),
     CONSTRAINT chk_status_sync CHECK (status IN ('pendente', 'processando', 'concluido', 'erro'))
 );
 
+-- ============================================
+-- Tabelas: CDC de propriedades
+-- ============================================
+-- Log de alterações somente de inserção, preenchido por trigger, e a marca
+-- d'água de cada consumidor (ver scripts/cdc.py).
+CREATE TABLE IF NOT EXISTS propriedades_alteracoes (
+    id BIGSERIAL PRIMARY KEY,
+    xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    operacao CHAR(1) NOT NULL,
+    propriedade_id INTEGER NOT NULL,
+    codigo VARCHAR(50) NOT NULL,
+    colunas TEXT[], -- colunas alteradas (somente em 'U')
+    alterado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT chk_operacao_alteracao CHECK (operacao IN ('I', 'U', 'D'))
+);
+
+-- Marca d'água (high-water mark) de cada consumidor do log
+CREATE TABLE IF NOT EXISTS cdc_consumidores (
+    consumidor VARCHAR(100) PRIMARY KEY,
+    ultimo_xid XID8 NOT NULL,
+    ultimo_id BIGINT NOT NULL DEFAULT 0,
+    alteracoes_processadas BIGINT NOT NULL DEFAULT 0,
+    registrado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Tabela: avaliacoes
+-- ============================================
+-- Série histórica somente de inserção: uma linha por avaliação de uma
+-- propriedade em uma data de referência (colunas VALOR_DD_MM_AAAA_R$ do
+-- CSV). Para uma mesma data, a linha de maior id prevalece.
+CREATE TABLE IF NOT EXISTS avaliacoes (
+    id BIGSERIAL PRIMARY KEY,
+    propriedade_id INTEGER NOT NULL REFERENCES propriedades(id) ON DELETE CASCADE,
+    data_referencia DATE NOT NULL,
+    valor DECIMAL(12, 2) NOT NULL,
+    fonte VARCHAR(50) NOT NULL DEFAULT 'importacao',
+    registrado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT chk_avaliacao_valor_positivo CHECK (valor >= 0)
+);
+
 -- ============================================
 -- Índices
 -- ============================================
 
 -- Propriedades
-CREATE INDEX IF NOT EXISTS idx_propriedades_codigo ON propriedades(codigo);
 CREATE INDEX IF NOT EXISTS idx_propriedades_status ON propriedades(status);
 CREATE INDEX IF NOT EXISTS idx_propriedades_cidade ON propriedades(cidade);
 CREATE INDEX IF NOT EXISTS idx_propriedades_tipo ON propriedades(tipo_propriedade);
 CREATE INDEX IF NOT EXISTS idx_propriedades_valor ON propriedades(valor_avaliacao);
-CREATE INDEX IF NOT EXISTS idx_propriedades_metadata ON propriedades USING GIN(metadata);
+CREATE INDEX IF NOT EXISTS idx_propriedades_nome_trgm ON propriedades USING GIN(nome gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_propriedades_endereco_trgm ON propriedades USING GIN(endereco gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_propriedades_codigo_cc_trgm ON propriedades USING GIN(codigo_cc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_propriedades_updated_at ON propriedades(updated_at, id);
 
 -- Transações
 CREATE INDEX IF NOT EXISTS idx_transacoes_propriedade ON transacoes(propriedade_id);
-CREATE INDEX IF NOT EXISTS idx_transacoes_data ON transacoes(data_transacao);
+CREATE INDEX IF NOT EXISTS idx_transacoes_data_criacao ON transacoes(data_transacao, created_at);
 CREATE INDEX IF NOT EXISTS idx_transacoes_tipo ON transacoes(tipo_transacao);
 CREATE INDEX IF NOT EXISTS idx_transacoes_categoria ON transacoes(categoria);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transacoes_hash_natural ON transacoes(hash_natural, data_transacao);
+CREATE INDEX IF NOT EXISTS idx_transacoes_created_at ON transacoes(created_at, id);
 
 -- Relatórios IFRS
 CREATE INDEX IF NOT EXISTS idx_relatorios_periodo ON relatorios_ifrs(periodo);
 CREATE INDEX IF NOT EXISTS idx_relatorios_status ON relatorios_ifrs(status);
 CREATE INDEX IF NOT EXISTS idx_relatorios_tipo ON relatorios_ifrs(tipo_relatorio);
+CREATE INDEX IF NOT EXISTS idx_relatorios_fila ON relatorios_ifrs(executar_apos, id) WHERE status = 'pendente';
+CREATE INDEX IF NOT EXISTS idx_relatorios_heartbeat ON relatorios_ifrs(heartbeat_em) WHERE status = 'processando' AND worker IS NOT NULL;
 
 -- Sincronizações
 CREATE INDEX IF NOT EXISTS idx_sincronizacoes_origem ON sincronizacoes(origem);
 CREATE INDEX IF NOT EXISTS idx_sincronizacoes_status ON sincronizacoes(status);
 CREATE INDEX IF NOT EXISTS idx_sincronizacoes_data ON sincronizacoes(iniciado_em);
+CREATE INDEX IF NOT EXISTS idx_sincronizacoes_fila ON sincronizacoes(executar_apos, id) WHERE status = 'pendente';
+CREATE INDEX IF NOT EXISTS idx_sincronizacoes_heartbeat ON sincronizacoes(heartbeat_em) WHERE status = 'processando' AND worker IS NOT NULL;
+
+-- CDC
+CREATE INDEX IF NOT EXISTS idx_propriedades_alteracoes_xid ON propriedades_alteracoes(xid, id);
+
+-- Avaliações
+CREATE INDEX IF NOT EXISTS idx_avaliacoes_data_brin ON avaliacoes USING BRIN (data_referencia);
+CREATE INDEX IF NOT EXISTS idx_avaliacoes_ultima ON avaliacoes (propriedade_id, data_referencia DESC, id DESC) INCLUDE (valor);
 
 -- ============================================
 -- Funções e Triggers
@@ -137,6 +233,95 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- Função: cria partições anuais cobrindo [p_inicio, p_fim]
+-- Linhas que estejam na partição default dentro de uma nova faixa são
+-- movidas para a partição criada antes do ATTACH.
+CREATE OR REPLACE FUNCTION garantir_particoes_transacoes(
+    p_inicio DATE DEFAULT date_trunc('year', CURRENT_DATE)::date,
+    p_fim DATE DEFAULT (date_trunc('year', CURRENT_DATE) + INTERVAL '1 year')::date
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_ano DATE := date_trunc('year', p_inicio)::date;
+    v_proximo DATE;
+    v_nome TEXT;
+    v_criadas INTEGER := 0;
+BEGIN
+    WHILE v_ano <= p_fim LOOP
+        v_proximo := (v_ano + INTERVAL '1 year')::date;
+        v_nome := 'transacoes_' || to_char(v_ano, 'YYYY');
+
+        IF to_regclass(v_nome) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE transacoes INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                v_nome
+            );
+            IF to_regclass('transacoes_default') IS NOT NULL THEN
+                EXECUTE format(
+                    'WITH movidas AS (
+                         DELETE FROM transacoes_default
+                         WHERE data_transacao >= %L AND data_transacao < %L
+                         RETURNING *
+                     )
+                     INSERT INTO %I SELECT * FROM movidas',
+                    v_ano, v_proximo, v_nome
+                );
+            END IF;
+            EXECUTE format(
+                'ALTER TABLE transacoes ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                v_nome, v_ano, v_proximo
+            );
+            v_criadas := v_criadas + 1;
+        END IF;
+
+        v_ano := v_proximo;
+    END LOOP;
+
+    RETURN v_criadas;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partições do ano corrente e do próximo
+SELECT garantir_particoes_transacoes();
+
+-- Função: busca aproximada de propriedades (pg_trgm)
+-- Ordena pela maior word_similarity entre o termo e nome, endereço ou
+-- codigo_cc; o filtro <% usa os índices GIN de trigramas.
+CREATE OR REPLACE FUNCTION buscar_propriedades(
+    p_termo TEXT,
+    p_limite INTEGER DEFAULT 20,
+    p_limiar REAL DEFAULT 0.4
+)
+RETURNS TABLE (
+    id INTEGER,
+    codigo VARCHAR,
+    codigo_cc VARCHAR,
+    nome VARCHAR,
+    endereco TEXT,
+    cidade VARCHAR,
+    similaridade REAL
+) AS $$
+#variable_conflict use_column
+BEGIN
+    -- Limiar do operador <% apenas para a transação corrente
+    PERFORM set_config('pg_trgm.word_similarity_threshold', p_limiar::text, true);
+
+    RETURN QUERY
+    SELECT p.id, p.codigo, p.codigo_cc, p.nome, p.endereco, p.cidade,
+           GREATEST(
+               word_similarity(p_termo, p.nome),
+               word_similarity(p_termo, COALESCE(p.endereco, '')),
+               word_similarity(p_termo, COALESCE(p.codigo_cc, ''))
+           ) AS similaridade
+    FROM propriedades p
+    WHERE p_termo <% p.nome
+       OR p_termo <% p.endereco
+       OR p_termo <% p.codigo_cc
+    ORDER BY similaridade DESC, p.id
+    LIMIT p_limite;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Trigger para atualizar updated_at em propriedades
 DROP TRIGGER IF EXISTS update_propriedades_updated_at ON propriedades;
 CREATE TRIGGER update_propriedades_updated_at
@@ -144,6 +329,67 @@ CREATE TRIGGER update_propriedades_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- CDC: triggers de instrução gravam as alterações em propriedades_alteracoes
+-- (um INSERT por instrução, via tabelas de transição) e emitem
+-- NOTIFY propriedades_alteracoes. UPDATEs sem mudança real são ignorados.
+CREATE OR REPLACE FUNCTION registrar_alteracoes_propriedades()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_linhas INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo)
+        SELECT 'I', n.id, n.codigo FROM novas n;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- MATERIALIZED: converte cada linha para jsonb uma única vez
+        WITH r AS MATERIALIZED (
+            SELECT n.id, n.codigo,
+                   to_jsonb(n) - 'updated_at' AS depois,
+                   to_jsonb(a) - 'updated_at' AS antes
+            FROM novas n
+            JOIN antigas a ON a.id = n.id
+        )
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo, colunas)
+        SELECT 'U', r.id, r.codigo,
+               ARRAY(SELECT e.key FROM jsonb_each(r.depois) e
+                     WHERE e.value IS DISTINCT FROM r.antes -> e.key
+                     ORDER BY e.key)
+        FROM r
+        WHERE r.depois <> r.antes;
+    ELSE
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo)
+        SELECT 'D', a.id, a.codigo FROM antigas a;
+    END IF;
+
+    GET DIAGNOSTICS v_linhas = ROW_COUNT;
+    IF v_linhas > 0 THEN
+        PERFORM pg_notify('propriedades_alteracoes', v_linhas::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_insert ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_insert
+    AFTER INSERT ON propriedades
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_update ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_update
+    AFTER UPDATE ON propriedades
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_delete ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_delete
+    AFTER DELETE ON propriedades
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
 -- ============================================
 -- Views Úteis
 -- ============================================
@@ -173,6 +419,9 @@ GROUP BY cidade, estado
 ORDER BY quantidade DESC;
 
 -- View: Transações Recentes
+-- O top-100 é escolhido em transacoes antes do JOIN: com o índice
+-- (data_transacao, created_at) cada partição é lida em ordem reversa e o
+-- Merge Append para após 100 linhas, sem ordenar a tabela inteira.
 CREATE OR REPLACE VIEW vw_transacoes_recentes AS
 SELECT
     t.id,
@@ -181,10 +430,27 @@ SELECT
     t.data_transacao,
     p.codigo as propriedade_codigo,
     p.nome as propriedade_nome
-FROM transacoes t
+FROM (
+    SELECT id, tipo_transacao, valor, data_transacao, created_at, propriedade_id
+    FROM transacoes
+    ORDER BY data_transacao DESC, created_at DESC
+    LIMIT 100
+) t
 JOIN propriedades p ON t.propriedade_id = p.id
-ORDER BY t.data_transacao DESC, t.created_at DESC
-LIMIT 100;
+ORDER BY t.data_transacao DESC, t.created_at DESC;
+
+-- View: Avaliação não zero mais recente de cada propriedade (via idx_avaliacoes_ultima);
+-- 0,00 no CSV significa "sem avaliação", como em propriedades.valor_avaliacao
+CREATE OR REPLACE VIEW vw_avaliacao_atual AS
+SELECT DISTINCT ON (propriedade_id)
+    propriedade_id,
+    data_referencia,
+    valor,
+    fonte,
+    registrado_em
+FROM avaliacoes
+WHERE valor > 0
+ORDER BY propriedade_id, data_referencia DESC, id DESC;
 
 -- ============================================
 -- Dados Iniciais (Opcional)
@@ -192,10 +458,35 @@ LIMIT 100;
 
 -- Comentários nas tabelas
 COMMENT ON TABLE propriedades IS 'Cadastro completo das propriedades do portfólio BNI';
-COMMENT ON TABLE transacoes IS 'Registro de todas as transações financeiras relacionadas às propriedades';
+COMMENT ON COLUMN propriedades.metadata IS 'Somente dados sem coluna própria (ex.: ID da planilha de origem)';
+COMMENT ON TABLE transacoes IS 'Registro de todas as transações financeiras relacionadas às propriedades (particionada por ano de data_transacao)';
 COMMENT ON TABLE relatorios_ifrs IS 'Controle de geração e armazenamento de relatórios IFRS';
 COMMENT ON TABLE sincronizacoes IS 'Log de sincronizações com sistemas externos';
 
+COMMENT ON TABLE schema_migrations IS 'Migrações de schema já aplicadas a este banco';
+COMMENT ON TABLE propriedades_alteracoes IS 'Log de alterações (CDC) de propriedades, preenchido por trigger';
+COMMENT ON TABLE cdc_consumidores IS 'Marca d''água de cada consumidor de propriedades_alteracoes';
+COMMENT ON TABLE avaliacoes IS 'Série histórica (somente inserção) das avaliações de cada propriedade';
+COMMENT ON VIEW vw_avaliacao_atual IS 'Avaliação não zero mais recente de cada propriedade (mesma regra de propriedades.valor_avaliacao)';
+
+COMMENT ON FUNCTION buscar_propriedades(TEXT, INTEGER, REAL) IS 'Busca aproximada (pg_trgm) por nome, endereço ou codigo_cc, ordenada por similaridade';
+
+-- ============================================
+-- Versões incluídas neste schema
+-- ============================================
+INSERT INTO schema_migrations (versao, nome) VALUES
+    ('000', 'schema_inicial'),
+    ('001', 'particionar_transacoes'),
+    ('002', 'chave_natural_transacoes'),
+    ('003', 'busca_trigram_propriedades'),
+    ('004', 'indices_exportacao'),
+    ('005', 'cdc_propriedades'),
+    ('006', 'fila_jobs'),
+    ('007', 'avaliacoes'),
+    ('008', 'propriedades_enxuta'),
+    ('009', 'avaliacao_atual_sem_zero')
+ON CONFLICT (versao) DO NOTHING;
+
 -- ============================================
 -- Fim do Schema
 -- ============================================
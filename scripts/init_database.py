@@ -7,6 +7,8 @@ Cria as tabelas e estruturas necessárias para o sistema de gestão imobiliária
 import os
 import sys
 import argparse
+import hashlib
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 import psycopg2
@@ -68,73 +70,209 @@ def create_database_if_not_exists():
         print(f"⚠️  Aviso: Não foi possível criar o banco de dados: {e}")
 
 
-def create_tables(conn):
-    """Cria as tabelas do sistema executando o arquivo init.sql completo."""
-    cursor = conn.cursor()
+SCRIPT_DIR = Path(__file__).parent
+INIT_SQL_PATH = SCRIPT_DIR / 'init.sql'
+MIGRATIONS_DIR = SCRIPT_DIR / 'migrations'
+BASELINE_VERSION = ('000', 'schema_inicial')
+NO_TRANSACTION_MARKER = '-- migration: no-transaction'
+MIGRATION_LOCK_ID = 4_270_001  # chave do advisory lock das migrações
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        versao VARCHAR(20) PRIMARY KEY,
+        nome VARCHAR(200) NOT NULL,
+        checksum VARCHAR(64),
+        aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        duracao_ms INTEGER
+    )
+"""
+
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """Lista as migrações disponíveis como (versao, nome, path), em ordem."""
+    migrations = []
+    for path in sorted(Path(migrations_dir).glob('*.sql')):
+        versao, _, nome = path.stem.partition('_')
+        if not versao.isdigit():
+            print(f"⚠️  Ignorando arquivo fora do padrão NNN_descricao.sql: {path.name}")
+            continue
+        migrations.append((versao, nome, path))
+    return migrations
+
+
+def file_checksum(path):
+    """SHA-256 do conteúdo do arquivo."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def table_exists(cursor, table_name):
+    """Verifica se uma tabela existe no schema atual."""
+    # Só o schema atual: num portfólio em schema (search_path=<schema>,public)
+    # as tabelas de public não contam
+    cursor.execute("SELECT to_regclass(format('%%I.%%I', current_schema(), %s::text))",
+                   (table_name,))
+    return cursor.fetchone()[0] is not None
+
+
+def get_applied_migrations(cursor):
+    """Retorna {versao: checksum} das migrações aplicadas."""
+    cursor.execute("SELECT versao, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def execute_sql_script(conn, sql_content, transactional=True):
+    """
+    Executa um script SQL completo em uma única chamada.
+
+    O psycopg2 envia o texto inteiro pelo protocolo simples, então múltiplos
+    comandos e corpos `$$ ... $$` de funções plpgsql são preservados. Com
+    `transactional=True` o script roda dentro da transação corrente (o
+    chamador faz commit/rollback); caso contrário roda em autocommit.
+    """
+    if not transactional:
+        conn.commit()
+        conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql_content)
+    finally:
+        if not transactional:
+            conn.autocommit = False
+
+
+def apply_migration(conn, versao, nome, path):
+    """Aplica uma migração e registra sua versão na mesma transação."""
+    sql_content = Path(path).read_text(encoding='utf-8')
+    transactional = NO_TRANSACTION_MARKER not in sql_content
+    started = time.perf_counter()
+
+    try:
+        execute_sql_script(conn, sql_content, transactional=transactional)
+        duracao_ms = int((time.perf_counter() - started) * 1000)
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO schema_migrations (versao, nome, checksum, duracao_ms)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (versao) DO UPDATE
+                SET checksum = EXCLUDED.checksum,
+                    duracao_ms = EXCLUDED.duracao_ms,
+                    aplicada_em = CURRENT_TIMESTAMP
+            """, (versao, nome, file_checksum(path), duracao_ms))
+        conn.commit()
+        print(f"   ✅ {versao}_{nome} ({duracao_ms} ms)")
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+
 
-    # Localiza o arquivo init.sql no mesmo diretório deste script
-    script_dir = Path(__file__).parent
-    init_sql_path = script_dir / 'init.sql'
+def apply_migrations(conn, migrations_dir=MIGRATIONS_DIR):
+    """
+    Leva o banco até a versão mais recente do schema.
 
-    if not init_sql_path.exists():
-        print(f"❌ Arquivo init.sql não encontrado em: {init_sql_path}")
+    - Banco vazio: executa `init.sql` inteiro em uma transação; o próprio
+      arquivo registra as versões que já contém.
+    - Banco antigo sem `schema_migrations`: cria a tabela, registra a versão
+      base e aplica todas as migrações.
+    - Demais casos: aplica somente as migrações pendentes, cada uma em sua
+      própria transação.
+
+    Um advisory lock impede que dois processos migrem o banco ao mesmo tempo.
+    """
+    if not INIT_SQL_PATH.exists():
+        print(f"❌ Arquivo init.sql não encontrado em: {INIT_SQL_PATH}")
         print("   Certifique-se de que o arquivo existe no diretório scripts/")
         sys.exit(1)
 
+    cursor = conn.cursor()
     try:
-        # Lê e executa o arquivo init.sql completo
-        print(f"📄 Executando schema completo de: {init_sql_path}")
-        with open(init_sql_path, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
-
-        # psycopg2.execute() executa apenas um comando por vez
-        # Usa uma abordagem simples mas eficaz: divide por ';' e filtra comandos vazios
-        # Remove comentários de linha completa primeiro
-        lines = []
-        for line in sql_content.split('\n'):
-            stripped = line.strip()
-            if stripped and not stripped.startswith('--'):
-                lines.append(line)
-
-        sql_clean = '\n'.join(lines)
-
-        # Divide por ponto-e-vírgula e executa cada comando
-        commands = [cmd.strip() for cmd in sql_clean.split(';') if cmd.strip()]
-
-        executed = 0
-        for i, command in enumerate(commands, 1):
-            if command:
-                try:
-                    cursor.execute(command)
-                    executed += 1
-                except psycopg2.Error as e:
-                    # Alguns comandos podem falhar se já existirem (CREATE IF NOT EXISTS)
-                    # Ignora erros de "already exists" mas reporta outros
-                    error_msg = str(e).lower()
-                    if 'already exists' in error_msg or 'duplicate' in error_msg:
-                        # Comando já executado antes, pode ignorar
-                        pass
-                    else:
-                        print(f"⚠️  Aviso no comando {i}: {e}")
-                        # Para comandos críticos, ainda tenta continuar
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+
+        if not table_exists(cursor, 'schema_migrations'):
+            if not table_exists(cursor, 'propriedades'):
+                print(f"📄 Banco vazio, aplicando schema completo de: {INIT_SQL_PATH}")
+                started = time.perf_counter()
+                execute_sql_script(conn, INIT_SQL_PATH.read_text(encoding='utf-8'))
+                conn.commit()
+                print(f"   ✅ init.sql aplicado em "
+                      f"{int((time.perf_counter() - started) * 1000)} ms")
+            else:
+                print("ℹ️  Banco sem controle de versão, registrando versão base")
+                cursor.execute(SCHEMA_MIGRATIONS_DDL)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (versao, nome) VALUES (%s, %s)",
+                    BASELINE_VERSION
+                )
+                conn.commit()
+
+        applied = get_applied_migrations(cursor)
+        pending = [m for m in list_migrations(migrations_dir) if m[0] not in applied]
+
+        for versao, nome, path in list_migrations(migrations_dir):
+            checksum = applied.get(versao)
+            if checksum and checksum != file_checksum(path):
+                print(f"⚠️  Migração {versao}_{nome} foi alterada após ser aplicada")
+
+        if not pending:
+            print("✅ Schema atualizado, nenhuma migração pendente")
+            return 0
+
+        print(f"📦 Aplicando {len(pending)} migração(ões) pendente(s)...")
+        for versao, nome, path in pending:
+            apply_migration(conn, versao, nome, path)
+
+        print("✅ Migrações aplicadas com sucesso!")
+        return len(pending)
 
-        conn.commit()
-        cursor.close()
-        print(f"✅ Schema completo aplicado com sucesso!")
-        print(f"   ✅ {executed} comandos executados")
-        print("   ✅ Tabelas criadas (incluindo todas as colunas necessárias)")
-        print("   ✅ Índices criados")
-        print("   ✅ Views criadas")
-        print("   ✅ Triggers criados")
-
-    except Exception as e:
+    except psycopg2.Error as e:
         conn.rollback()
-        cursor.close()
-        print(f"❌ Erro ao executar init.sql: {e}")
-        print(f"   Arquivo: {init_sql_path}")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ Erro ao aplicar schema: {e}")
         sys.exit(1)
+    finally:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        cursor.close()
+
+
+def ensure_transacoes_partitions(conn, years_ahead=1):
+    """Garante partições anuais de transacoes do ano corrente até `years_ahead` anos à frente."""
+    with conn.cursor() as cursor:
+        if not table_exists(cursor, 'transacoes_default'):
+            return 0
+        cursor.execute("""
+            SELECT garantir_particoes_transacoes(
+                date_trunc('year', CURRENT_DATE)::date,
+                (date_trunc('year', CURRENT_DATE) + make_interval(years => %s))::date
+            )
+        """, (years_ahead,))
+        created = cursor.fetchone()[0]
+    conn.commit()
+    if created:
+        print(f"📅 {created} partição(ões) futura(s) de transacoes criada(s)")
+    return created
+
+
+def show_migration_status(conn, migrations_dir=MIGRATIONS_DIR):
+    """Lista migrações aplicadas e pendentes."""
+    with conn.cursor() as cursor:
+        if not table_exists(cursor, 'schema_migrations'):
+            print("ℹ️  Banco sem controle de versão (schema_migrations não existe)")
+            return
+        cursor.execute("""
+            SELECT versao, nome, aplicada_em, duracao_ms
+            FROM schema_migrations ORDER BY versao
+        """)
+        applied = cursor.fetchall()
+
+    applied_versions = {row[0] for row in applied}
+    print("📋 Migrações aplicadas:")
+    for versao, nome, aplicada_em, duracao_ms in applied:
+        duracao = f", {duracao_ms} ms" if duracao_ms is not None else ""
+        print(f"   ✓ {versao}_{nome} ({aplicada_em:%Y-%m-%d %H:%M}{duracao})")
+
+    pending = [m for m in list_migrations(migrations_dir) if m[0] not in applied_versions]
+    print(f"📋 Pendentes: {len(pending)}")
+    for versao, nome, _ in pending:
+        print(f"   • {versao}_{nome}")
 
 
 def validate_connection(conn):
@@ -156,13 +294,18 @@ def main():
         action="store_true",
         help="Apenas valida a conexão sem criar tabelas",
     )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Lista as migrações aplicadas e pendentes",
+    )
     args = parser.parse_args()
 
     print("🚀 Inicializando banco de dados PostgreSQL...")
     print("-" * 50)
 
     # Tenta criar o banco se não existir
-    if not args.validate_only:
+    if not args.validate_only and not args.status:
         create_database_if_not_exists()
 
     # Conecta ao banco
@@ -176,8 +319,14 @@ def main():
         conn.close()
         return
 
-    # Cria tabelas
-    create_tables(conn)
+    if args.status:
+        show_migration_status(conn)
+        conn.close()
+        return
+
+    # Aplica schema e migrações pendentes
+    apply_migrations(conn)
+    ensure_transacoes_partitions(conn)
 
     conn.close()
     print("-" * 50)
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Fila de jobs no PostgreSQL sobre relatorios_ifrs e sincronizacoes.
+Relatórios IFRS, sincronizações com Hugging Face e exportações para Obsidian
+são enfileirados como linhas 'pendente' e executados por workers
+concorrentes, que reservam jobs com SELECT ... FOR UPDATE SKIP LOCKED,
+enviam heartbeats e reagendam falhas com backoff exponencial.
+"""
+
+import os
+import sys
+import argparse
+import hashlib
+import multiprocessing
+import select
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from dotenv import load_dotenv
+import psycopg2
+from psycopg2.extras import Json, RealDictCursor
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCRIPTS_DIR = Path(__file__).parent
+QUEUE_CHANNEL = 'fila_jobs'
+HEARTBEAT_INTERVAL = 10        # segundos entre heartbeats de um job em execução
+STALE_AFTER = 60               # sem heartbeat por mais que isso: worker morreu
+POLL_INTERVAL = 5              # espera máxima por NOTIFY antes de consultar a fila
+RETRY_BASE_SECONDS = 30        # backoff: 30s, 60s, 120s...
+JOB_TIMEOUT = 3600
+OUTPUT_TAIL = 2000             # caracteres da saída guardados em mensagem_erro
+
+# Tabelas usadas como fila. Os jobs de cada uma são reservados em ordem de
+# executar_apos; workers alternam a tabela inicial para não privilegiar uma.
+QUEUE_TABLES = ('relatorios_ifrs', 'sincronizacoes')
+
+# Script executado para cada origem de sincronização
+SYNC_SCRIPTS = {
+    'huggingface': 'sync_huggingface.py',
+    'obsidian': 'export_to_obsidian.py',
+}
+
+CLAIM_SQL = """
+    WITH job AS (
+        SELECT id
+        FROM {table}
+        WHERE status = 'pendente' AND executar_apos <= CURRENT_TIMESTAMP
+        ORDER BY executar_apos, id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE {table} t
+    SET status = 'processando',
+        tentativas = t.tentativas + 1,
+        worker = %(worker)s,
+        heartbeat_em = CURRENT_TIMESTAMP,
+        iniciado_em = CURRENT_TIMESTAMP
+    FROM job
+    WHERE t.id = job.id
+    RETURNING t.*
+"""
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+# ============================================
+# Enfileiramento
+# ============================================
+
+def enqueue_report(conn, periodo, formato='pdf', data_dir=None, output_dir=None,
+                   max_tentativas=3):
+    """Enfileira um relatório IFRS (um job por formato). Retorna o id."""
+    parametros = {'format': formato}
+    if data_dir:
+        parametros['data_dir'] = data_dir
+    if output_dir:
+        parametros['output_dir'] = output_dir
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO relatorios_ifrs
+                (periodo, tipo_relatorio, parametros, status, max_tentativas)
+            VALUES (%s, 'ifrs', %s, 'pendente', %s)
+            RETURNING id
+        """, (periodo, Json(parametros), max_tentativas))
+        job_id = cursor.fetchone()[0]
+        cursor.execute("SELECT pg_notify(%s, %s)", (QUEUE_CHANNEL, f"relatorios_ifrs:{job_id}"))
+    conn.commit()
+    return job_id
+
+
+def enqueue_sync(conn, origem, tipo, args=None, parametros=None, max_tentativas=3):
+    """
+    Enfileira uma sincronização. `args` são os argumentos de linha de
+    comando do script da origem (SYNC_SCRIPTS). Retorna o id.
+    """
+    parametros = dict(parametros or {})
+    if args is not None:
+        parametros['args'] = list(args)
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO sincronizacoes
+                (origem, tipo_sincronizacao, status, parametros, max_tentativas)
+            VALUES (%s, %s, 'pendente', %s, %s)
+            RETURNING id
+        """, (origem, tipo, Json(parametros), max_tentativas))
+        job_id = cursor.fetchone()[0]
+        cursor.execute("SELECT pg_notify(%s, %s)", (QUEUE_CHANNEL, f"sincronizacoes:{job_id}"))
+    conn.commit()
+    return job_id
+
+
+# ============================================
+# Reserva e conclusão
+# ============================================
+
+def claim_job(conn, worker, start=0):
+    """Reserva o próximo job pronto. Retorna (tabela, job) ou (None, None)."""
+    for i in range(len(QUEUE_TABLES)):
+        table = QUEUE_TABLES[(start + i) % len(QUEUE_TABLES)]
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(CLAIM_SQL.format(table=table), {'worker': worker})
+            job = cursor.fetchone()
+        conn.commit()
+        if job:
+            return table, job
+    return None, None
+
+
+def finish_job(conn, table, job, success, message=None, result=None):
+    """
+    Conclui o job ou, em caso de falha, reagenda com backoff exponencial até
+    max_tentativas (depois disso fica 'erro').
+    """
+    with conn.cursor() as cursor:
+        if success:
+            extra = ''
+            params = {'id': job['id'], 'message': message}
+            if table == 'relatorios_ifrs' and result:
+                extra = (", arquivo_path = %(path)s, arquivo_hash = %(hash)s,"
+                         " data_geracao = CURRENT_TIMESTAMP")
+                params.update(path=result.get('arquivo_path'), hash=result.get('arquivo_hash'))
+            cursor.execute(f"""
+                UPDATE {table}
+                SET status = 'concluido', heartbeat_em = NULL, mensagem_erro = NULL,
+                    concluido_em = COALESCE(concluido_em, CURRENT_TIMESTAMP){extra}
+                WHERE id = %(id)s
+            """, params)
+        elif job['tentativas'] < job['max_tentativas']:
+            delay = RETRY_BASE_SECONDS * 2 ** (job['tentativas'] - 1)
+            cursor.execute(f"""
+                UPDATE {table}
+                SET status = 'pendente', worker = NULL, heartbeat_em = NULL,
+                    mensagem_erro = %s, concluido_em = NULL,
+                    executar_apos = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                WHERE id = %s
+            """, (message, delay, job['id']))
+        else:
+            cursor.execute(f"""
+                UPDATE {table}
+                SET status = 'erro', heartbeat_em = NULL, mensagem_erro = %s,
+                    concluido_em = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (message, job['id']))
+    conn.commit()
+
+
+def requeue_stale_jobs(conn, stale_after=STALE_AFTER):
+    """
+    Devolve à fila jobs cujo worker parou de enviar heartbeat (ou marca
+    'erro' se já esgotaram as tentativas). Retorna quantos foram tratados.
+    """
+    total = 0
+    with conn.cursor() as cursor:
+        for table in QUEUE_TABLES:
+            cursor.execute(f"""
+                UPDATE {table}
+                SET status = CASE WHEN tentativas < max_tentativas THEN 'pendente' ELSE 'erro' END,
+                    mensagem_erro = 'Worker ' || worker || ' parou de responder',
+                    worker = CASE WHEN tentativas < max_tentativas THEN NULL ELSE worker END,
+                    heartbeat_em = NULL
+                WHERE status = 'processando'
+                  AND worker IS NOT NULL
+                  AND heartbeat_em < CURRENT_TIMESTAMP - make_interval(secs => %s)
+            """, (stale_after,))
+            total += cursor.rowcount
+    conn.commit()
+    return total
+
+
+def has_open_jobs(conn):
+    """Existe algum job pendente (inclusive reagendado) ou em execução?"""
+    with conn.cursor() as cursor:
+        cursor.execute(" UNION ALL ".join(
+            f"(SELECT 1 FROM {table} WHERE status = 'pendente' "
+            f"OR (status = 'processando' AND worker IS NOT NULL) LIMIT 1)"
+            for table in QUEUE_TABLES
+        ))
+        found = cursor.fetchone() is not None
+    conn.commit()
+    return found
+
+
+class Heartbeat(threading.Thread):
+    """Atualiza heartbeat_em do job, numa conexão própria, até ser parado."""
+
+    def __init__(self, table, job_id, interval=HEARTBEAT_INTERVAL):
+        super().__init__(daemon=True)
+        self.table = table
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        conn = get_db_connection()
+        conn.autocommit = True
+        try:
+            while not self.stopped.wait(self.interval):
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"UPDATE {self.table} SET heartbeat_em = CURRENT_TIMESTAMP "
+                        f"WHERE id = %s AND status = 'processando'",
+                        (self.job_id,)
+                    )
+        finally:
+            conn.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+# ============================================
+# Execução
+# ============================================
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_command(command, timeout, env=None):
+    """Executa o script; retorna (sucesso, final da saída)."""
+    try:
+        completed = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, timeout=timeout, env=env
+        )
+        output = completed.stdout or ''
+        return completed.returncode == 0, output[-OUTPUT_TAIL:]
+    except subprocess.TimeoutExpired:
+        return False, f"Tempo limite excedido ({timeout}s)"
+
+
+def execute_report_job(job):
+    """Gera o relatório IFRS do job num diretório próprio e calcula o hash."""
+    parametros = job['parametros'] or {}
+    base_dir = Path(parametros.get('output_dir')
+                    or os.getenv('IFRS_REPORTS_PATH', './reports/ifrs'))
+    output_dir = base_dir / job['periodo'] / f"job_{job['id']}"
+    command = [
+        sys.executable, str(SCRIPTS_DIR / 'generate_ifrs_reports.py'),
+        '--periodo', job['periodo'],
+        '--format', parametros.get('format', 'pdf'),
+        '--output-dir', str(output_dir),
+    ]
+    if parametros.get('data_dir'):
+        command += ['--data-dir', parametros['data_dir']]
+
+    success, output = run_command(command, parametros.get('timeout', JOB_TIMEOUT))
+    result = None
+    if success:
+        files = sorted(p for p in output_dir.glob('*') if p.is_file())
+        if not files:
+            return False, 'Nenhum arquivo gerado', None
+        result = {'arquivo_path': str(files[0]), 'arquivo_hash': file_sha256(files[0])}
+    return success, output, result
+
+
+def execute_sync_job(job):
+    """
+    Executa a sincronização do job. BNI_SYNC_ID faz os scripts que registram
+    sincronizações atualizarem esta mesma linha em vez de criar outra.
+    """
+    parametros = job['parametros'] or {}
+
+    if job['tipo_sincronizacao'] == 'benchmark':
+        # Job sintético para medir a fila (scripts/benchmark_job_queue.py)
+        time.sleep(float(parametros.get('segundos', 0)))
+        return True, None, None
+
+    script = SYNC_SCRIPTS.get(job['origem'])
+    if script is None:
+        return False, f"Origem sem executor: {job['origem']}", None
+
+    command = [sys.executable, str(SCRIPTS_DIR / script), *parametros.get('args', [])]
+    env = dict(os.environ, BNI_SYNC_ID=str(job['id']))
+    success, output = run_command(command, parametros.get('timeout', JOB_TIMEOUT), env)
+    return success, output, None
+
+
+def execute_job(conn, table, job):
+    """Executa um job reservado, com heartbeat, e registra o resultado."""
+    heartbeat = Heartbeat(table, job['id'])
+    heartbeat.start()
+    try:
+        if table == 'relatorios_ifrs':
+            success, output, result = execute_report_job(job)
+        else:
+            success, output, result = execute_sync_job(job)
+    except Exception as e:
+        success, output, result = False, f"{type(e).__name__}: {e}", None
+    finally:
+        heartbeat.stop()
+
+    finish_job(conn, table, job, success, None if success else output, result)
+    return success
+
+
+def wait_for_jobs(listener, timeout):
+    """Aguarda um NOTIFY de novo job (ou o timeout)."""
+    if select.select([listener], [], [], timeout) != ([], [], []):
+        listener.poll()
+        listener.notifies.clear()
+
+
+def run_worker(index=0, until_empty=False, poll_interval=POLL_INTERVAL,
+               stale_after=STALE_AFTER, quiet=False):
+    """Laço de um worker: reserva, executa e conclui jobs até ser interrompido."""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    conn = get_db_connection()
+    listener = get_db_connection()
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute(f"LISTEN {QUEUE_CHANNEL}")
+
+    processed = failed = 0
+    next_reap = 0
+    start = index
+    try:
+        while True:
+            if time.monotonic() >= next_reap:
+                recovered = requeue_stale_jobs(conn, stale_after)
+                if recovered and not quiet:
+                    print(f"♻️  [{worker}] {recovered} job(s) sem heartbeat devolvido(s) à fila")
+                next_reap = time.monotonic() + stale_after / 2
+
+            table, job = claim_job(conn, worker, start)
+            start += 1
+            if job is None:
+                if until_empty and not has_open_jobs(conn):
+                    break
+                wait_for_jobs(listener, poll_interval)
+                continue
+
+            started = time.perf_counter()
+            success = execute_job(conn, table, job)
+            processed += 1
+            failed += not success
+            if not quiet:
+                status = '✅' if success else '❌'
+                print(f"{status} [{worker}] {table}#{job['id']} "
+                      f"(tentativa {job['tentativas']}/{job['max_tentativas']}, "
+                      f"{time.perf_counter() - started:.1f}s)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+        listener.close()
+
+    return processed, failed
+
+
+def run_workers(workers, until_empty=False, poll_interval=POLL_INTERVAL, quiet=False):
+    """Inicia `workers` processos e aguarda todos terminarem."""
+    if workers == 1:
+        run_worker(0, until_empty, poll_interval, quiet=quiet)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(i, until_empty, poll_interval),
+                                kwargs={'quiet': quiet})
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+def show_status(conn):
+    """Resumo da fila por tabela e status."""
+    with conn.cursor() as cursor:
+        cursor.execute(" UNION ALL ".join(
+            f"SELECT '{table}', status, count(*), max(tentativas) FROM {table} "
+            f"WHERE worker IS NOT NULL OR status = 'pendente' GROUP BY status"
+            for table in QUEUE_TABLES
+        ))
+        rows = cursor.fetchall()
+        cursor.execute("""
+            SELECT 'sincronizacoes', id, origem || '/' || tipo_sincronizacao, mensagem_erro
+            FROM sincronizacoes WHERE status = 'erro' AND worker IS NOT NULL
+            UNION ALL
+            SELECT 'relatorios_ifrs', id, periodo || '/' || (parametros->>'format'), mensagem_erro
+            FROM relatorios_ifrs WHERE status = 'erro' AND worker IS NOT NULL
+            ORDER BY 2 DESC LIMIT 5
+        """)
+        errors = cursor.fetchall()
+    conn.rollback()
+
+    if not rows:
+        print("📭 Fila vazia")
+        return
+    print(f"{'tabela':<18} {'status':<12} {'jobs':>6} {'máx. tentativas':>16}")
+    for table, status, count, attempts in rows:
+        print(f"{table:<18} {status:<12} {count:>6} {attempts:>16}")
+    for table, job_id, kind, message in errors:
+        last_line = (message or '').strip().splitlines()[-1:] or ['']
+        print(f"❌ {table}#{job_id} {kind}: {last_line[0][:100]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fila de jobs (relatórios e sincronizações)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    enqueue = subparsers.add_parser('enfileirar', help='Enfileira um job')
+    enqueue_kinds = enqueue.add_subparsers(dest='tipo', required=True)
+
+    report = enqueue_kinds.add_parser('relatorio', help='Relatório IFRS')
+    report.add_argument('--periodo', type=str, default=datetime.now().strftime('%Y-%m'),
+                        help='Período do relatório (YYYY-MM)')
+    report.add_argument('--format', choices=['pdf', 'xlsx', 'both'],
+                        default=os.getenv('IFRS_REPORTS_FORMAT', 'pdf'),
+                        help='Formato (both = um job por formato)')
+    report.add_argument('--data-dir', type=str, default=None,
+                        help='Diretório com dados processados')
+    report.add_argument('--output-dir', type=str, default=None,
+                        help='Diretório base dos relatórios')
+
+    sync_hf = enqueue_kinds.add_parser('sync-hf', help='Sincronização com Hugging Face')
+    sync_hf.add_argument('args', nargs=argparse.REMAINDER,
+                         help='Argumentos de sync_huggingface.py (após --)')
+
+    obsidian = enqueue_kinds.add_parser('obsidian', help='Exportação para Obsidian')
+    obsidian.add_argument('args', nargs=argparse.REMAINDER,
+                          help='Argumentos de export_to_obsidian.py (após --)')
+
+    for kind in (report, sync_hf, obsidian):
+        kind.add_argument('--max-tentativas', type=int, default=3,
+                          help='Tentativas antes de marcar o job como erro')
+
+    worker = subparsers.add_parser('worker', help='Executa jobs da fila')
+    worker.add_argument('--workers', type=int, default=int(os.getenv('JOB_WORKERS', '2')),
+                        help='Processos worker concorrentes')
+    worker.add_argument('--ate-esvaziar', action='store_true',
+                        help='Encerra quando não houver jobs pendentes nem em execução')
+    worker.add_argument('--poll', type=float, default=POLL_INTERVAL,
+                        help='Segundos máximos de espera por novos jobs')
+
+    subparsers.add_parser('status', help='Resumo da fila')
+
+    args = parser.parse_args()
+
+    if args.comando == 'worker':
+        print(f"👷 Iniciando {args.workers} worker(s)"
+              + (" até esvaziar a fila" if args.ate_esvaziar else ""))
+        run_workers(args.workers, args.ate_esvaziar, args.poll)
+        return
+
+    conn = get_db_connection()
+    try:
+        if args.comando == 'status':
+            show_status(conn)
+        elif args.tipo == 'relatorio':
+            formats = ['pdf', 'xlsx'] if args.format == 'both' else [args.format]
+            for fmt in formats:
+                job_id = enqueue_report(conn, args.periodo, fmt, args.data_dir,
+                                        args.output_dir, args.max_tentativas)
+                print(f"📥 Relatório IFRS {args.periodo} ({fmt}) enfileirado: "
+                      f"relatorios_ifrs#{job_id}")
+        else:
+            extra = [a for a in args.args if a != '--']
+            origem = 'huggingface' if args.tipo == 'sync-hf' else 'obsidian'
+            tipo = 'pull' if '--pull' in extra else 'push' if '--push' in extra else 'export'
+            job_id = enqueue_sync(conn, origem, tipo, extra, max_tentativas=args.max_tentativas)
+            print(f"📥 {origem}/{tipo} enfileirado: sincronizacoes#{job_id}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
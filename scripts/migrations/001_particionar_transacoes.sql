@@ -0,0 +1,135 @@
+-- ============================================
+-- 001: Particionamento de transacoes por data_transacao
+-- ============================================
+-- Converte transacoes em tabela particionada por faixa anual de
+-- data_transacao. Dados existentes são copiados para as partições e a
+-- sequência de ids é preservada. View vw_transacoes_recentes reescrita
+-- para ordenar/limitar antes do JOIN (Merge Append sobre as partições).
+
+-- Função: cria partições anuais cobrindo [p_inicio, p_fim]
+-- Linhas que estejam na partição default dentro de uma nova faixa são
+-- movidas para a partição criada antes do ATTACH.
+CREATE OR REPLACE FUNCTION garantir_particoes_transacoes(
+    p_inicio DATE DEFAULT date_trunc('year', CURRENT_DATE)::date,
+    p_fim DATE DEFAULT (date_trunc('year', CURRENT_DATE) + INTERVAL '1 year')::date
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_ano DATE := date_trunc('year', p_inicio)::date;
+    v_proximo DATE;
+    v_nome TEXT;
+    v_criadas INTEGER := 0;
+BEGIN
+    WHILE v_ano <= p_fim LOOP
+        v_proximo := (v_ano + INTERVAL '1 year')::date;
+        v_nome := 'transacoes_' || to_char(v_ano, 'YYYY');
+
+        IF to_regclass(v_nome) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE transacoes INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                v_nome
+            );
+            IF to_regclass('transacoes_default') IS NOT NULL THEN
+                EXECUTE format(
+                    'WITH movidas AS (
+                         DELETE FROM transacoes_default
+                         WHERE data_transacao >= %L AND data_transacao < %L
+                         RETURNING *
+                     )
+                     INSERT INTO %I SELECT * FROM movidas',
+                    v_ano, v_proximo, v_nome
+                );
+            END IF;
+            EXECUTE format(
+                'ALTER TABLE transacoes ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                v_nome, v_ano, v_proximo
+            );
+            v_criadas := v_criadas + 1;
+        END IF;
+
+        v_ano := v_proximo;
+    END LOOP;
+
+    RETURN v_criadas;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    v_inicio DATE;
+    v_fim DATE;
+BEGIN
+    -- Idempotente: nada a fazer se transacoes já for particionada
+    IF (SELECT relkind FROM pg_class WHERE oid = 'transacoes'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    DROP VIEW IF EXISTS vw_transacoes_recentes;
+
+    ALTER TABLE transacoes RENAME TO transacoes_legado;
+    ALTER TABLE transacoes_legado RENAME CONSTRAINT transacoes_pkey TO transacoes_legado_pkey;
+    DROP INDEX IF EXISTS idx_transacoes_propriedade;
+    DROP INDEX IF EXISTS idx_transacoes_data;
+    DROP INDEX IF EXISTS idx_transacoes_tipo;
+    DROP INDEX IF EXISTS idx_transacoes_categoria;
+    ALTER SEQUENCE transacoes_id_seq OWNED BY NONE;
+
+    CREATE TABLE transacoes (
+        id INTEGER NOT NULL DEFAULT nextval('transacoes_id_seq'),
+        propriedade_id INTEGER NOT NULL REFERENCES propriedades(id) ON DELETE CASCADE,
+        tipo_transacao VARCHAR(50) NOT NULL,
+        valor DECIMAL(12, 2) NOT NULL,
+        data_transacao DATE NOT NULL,
+        descricao TEXT,
+        categoria VARCHAR(100),
+        metadata JSONB DEFAULT '{}',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        PRIMARY KEY (id, data_transacao),
+        CONSTRAINT chk_tipo_transacao CHECK (tipo_transacao IN ('compra', 'venda', 'aluguel', 'manutencao', 'reforma', 'outro'))
+    ) PARTITION BY RANGE (data_transacao);
+
+    CREATE TABLE transacoes_default PARTITION OF transacoes DEFAULT;
+
+    CREATE INDEX idx_transacoes_propriedade ON transacoes(propriedade_id);
+    CREATE INDEX idx_transacoes_data_criacao ON transacoes(data_transacao, created_at);
+    CREATE INDEX idx_transacoes_tipo ON transacoes(tipo_transacao);
+    CREATE INDEX idx_transacoes_categoria ON transacoes(categoria);
+
+    -- Partições para todo o histórico existente e o próximo ano
+    SELECT LEAST(MIN(data_transacao), CURRENT_DATE), GREATEST(MAX(data_transacao), CURRENT_DATE)
+    INTO v_inicio, v_fim
+    FROM transacoes_legado;
+    PERFORM garantir_particoes_transacoes(
+        v_inicio, (date_trunc('year', v_fim) + INTERVAL '1 year')::date
+    );
+
+    INSERT INTO transacoes SELECT * FROM transacoes_legado;
+
+    DROP TABLE transacoes_legado;
+    ALTER SEQUENCE transacoes_id_seq OWNED BY transacoes.id;
+
+    COMMENT ON TABLE transacoes IS 'Registro de todas as transações financeiras relacionadas às propriedades (particionada por ano de data_transacao)';
+END;
+$$;
+
+-- View: Transações Recentes
+-- O top-100 é escolhido em transacoes antes do JOIN: com o índice
+-- (data_transacao, created_at) cada partição é lida em ordem reversa e o
+-- Merge Append para após 100 linhas, sem ordenar a tabela inteira.
+CREATE OR REPLACE VIEW vw_transacoes_recentes AS
+SELECT
+    t.id,
+    t.tipo_transacao,
+    t.valor,
+    t.data_transacao,
+    p.codigo as propriedade_codigo,
+    p.nome as propriedade_nome
+FROM (
+    SELECT id, tipo_transacao, valor, data_transacao, created_at, propriedade_id
+    FROM transacoes
+    ORDER BY data_transacao DESC, created_at DESC
+    LIMIT 100
+) t
+JOIN propriedades p ON t.propriedade_id = p.id
+ORDER BY t.data_transacao DESC, t.created_at DESC;
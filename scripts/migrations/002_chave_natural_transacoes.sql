@@ -0,0 +1,12 @@
+-- ============================================
+-- 002: Chave natural para importação idempotente de transacoes
+-- ============================================
+-- hash_natural = md5 dos campos que identificam a transação na origem
+-- (propriedade, data, tipo, valor, descrição e documento). O índice único
+-- inclui data_transacao, exigência de índices únicos em tabelas
+-- particionadas. Transações inseridas manualmente (hash NULL) não conflitam.
+
+ALTER TABLE transacoes ADD COLUMN IF NOT EXISTS hash_natural UUID;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transacoes_hash_natural
+    ON transacoes(hash_natural, data_transacao);
@@ -0,0 +1,54 @@
+-- ============================================
+-- 003: Busca aproximada de propriedades (pg_trgm)
+-- ============================================
+-- Índices GIN de trigramas em nome, endereço e codigo_cc e a função
+-- buscar_propriedades(), que ordena pela maior word_similarity entre o
+-- termo e cada campo. O filtro usa o operador <% (indexável pelos GIN),
+-- então a busca não percorre a tabela inteira.
+
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+CREATE INDEX IF NOT EXISTS idx_propriedades_nome_trgm
+    ON propriedades USING GIN (nome gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_propriedades_endereco_trgm
+    ON propriedades USING GIN (endereco gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_propriedades_codigo_cc_trgm
+    ON propriedades USING GIN (codigo_cc gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION buscar_propriedades(
+    p_termo TEXT,
+    p_limite INTEGER DEFAULT 20,
+    p_limiar REAL DEFAULT 0.4
+)
+RETURNS TABLE (
+    id INTEGER,
+    codigo VARCHAR,
+    codigo_cc VARCHAR,
+    nome VARCHAR,
+    endereco TEXT,
+    cidade VARCHAR,
+    similaridade REAL
+) AS $$
+#variable_conflict use_column
+BEGIN
+    -- Limiar do operador <% apenas para a transação corrente
+    PERFORM set_config('pg_trgm.word_similarity_threshold', p_limiar::text, true);
+
+    RETURN QUERY
+    SELECT p.id, p.codigo, p.codigo_cc, p.nome, p.endereco, p.cidade,
+           GREATEST(
+               word_similarity(p_termo, p.nome),
+               word_similarity(p_termo, COALESCE(p.endereco, '')),
+               word_similarity(p_termo, COALESCE(p.codigo_cc, ''))
+           ) AS similaridade
+    FROM propriedades p
+    WHERE p_termo <% p.nome
+       OR p_termo <% p.endereco
+       OR p_termo <% p.codigo_cc
+    ORDER BY similaridade DESC, p.id
+    LIMIT p_limite;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION buscar_propriedades(TEXT, INTEGER, REAL) IS
+    'Busca aproximada (pg_trgm) por nome, endereço ou codigo_cc, ordenada por similaridade';
@@ -0,0 +1,13 @@
+-- ============================================
+-- 004: Índices para exportação incremental (keyset)
+-- ============================================
+-- export_dados.py pagina por (updated_at, id) em propriedades e por
+-- (created_at, id) em transacoes (que não tem updated_at). Com estes
+-- índices cada página é uma varredura de índice a partir da última
+-- chave lida, sem OFFSET nem ordenação da tabela.
+
+CREATE INDEX IF NOT EXISTS idx_propriedades_updated_at
+    ON propriedades(updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_transacoes_created_at
+    ON transacoes(created_at, id);
@@ -0,0 +1,98 @@
+-- ============================================
+-- 005: Change data capture (CDC) de propriedades
+-- ============================================
+-- propriedades_alteracoes é um log somente de inserção, preenchido por
+-- triggers de instrução (tabelas de transição), então um merge de milhares
+-- de linhas gera um único INSERT no log. UPDATEs que não mudam nenhuma
+-- coluna além de updated_at não são registrados.
+--
+-- Cada linha guarda o xid da transação que a gerou. Consumidores leem em
+-- ordem (xid, id) e só até o xmin do snapshot corrente: assim uma transação
+-- ainda aberta nunca "fura" a marca d'água de quem já leu (ver scripts/cdc.py).
+-- Cada alteração registrada emite NOTIFY propriedades_alteracoes.
+
+CREATE TABLE IF NOT EXISTS propriedades_alteracoes (
+    id BIGSERIAL PRIMARY KEY,
+    xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    operacao CHAR(1) NOT NULL,
+    propriedade_id INTEGER NOT NULL,
+    codigo VARCHAR(50) NOT NULL,
+    colunas TEXT[], -- colunas alteradas (somente em 'U')
+    alterado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT chk_operacao_alteracao CHECK (operacao IN ('I', 'U', 'D'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_propriedades_alteracoes_xid
+    ON propriedades_alteracoes(xid, id);
+
+-- Marca d'água (high-water mark) de cada consumidor do log
+CREATE TABLE IF NOT EXISTS cdc_consumidores (
+    consumidor VARCHAR(100) PRIMARY KEY,
+    ultimo_xid XID8 NOT NULL,
+    ultimo_id BIGINT NOT NULL DEFAULT 0,
+    alteracoes_processadas BIGINT NOT NULL DEFAULT 0,
+    registrado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION registrar_alteracoes_propriedades()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_linhas INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo)
+        SELECT 'I', n.id, n.codigo FROM novas n;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- MATERIALIZED: converte cada linha para jsonb uma única vez
+        WITH r AS MATERIALIZED (
+            SELECT n.id, n.codigo,
+                   to_jsonb(n) - 'updated_at' AS depois,
+                   to_jsonb(a) - 'updated_at' AS antes
+            FROM novas n
+            JOIN antigas a ON a.id = n.id
+        )
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo, colunas)
+        SELECT 'U', r.id, r.codigo,
+               ARRAY(SELECT e.key FROM jsonb_each(r.depois) e
+                     WHERE e.value IS DISTINCT FROM r.antes -> e.key
+                     ORDER BY e.key)
+        FROM r
+        WHERE r.depois <> r.antes;
+    ELSE
+        INSERT INTO propriedades_alteracoes (operacao, propriedade_id, codigo)
+        SELECT 'D', a.id, a.codigo FROM antigas a;
+    END IF;
+
+    GET DIAGNOSTICS v_linhas = ROW_COUNT;
+    IF v_linhas > 0 THEN
+        PERFORM pg_notify('propriedades_alteracoes', v_linhas::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_insert ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_insert
+    AFTER INSERT ON propriedades
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_update ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_update
+    AFTER UPDATE ON propriedades
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
+DROP TRIGGER IF EXISTS trg_propriedades_cdc_delete ON propriedades;
+CREATE TRIGGER trg_propriedades_cdc_delete
+    AFTER DELETE ON propriedades
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_alteracoes_propriedades();
+
+COMMENT ON TABLE propriedades_alteracoes IS 'Log de alterações (CDC) de propriedades, preenchido por trigger';
+COMMENT ON TABLE cdc_consumidores IS 'Marca d''água de cada consumidor de propriedades_alteracoes';
@@ -0,0 +1,39 @@
+-- ============================================
+-- 006: Fila de jobs em relatorios_ifrs e sincronizacoes
+-- ============================================
+-- Linhas com status 'pendente' são jobs. Workers (scripts/job_queue.py)
+-- reservam um job com SELECT ... FOR UPDATE SKIP LOCKED, marcam
+-- 'processando', atualizam heartbeat_em enquanto executam e, em caso de
+-- falha, reagendam (executar_apos) até max_tentativas. Registros gravados
+-- diretamente pelos scripts (status já 'processando'/'concluido', worker
+-- NULL) não são afetados.
+
+ALTER TABLE relatorios_ifrs
+    ADD COLUMN IF NOT EXISTS tentativas INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS max_tentativas INTEGER NOT NULL DEFAULT 3,
+    ADD COLUMN IF NOT EXISTS executar_apos TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS worker VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS heartbeat_em TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS iniciado_em TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS concluido_em TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS mensagem_erro TEXT;
+
+ALTER TABLE sincronizacoes
+    ADD COLUMN IF NOT EXISTS parametros JSONB DEFAULT '{}',
+    ADD COLUMN IF NOT EXISTS tentativas INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS max_tentativas INTEGER NOT NULL DEFAULT 3,
+    ADD COLUMN IF NOT EXISTS executar_apos TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS worker VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS heartbeat_em TIMESTAMP;
+
+-- Reserva: só os pendentes entram no índice
+CREATE INDEX IF NOT EXISTS idx_relatorios_fila
+    ON relatorios_ifrs(executar_apos, id) WHERE status = 'pendente';
+CREATE INDEX IF NOT EXISTS idx_sincronizacoes_fila
+    ON sincronizacoes(executar_apos, id) WHERE status = 'pendente';
+
+-- Recuperação de jobs de workers que pararam de enviar heartbeat
+CREATE INDEX IF NOT EXISTS idx_relatorios_heartbeat
+    ON relatorios_ifrs(heartbeat_em) WHERE status = 'processando' AND worker IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_sincronizacoes_heartbeat
+    ON sincronizacoes(heartbeat_em) WHERE status = 'processando' AND worker IS NOT NULL;
@@ -0,0 +1,58 @@
+-- ============================================
+-- 007: Série histórica de avaliações (avaliacoes)
+-- ============================================
+-- Cada avaliação de uma propriedade em uma data de referência é uma linha,
+-- somente de inserção: um novo exercício (coluna VALOR_DD_MM_AAAA_R$ no CSV)
+-- vira novas linhas, sem alterar o schema de propriedades. Correções de
+-- valor para uma mesma data também são inseridas; a mais recente (maior id)
+-- prevalece.
+--
+-- valor_2023/valor_2024 em propriedades continuam preenchidos pelo
+-- importador para os consumidores atuais (API, dataset do Hugging Face).
+
+CREATE TABLE IF NOT EXISTS avaliacoes (
+    id BIGSERIAL PRIMARY KEY,
+    propriedade_id INTEGER NOT NULL REFERENCES propriedades(id) ON DELETE CASCADE,
+    data_referencia DATE NOT NULL,
+    valor DECIMAL(12, 2) NOT NULL,
+    fonte VARCHAR(50) NOT NULL DEFAULT 'importacao',
+    registrado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT chk_avaliacao_valor_positivo CHECK (valor >= 0)
+);
+
+-- Consultas por período: as linhas chegam em lotes por exercício, então a
+-- ordem física acompanha data_referencia e um BRIN ocupa poucas páginas
+CREATE INDEX IF NOT EXISTS idx_avaliacoes_data_brin
+    ON avaliacoes USING BRIN (data_referencia);
+
+-- Última avaliação por propriedade (DISTINCT ON) e por (propriedade, data),
+-- resolvida só pelo índice
+CREATE INDEX IF NOT EXISTS idx_avaliacoes_ultima
+    ON avaliacoes (propriedade_id, data_referencia DESC, id DESC) INCLUDE (valor);
+
+CREATE OR REPLACE VIEW vw_avaliacao_atual AS
+SELECT DISTINCT ON (propriedade_id)
+    propriedade_id,
+    data_referencia,
+    valor,
+    fonte,
+    registrado_em
+FROM avaliacoes
+ORDER BY propriedade_id, data_referencia DESC, id DESC;
+
+-- Carga inicial a partir das colunas fixas
+INSERT INTO avaliacoes (propriedade_id, data_referencia, valor, fonte)
+SELECT p.id, v.data_referencia, v.valor, 'migracao'
+FROM propriedades p
+CROSS JOIN LATERAL (
+    VALUES (DATE '2023-12-31', p.valor_2023), (DATE '2024-12-31', p.valor_2024)
+) AS v (data_referencia, valor)
+WHERE v.valor IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM avaliacoes a
+      WHERE a.propriedade_id = p.id AND a.data_referencia = v.data_referencia
+  );
+
+COMMENT ON TABLE avaliacoes IS 'Série histórica (somente inserção) das avaliações de cada propriedade';
+COMMENT ON VIEW vw_avaliacao_atual IS 'Avaliação mais recente de cada propriedade';
@@ -0,0 +1,31 @@
+-- ============================================
+-- 008: propriedades sem duplicação em metadata
+-- ============================================
+-- O importador copiava codigo_cc, tipo_estoque, valor_2023, valor_2024,
+-- preco_promessa e a data de habite-se para metadata, que já são colunas:
+-- cada linha guardava esses valores duas vezes e o índice GIN de metadata
+-- indexava as cópias. metadata passa a guardar só o que não tem coluna
+-- (o ID da planilha de origem).
+--
+-- Nenhuma consulta filtra por metadata, então o índice GIN sai sem
+-- substituto; se uma consulta de contenção (@>) surgir, o índice indicado é
+-- GIN (metadata jsonb_path_ops). idx_propriedades_codigo repetia o índice
+-- da restrição UNIQUE de codigo.
+
+-- Valores que só existam no JSONB vão para a coluna antes de sair dele
+UPDATE propriedades SET
+    codigo_cc = coalesce(codigo_cc, metadata ->> 'codigo_cc'),
+    tipo_estoque = coalesce(tipo_estoque, metadata ->> 'tipo_estoque'),
+    valor_2023 = coalesce(valor_2023, (metadata ->> 'valor_2023')::numeric),
+    valor_2024 = coalesce(valor_2024, (metadata ->> 'valor_2024')::numeric),
+    preco_promessa = coalesce(preco_promessa, (metadata ->> 'preco_promessa')::numeric),
+    data_habite_se_prevista = coalesce(data_habite_se_prevista, (metadata ->> 'data_habite_se')::date),
+    metadata = metadata - ARRAY['codigo_cc', 'tipo_estoque', 'valor_2023', 'valor_2024',
+                                'preco_promessa', 'data_habite_se']
+WHERE metadata ?| ARRAY['codigo_cc', 'tipo_estoque', 'valor_2023', 'valor_2024',
+                        'preco_promessa', 'data_habite_se'];
+
+DROP INDEX IF EXISTS idx_propriedades_metadata;
+DROP INDEX IF EXISTS idx_propriedades_codigo;
+
+COMMENT ON COLUMN propriedades.metadata IS 'Somente dados sem coluna própria (ex.: ID da planilha de origem)';
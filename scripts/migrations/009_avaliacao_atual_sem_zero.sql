@@ -0,0 +1,23 @@
+-- ============================================
+-- 009: vw_avaliacao_atual ignora avaliações zeradas
+-- ============================================
+-- O CSV usa 0,00 para "sem avaliação no exercício", e essas linhas entram em
+-- avaliacoes como qualquer outra. A view devolvia a linha mais recente mesmo
+-- quando zerada, enquanto propriedades.valor_avaliacao guarda o último valor
+-- não zero (latest_valuation no importador): as duas fontes discordavam.
+-- A view passa a seguir a mesma regra; o histórico continua com as linhas
+-- zeradas. O filtro não muda a ordenação, então a view continua percorrendo
+-- idx_avaliacoes_ultima (valor é coluna INCLUDE do índice).
+
+CREATE OR REPLACE VIEW vw_avaliacao_atual AS
+SELECT DISTINCT ON (propriedade_id)
+    propriedade_id,
+    data_referencia,
+    valor,
+    fonte,
+    registrado_em
+FROM avaliacoes
+WHERE valor > 0
+ORDER BY propriedade_id, data_referencia DESC, id DESC;
+
+COMMENT ON VIEW vw_avaliacao_atual IS 'Avaliação não zero mais recente de cada propriedade (mesma regra de propriedades.valor_avaliacao)';
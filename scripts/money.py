@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Valores monetários exatos em centavos (int64).
+
+Valores em R$ chegam como '9.500,00', 'R$ 1.234,56', 'R$ 37.500', '1234.56'
+ou números já lidos pelo pandas. Convertidos para centavos inteiros, somas,
+agrupamentos e médias são exatos e vetorizados, sem um Decimal por valor.
+float só aparece na saída (CSV, banco, Excel), como representação de um
+valor já arredondado ao centavo: para valores abaixo de 2**53 centavos, o
+repr do float é exatamente o valor com duas casas.
+"""
+
+import re
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Caracteres ignorados na leitura: prefixo R$, espaços e sinal
+IGNORED_CHARS = r'[R$\s+-]'
+NUMBER_PATTERN = r'[0-9][0-9.,]*'
+# Sem vírgula, pontos a cada três dígitos são de milhar ('37.500', '1.250.000')
+THOUSANDS_PATTERN = r'[1-9][0-9]{0,2}(\.[0-9]{3})+'
+# Com vírgula, ela é a última separação e tem uma ou duas casas ('9.500,00', '1234,5')
+COMMA_DECIMAL_PATTERN = r'[0-9.]*,[0-9]{1,2}'
+
+
+def normalize_number(text):
+    """
+    '9.500,00' -> '9500.00'; '37.500' -> '37500'; '1234.56' inalterado.
+    Com vírgula, ela é o separador decimal e os pontos são de milhar; se
+    houver ponto depois dela ou ela não for seguida de uma ou duas casas
+    ('9,500.00', '1,234'), o valor é ambíguo e o retorno é None. Sem
+    vírgula, pontos separando grupos de três dígitos (THOUSANDS_PATTERN) ou
+    vários pontos são de milhar, e um ponto isolado é decimal ('0.500', '12.5').
+    """
+    if ',' in text:
+        if not re.fullmatch(COMMA_DECIMAL_PATTERN, text):
+            return None
+        return text.replace('.', '').replace(',', '.')
+    if text.count('.') > 1 or re.fullmatch(THOUSANDS_PATTERN, text):
+        return text.replace('.', '')
+    return text
+
+
+def to_cents(value):
+    """
+    Converte um valor em R$ para centavos (int), ou None se vazio/inválido.
+    Mesmas regras de parse_cents, para uso linha a linha.
+    """
+    if value is None or value is pd.NA or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value) * 100
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else int(np.rint(value * 100))
+    if isinstance(value, Decimal):
+        return int((value * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+    text = str(value)
+    digits = re.sub(IGNORED_CHARS, '', text)
+    if not re.fullmatch(NUMBER_PATTERN, digits):
+        return None
+    number = normalize_number(digits)
+    if number is None or number.count('.') > 1:
+        return None
+    cents = int((Decimal(number) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    return -cents if '-' in text else cents
+
+
+def parse_cents(series):
+    """
+    Converte uma série de valores em R$ para centavos (Int64; vazios e
+    inválidos viram <NA>), de forma vetorizada.
+
+    Aceita números, '1234.56', '1234,56', '9.500,00', 'R$ 9.500,00', 'R$ 37.500'
+    e sinal (separadores como em normalize_number).
+    Mais de duas casas decimais são arredondadas para o centavo (metade para
+    longe do zero, como o DECIMAL(12,2) do PostgreSQL). Floats são tratados
+    como valores já com duas casas (o double mais próximo do valor decimal).
+    """
+    if pd.api.types.is_bool_dtype(series):
+        raise TypeError("Série booleana não é um valor monetário")
+    if pd.api.types.is_integer_dtype(series):
+        return series.astype('Int64') * 100
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        return float_cents(np.rint(values * 100), series.index)
+
+    text = pa.array(series.astype('string[pyarrow]'))
+    negative = pc.match_substring(text, '-').fill_null(False)
+    digits = pc.replace_substring_regex(text, IGNORED_CHARS, '')
+    valid = pc.match_substring_regex(digits, f'^{NUMBER_PATTERN}$').fill_null(False)
+
+    # Mesmas regras de normalize_number, coluna a coluna
+    brazilian = pc.match_substring(digits, ',').fill_null(False)
+    valid = pc.and_(valid, pc.or_(
+        pc.invert(brazilian),
+        pc.match_substring_regex(digits, f'^{COMMA_DECIMAL_PATTERN}$').fill_null(False),
+    ))
+    no_dots = pc.replace_substring(digits, '.', '')
+    number = pc.if_else(
+        brazilian,
+        pc.replace_substring(no_dots, ',', '.'),
+        pc.if_else(
+            pc.or_(pc.greater(pc.count_substring(digits, '.'), 1),
+                   pc.match_substring_regex(digits, f'^{THOUSANDS_PATTERN}$')),
+            no_dots, digits,
+        ),
+    )
+    valid = pc.and_(valid, pc.less_equal(pc.count_substring(number, '.'), 1).fill_null(False))
+    point = pc.find_substring(number, '.')
+    decimals = pc.if_else(pc.greater_equal(point, 0),
+                          pc.subtract(pc.subtract(pc.utf8_length(number), point), 1), 0)
+
+    # Até duas casas, o double mais próximo vezes 100 arredonda exatamente
+    # para o centavo; com mais casas, o arredondamento é feito em Decimal
+    number = pc.if_else(valid, number, None)
+    cents = np.rint(pc.cast(number, pa.float64()).to_numpy(zero_copy_only=False) * 100)
+    extra = pc.and_(valid, pc.greater(decimals, 2).fill_null(False)).to_numpy(zero_copy_only=False)
+    if extra.any():
+        cents[extra] = [to_cents(value) for value in pc.filter(number, extra).to_pylist()]
+    negative = negative.to_numpy(zero_copy_only=False)
+    return float_cents(np.where(negative, -cents, cents), series.index)
+
+
+def float_cents(values, index):
+    """Centavos calculados em float64 (inteiros exatos ou NaN) -> série Int64."""
+    return pd.Series(pd.array(values, dtype='Float64'), index=index).astype('Int64')
+
+
+def cents_array(series):
+    """Centavos como ndarray int64 (<NA> vira 0) e a máscara de ausentes."""
+    cents = parse_cents(series)
+    return cents.to_numpy(dtype='int64', na_value=0), cents.isna().to_numpy()
+
+
+def cents_to_float(cents):
+    """Centavos (Int64/int64) -> reais em float64, com NaN nos ausentes. Só para saída."""
+    if isinstance(cents, pd.Series):
+        values = cents.to_numpy(dtype=float, na_value=np.nan) / 100
+        return pd.Series(values, index=cents.index, name=cents.name)
+    return np.asarray(cents, dtype=float) / 100
+
+
+def cents_to_decimal(cents):
+    """Centavos (int) -> Decimal exato com duas casas (None se ausente)."""
+    if cents is None or cents is pd.NA:
+        return None
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def sum_cents(series):
+    """Soma exata de uma série em centavos (ausentes ignorados), como int."""
+    return int(series.sum())
+
+
+def divide_cents(total, count):
+    """
+    Divide centavos arredondando metade para longe do zero (ex.: média),
+    com aritmética inteira. Aceita escalares ou arrays.
+    """
+    total = np.asarray(total, dtype='int64')
+    count = np.asarray(count, dtype='int64')
+    quotient = (np.abs(total) * 2 + count) // (2 * count)
+    result = np.sign(total) * quotient
+    return int(result) if result.ndim == 0 else result
+
+
+def format_cents(cents):
+    """Centavos -> '1,234,567.89' (mesmo formato dos relatórios)."""
+    return f"{cents_to_decimal(cents):,.2f}"
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Pipeline de dados como DAG: validação, importação, relatórios IFRS,
+exportação para Obsidian e sincronização com Hugging Face.
+
+As etapas rodam em threads de um único processo: etapas independentes
+executam em paralelo assim que suas dependências terminam, e cada CSV é
+lido uma única vez e compartilhado em memória entre as etapas. Uma etapa
+cujas entradas (arquivos, parâmetros e o código do script e dos módulos que
+ele importa) têm o mesmo hash da última execução bem-sucedida é pulada.
+"""
+
+import os
+import sys
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# nome, dependências, script (entra no hash, com os módulos que importa),
+# entra na execução padrão, arquivos de entrada (config -> paths),
+# parâmetros (config -> dict), função
+Stage = namedtuple('Stage', ['nome', 'depende', 'script', 'padrao', 'entradas',
+                             'parametros', 'executar'])
+
+
+class PipelineContext:
+    """Configuração da execução e cache de DataFrames compartilhado entre etapas."""
+
+    def __init__(self, config):
+        self.config = config
+        self.frames = {}
+        self.read_seconds = 0.0
+        self._lock = threading.Lock()
+        self._file_locks = {}
+
+    def read_csv(self, path):
+        """pd.read_csv memoizado: cada arquivo é lido uma única vez."""
+        import pandas as pd
+
+        key = str(Path(path).resolve())
+        with self._lock:
+            file_lock = self._file_locks.setdefault(key, threading.Lock())
+        with file_lock:
+            if key not in self.frames:
+                start = time.perf_counter()
+                self.frames[key] = pd.read_csv(path)
+                with self._lock:
+                    self.read_seconds += time.perf_counter() - start
+            return self.frames[key]
+
+
+def csv_files(directory, pattern='*.csv'):
+    return sorted(Path(directory).glob(pattern))
+
+
+def property_csv(directory):
+    """Mesmo arquivo que load_property_data() usa (primeiro *propriedades*.csv)."""
+    files = csv_files(directory, '*propriedades*.csv')
+    return files[0] if files else None
+
+
+# ============================================
+# Etapas
+# ============================================
+
+def stage_validar(ctx):
+    from validate_schemas import validate_all_csvs
+
+    return validate_all_csvs(ctx.config['data_raw'], ctx.config['schemas_dir'], ctx.read_csv), []
+
+
+def stage_importar(ctx):
+    from import_propriedades import import_propriedades
+
+    csv_path = Path(ctx.config['data_raw']) / 'propriedades.csv'
+    if not csv_path.exists():
+        print(f"❌ Arquivo CSV não encontrado: {csv_path}")
+        return False, []
+    import_propriedades(csv_path, read_csv=ctx.read_csv)
+    return True, []
+
+
+def stage_relatorios(ctx):
+    from generate_ifrs_reports import (analyze_movements, generate_ifrs_report_excel,
+                                       generate_ifrs_report_pdf)
+
+    csv_path = property_csv(ctx.config['data_processed'])
+    if csv_path is None:
+        print("❌ Nenhum dado encontrado para gerar relatórios")
+        return False, []
+    df = ctx.read_csv(csv_path)
+
+    output_dir = Path(ctx.config['reports_dir'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    periodo, formato = ctx.config['periodo'], ctx.config['formato']
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    analise = analyze_movements(df)
+    outputs = []
+    if formato in ['pdf', 'both']:
+        outputs.append(output_dir / f"relatorio_ifrs_{periodo}_{timestamp}.pdf")
+        generate_ifrs_report_pdf(df, outputs[-1], periodo, analise)
+    if formato in ['xlsx', 'both']:
+        outputs.append(output_dir / f"relatorio_ifrs_{periodo}_{timestamp}.xlsx")
+        generate_ifrs_report_excel(df, outputs[-1], periodo, analise)
+    return True, outputs
+
+
+def stage_obsidian(ctx):
+    from export_to_obsidian import create_obsidian_note, create_index_note
+
+    csv_path = property_csv(ctx.config['data_processed'])
+    if csv_path is None:
+        print("❌ Nenhum dado encontrado para exportar")
+        return False, []
+    df = ctx.read_csv(csv_path)
+
+    output_dir = ctx.config['obsidian_dir']
+    for _, prop in df.iterrows():
+        create_obsidian_note(prop, output_dir)
+    index_path = create_index_note(df, output_dir)
+    print(f"📝 {len(df)} nota(s) exportada(s) para {output_dir}")
+    return True, [index_path]
+
+
+def stage_sync_hf(ctx):
+    from huggingface_hub import login
+    from sync_huggingface import (
+        push_to_huggingface, push_delta_to_huggingface, create_dataset_from_data,
+        LocalHubDirectory, MANIFEST_FILENAME
+    )
+
+    data_dir = ctx.config['data_processed']
+    data_dict = {path.stem: ctx.read_csv(path) for path in csv_files(data_dir)}
+    if not data_dict:
+        print("❌ Nenhum dado encontrado para upload.")
+        return False, []
+
+    dataset, token = ctx.config['hf_dataset'], os.getenv('HF_TOKEN')
+    if ctx.config['hf_modo'] == 'delta':
+        api = LocalHubDirectory(ctx.config['hub_dir']) if ctx.config['hub_dir'] else None
+        if not api and token:
+            login(token=token)
+        manifest_path = str(Path(data_dir) / MANIFEST_FILENAME)
+        return push_delta_to_huggingface(data_dict, dataset, token, manifest_path, api=api), []
+    return push_to_huggingface(create_dataset_from_data(data_dict), dataset, token), []
+
+
+STAGES = {stage.nome: stage for stage in [
+    Stage('validar', [], 'validate_schemas.py', True,
+          lambda c: csv_files(c['data_raw']) + sorted(Path(c['schemas_dir']).glob('*.json')),
+          lambda c: {},
+          stage_validar),
+    Stage('importar', ['validar'], 'import_propriedades.py', False,
+          lambda c: [Path(c['data_raw']) / 'propriedades.csv'],
+          lambda c: {'db': f"{os.getenv('POSTGRES_HOST', 'localhost')}/"
+                           f"{os.getenv('POSTGRES_DB', 'bni_gestao')}"},
+          stage_importar),
+    Stage('relatorios', ['validar'], 'generate_ifrs_reports.py', True,
+          lambda c: [p for p in [property_csv(c['data_processed'])] if p],
+          lambda c: {'periodo': c['periodo'], 'formato': c['formato'],
+                     'saida': c['reports_dir']},
+          stage_relatorios),
+    Stage('obsidian', ['validar'], 'export_to_obsidian.py', True,
+          lambda c: [p for p in [property_csv(c['data_processed'])] if p],
+          lambda c: {'saida': c['obsidian_dir']},
+          stage_obsidian),
+    Stage('sync-hf', ['validar'], 'sync_huggingface.py', True,
+          lambda c: csv_files(c['data_processed']),
+          lambda c: {'dataset': c['hf_dataset'], 'modo': c['hf_modo'], 'hub': c['hub_dir']},
+          stage_sync_hf),
+]}
+
+
+# ============================================
+# Planejamento e execução
+# ============================================
+
+def resolve_stages(targets):
+    """Etapas pedidas mais suas dependências, em ordem topológica."""
+    ordered = []
+
+    def visit(name, path=()):
+        if name in path:
+            raise ValueError(f"Ciclo de dependências: {' -> '.join(path + (name,))}")
+        if name in ordered:
+            return
+        for dependency in STAGES[name].depende:
+            visit(dependency, path + (name,))
+        ordered.append(name)
+
+    for name in targets:
+        visit(name)
+    return ordered
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def local_modules(script):
+    """
+    O script e os módulos de scripts/ que ele importa, direta ou
+    indiretamente (inclusive imports dentro de funções), em ordem.
+    """
+    import ast
+
+    seen, pending = [], [SCRIPTS_DIR / script]
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.exists():
+            continue
+        seen.append(path)
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            pending += [SCRIPTS_DIR / f"{name.split('.')[0]}.py" for name in names]
+    return sorted(seen)
+
+
+def stage_hash(stage, config):
+    """
+    Hash das entradas da etapa: arquivos, parâmetros e código do script e
+    dos módulos de scripts/ que ele importa (ifrs_analytics.py, money.py...).
+    """
+    digest = hashlib.sha256(stage.nome.encode())
+    digest.update(json.dumps(stage.parametros(config), sort_keys=True).encode())
+    for path in local_modules(stage.script) + [Path(__file__)] + list(stage.entradas(config)):
+        digest.update(str(path).encode())
+        digest.update(file_sha256(path).encode() if Path(path).exists() else b'ausente')
+    return digest.hexdigest()
+
+
+def load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(path, state):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(previous, current_hash):
+    """A etapa pode ser pulada: mesmo hash e saídas ainda presentes."""
+    return (previous is not None
+            and previous.get('hash') == current_hash
+            and all(Path(p).exists() for p in previous.get('saidas', [])))
+
+
+def run_stage(stage, ctx):
+    """Executa uma etapa; retorna (sucesso, saídas, segundos)."""
+    start = time.perf_counter()
+    try:
+        success, outputs = stage.executar(ctx)
+    except SystemExit as e:
+        # Funções dos scripts ainda usam sys.exit() em caso de erro
+        success, outputs = e.code in (0, None), []
+    except Exception as e:
+        print(f"❌ [{stage.nome}] {type(e).__name__}: {e}")
+        success, outputs = False, []
+    return bool(success), [str(p) for p in outputs], time.perf_counter() - start
+
+
+def run_pipeline(targets, config, jobs=4, force=False, dry_run=False):
+    """
+    Executa as etapas em paralelo respeitando as dependências.
+    Retorna {etapa: (status, segundos)}.
+    """
+    order = resolve_stages(targets)
+    state = load_state(config['state_path'])
+    hashes = {name: stage_hash(STAGES[name], config) for name in order}
+
+    results = {}
+    pending = []
+    for name in order:
+        if not force and is_up_to_date(state.get(name), hashes[name]):
+            results[name] = ('atualizado', 0.0)
+        else:
+            pending.append(name)
+
+    print(f"🧭 Etapas: {', '.join(order)}")
+    for name in order:
+        icon = '⏭️ ' if name in results else '▶️ '
+        deps = f" (após {', '.join(STAGES[name].depende)})" if STAGES[name].depende else ''
+        print(f"  {icon} {name}{deps}")
+    if dry_run:
+        return results
+
+    ctx = PipelineContext(config)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = [results.get(d, (None,))[0] for d in STAGES[name].depende if d in order]
+                if any(status in ('erro', 'bloqueado') for status in deps):
+                    results[name] = ('bloqueado', 0.0)
+                    pending.remove(name)
+                elif all(status in ('ok', 'atualizado') for status in deps):
+                    print(f"▶️  {name}")
+                    running[pool.submit(run_stage, STAGES[name], ctx)] = name
+                    pending.remove(name)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                success, outputs, seconds = future.result()
+                results[name] = ('ok' if success else 'erro', seconds)
+                print(f"{'✅' if success else '❌'} {name} ({seconds:.2f}s)")
+                if success:
+                    state[name] = {'hash': hashes[name], 'saidas': outputs,
+                                   'concluido_em': datetime.now().isoformat(timespec='seconds'),
+                                   'duracao': round(seconds, 3)}
+                else:
+                    state.pop(name, None)
+                save_state(config['state_path'], state)
+
+    results['_leitura_csv'] = ('ok', ctx.read_seconds)
+    return results
+
+
+def print_timings(results, elapsed):
+    icons = {'ok': '✅', 'atualizado': '⏭️ ', 'erro': '❌', 'bloqueado': '⛔'}
+    print("-" * 50)
+    print(f"{'etapa':<14} {'status':<12} {'tempo (s)':>10}")
+    for name, (status, seconds) in results.items():
+        if name.startswith('_'):
+            continue
+        print(f"{name:<14} {icons[status]} {status:<9} {seconds:>10.2f}")
+    stage_total = sum(s for n, (_, s) in results.items() if not n.startswith('_'))
+    read_seconds = results.get('_leitura_csv', (None, 0.0))[1]
+    print("-" * 50)
+    print(f"⏱️  Total: {elapsed:.2f}s (soma das etapas {stage_total:.2f}s; "
+          f"leitura de CSVs {read_seconds:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Executa o pipeline de dados (DAG de etapas)')
+    parser.add_argument('etapas', nargs='*', metavar='etapa',
+                        help=f"Etapas a executar ({', '.join(STAGES)}); "
+                             f"padrão: todas exceto importar")
+    parser.add_argument('--jobs', '-j', type=int, default=4,
+                        help='Etapas executadas em paralelo')
+    parser.add_argument('--force', action='store_true',
+                        help='Executa mesmo as etapas com entradas inalteradas')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Apenas mostra o plano de execução')
+    parser.add_argument('--data-raw', type=str, default=os.getenv('DATA_RAW_PATH', './data/raw'),
+                        help='Diretório com CSVs brutos (validação e importação)')
+    parser.add_argument('--data-dir', type=str,
+                        default=os.getenv('DATA_PROCESSED_PATH', './data/processed'),
+                        help='Diretório com dados processados')
+    parser.add_argument('--schemas-dir', type=str,
+                        default=os.getenv('DATA_SCHEMAS_PATH', './data/schemas'),
+                        help='Diretório com schemas JSON')
+    parser.add_argument('--periodo', type=str, default=datetime.now().strftime('%Y-%m'),
+                        help='Período dos relatórios (YYYY-MM)')
+    parser.add_argument('--format', type=str, choices=['pdf', 'xlsx', 'both'],
+                        default=os.getenv('IFRS_REPORTS_FORMAT', 'pdf'),
+                        help='Formato dos relatórios')
+    parser.add_argument('--hf-modo', choices=['delta', 'full'], default='delta',
+                        help='delta envia só os shards alterados; full recria o dataset')
+    parser.add_argument('--hub-dir', type=str, default=None,
+                        help='Usa um diretório local no lugar do Hugging Face (testes)')
+    parser.add_argument('--state', type=str,
+                        default=os.getenv('PIPELINE_STATE_PATH', './data/.pipeline_state.json'),
+                        help='Arquivo com os hashes da última execução')
+
+    args = parser.parse_args()
+    unknown = [name for name in args.etapas if name not in STAGES]
+    if unknown:
+        parser.error(f"etapa(s) desconhecida(s): {', '.join(unknown)}")
+
+    config = {
+        'data_raw': args.data_raw,
+        'data_processed': args.data_dir,
+        'schemas_dir': args.schemas_dir,
+        'reports_dir': os.getenv('IFRS_REPORTS_PATH', './reports/ifrs'),
+        'obsidian_dir': os.getenv('OBSIDIAN_VAULT_PATH', './obsidian/vault_backup'),
+        'periodo': args.periodo,
+        'formato': args.format,
+        'hf_dataset': os.getenv('HF_DATASET_NAME', 'senal88/bni-gestao-imobiliaria'),
+        'hf_modo': args.hf_modo,
+        'hub_dir': args.hub_dir,
+        'state_path': args.state,
+    }
+    targets = args.etapas or [name for name, stage in STAGES.items() if stage.padrao]
+
+    print("🔀 Pipeline de dados")
+    print("-" * 50)
+    start = time.perf_counter()
+    results = run_pipeline(targets, config, jobs=args.jobs, force=args.force,
+                           dry_run=args.dry_run)
+    if args.dry_run:
+        return
+    print_timings(results, time.perf_counter() - start)
+
+    failed = [name for name, (status, _) in results.items() if status in ('erro', 'bloqueado')]
+    if failed:
+        print(f"❌ Etapas com falha: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ Pipeline concluído!")
+
+
+if __name__ == '__main__':
+    main()
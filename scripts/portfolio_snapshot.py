@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Snapshot do portfólio em Arrow IPC (Feather v2) para carga instantânea.
+
+Depois de cada importação concluída, a tabela propriedades e os agregados por
+tipo_estoque/status são gravados em PORTFOLIO_SNAPSHOT_PATH, sem compressão,
+junto com a versão: a quantidade de sincronizações concluídas e a data da
+última (a mesma versão usada pelo cache da API). Os consumidores abrem os
+arquivos com memory-map, sem cópia, e só voltam ao banco quando
+`sincronizacoes` registrou uma conclusão mais nova que a do snapshot.
+
+Valores DECIMAL(12,2) são gravados como float64: com duas casas e abaixo de
+2**53 centavos o float representa o valor exatamente (ver money.py), e as
+colunas numéricas chegam ao pandas sem conversão.
+"""
+
+import os
+import sys
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+import psycopg2
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SNAPSHOT_FORMAT = 1
+METADATA_KEY = b'bni_snapshot'
+
+SYNC_VERSION_SQL = """
+    SELECT count(*), max(concluido_em)
+    FROM sincronizacoes
+    WHERE status = 'concluido'
+"""
+
+AGGREGATES_SQL = """
+    SELECT coalesce(tipo_estoque, 'N/D') AS tipo_estoque,
+           coalesce(status, 'N/D') AS status,
+           count(*) AS quantidade,
+           count(valor_avaliacao) AS com_valor,
+           coalesce(sum(valor_avaliacao), 0)::float8 AS valor_total,
+           coalesce(sum(area_total), 0)::float8 AS area_total
+    FROM propriedades
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados."""
+    try:
+        conn = psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+        return conn
+    except psycopg2.Error as e:
+        print(f"❌ Erro ao conectar ao banco de dados: {e}")
+        sys.exit(1)
+
+
+def default_snapshot_dir():
+    """Diretório do snapshot (PORTFOLIO_SNAPSHOT_PATH)."""
+    return Path(os.getenv('PORTFOLIO_SNAPSHOT_PATH', './data/snapshot'))
+
+
+def sync_version(conn):
+    """
+    Versão atual dos dados: o banco de origem, as sincronizações concluídas
+    e a data da última.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(SYNC_VERSION_SQL)
+        count, last = cursor.fetchone()
+    conn.rollback()
+    return {
+        'banco': f"{conn.info.host}:{conn.info.port}/{conn.info.dbname}",
+        'sincronizacoes': count,
+        'ultima_conclusao': last.isoformat() if last else None,
+    }
+
+
+def is_stale(version, current):
+    """
+    True se o snapshot (`version`) não servir para o banco em `current`:
+    gravado a partir de outro banco ou anterior à última sincronização.
+    """
+    if version.get('banco') != current['banco']:
+        return True
+    def key(v):
+        return (v['ultima_conclusao'] or '', v['sincronizacoes'])
+    return key(version) < key(current)
+
+
+def fetch_table(conn, table):
+    """Tabela inteira como pyarrow.Table, página a página (export_dados.py)."""
+    import pyarrow as pa
+    from export_dados import ParquetWriter, iter_pages
+
+    schema, pages = None, []
+    for columns, rows in iter_pages(conn, table):
+        if schema is None:
+            schema = ParquetWriter.arrow_schema(columns)
+        pages.append(ParquetWriter.arrow_table(schema, rows))
+    if schema is None:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+            schema = ParquetWriter.arrow_schema(cursor.description)
+        conn.rollback()
+    # DECIMAL -> float64 (ver docstring do módulo)
+    schema = pa.schema([
+        pa.field(field.name, pa.float64()) if pa.types.is_decimal(field.type) else field
+        for field in schema
+    ])
+    if not pages:
+        return schema.empty_table()
+    return pa.concat_tables([page.cast(schema) for page in pages])
+
+
+def fetch_aggregates(conn):
+    """Agregados do portfólio por tipo_estoque e status."""
+    import pyarrow as pa
+
+    with conn.cursor() as cursor:
+        cursor.execute(AGGREGATES_SQL)
+        names = [c.name for c in cursor.description]
+        rows = cursor.fetchall()
+    conn.rollback()
+    return pa.table({name: [row[i] for row in rows] for i, name in enumerate(names)})
+
+
+def write_table(table, path, version):
+    """Grava uma tabela em Arrow IPC (arquivo), com a versão nos metadados."""
+    import pyarrow as pa
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(version).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = path.with_suffix('.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp_path.replace(path)
+
+
+def write_snapshot(conn, directory=None):
+    """
+    Grava propriedades e agregados com a versão atual de `sincronizacoes`.
+    Retorna {tabela: pyarrow.Table} (as tabelas gravadas).
+    """
+    directory = Path(directory or default_snapshot_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    version = {
+        'formato': SNAPSHOT_FORMAT,
+        **sync_version(conn),
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+    }
+    tables = {'propriedades': fetch_table(conn, 'propriedades'),
+              'agregados': fetch_aggregates(conn)}
+    for name, table in tables.items():
+        write_table(table, directory / f'{name}.arrow', version)
+    return tables
+
+
+def open_snapshot(name='propriedades', directory=None):
+    """
+    Abre uma tabela do snapshot com memory-map (sem cópia). Retorna
+    (tabela, versão), ou (None, None) se não existir ou for de outro formato.
+    """
+    import pyarrow as pa
+
+    path = Path(directory or default_snapshot_dir()) / f'{name}.arrow'
+    if not path.exists():
+        return None, None
+    table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    raw = (table.schema.metadata or {}).get(METADATA_KEY)
+    version = json.loads(raw) if raw else None
+    if not version or version.get('formato') != SNAPSHOT_FORMAT:
+        return None, None
+    return table, version
+
+
+def load_snapshot(name='propriedades', conn=None, directory=None):
+    """
+    Tabela do snapshot se estiver em dia com `sincronizacoes`; senão lê do
+    banco e regrava o snapshot. Sem `conn`, conecta por conta própria; se o
+    banco estiver inacessível, usa o snapshot existente sem verificar.
+
+    Retorna (pyarrow.Table, origem), com origem 'snapshot' ou 'banco'.
+    """
+    table, version = open_snapshot(name, directory)
+    own_conn = conn is None
+    if own_conn:
+        try:
+            conn = psycopg2.connect(
+                host=os.getenv('POSTGRES_HOST', 'localhost'),
+                port=os.getenv('POSTGRES_PORT', '5432'),
+                database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+                user=os.getenv('POSTGRES_USER', 'postgres'),
+                password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+            )
+        except psycopg2.Error as e:
+            if table is None:
+                print(f"❌ Sem snapshot e sem acesso ao banco de dados: {e}")
+                sys.exit(1)
+            print("⚠️  Banco inacessível: usando o snapshot sem verificar a versão")
+            return table, 'snapshot'
+
+    try:
+        if table is not None and not is_stale(version, sync_version(conn)):
+            return table, 'snapshot'
+        return write_snapshot(conn, directory)[name], 'banco'
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def load_portfolio(conn=None, directory=None, codigos=None):
+    """
+    Propriedades como DataFrame (layout do banco) a partir do snapshot,
+    opcionalmente só os `codigos` informados (filtrados ainda em Arrow).
+    Retorna (DataFrame, origem).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table, origem = load_snapshot('propriedades', conn, directory)
+    if codigos is not None:
+        wanted = pa.array([str(c) for c in codigos])
+        table = table.filter(pc.is_in(table['codigo'], value_set=wanted))
+    return table.to_pandas(), origem
+
+
+def refresh_after_import(conn):
+    """Regrava o snapshot e o índice de propriedades depois de uma importação."""
+    from property_index import SOURCE_COLUMNS, PropertyIndex
+
+    tables = write_snapshot(conn)
+    properties = tables['propriedades'].select(SOURCE_COLUMNS).to_pandas()
+    index_path = PropertyIndex.from_frame(properties, origem='postgres').save()
+    return default_snapshot_dir(), index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot Arrow do portfólio (memory-map)')
+    parser.add_argument('comando', choices=['gravar', 'info'],
+                        help="'gravar' lê o banco e grava o snapshot; "
+                             "'info' mostra versão e situação")
+    parser.add_argument('--dir', type=str, default=None,
+                        help='Diretório do snapshot (padrão: PORTFOLIO_SNAPSHOT_PATH)')
+    args = parser.parse_args()
+
+    directory = Path(args.dir) if args.dir else default_snapshot_dir()
+
+    if args.comando == 'gravar':
+        conn = get_db_connection()
+        try:
+            start = time.perf_counter()
+            tables = write_snapshot(conn, directory)
+        finally:
+            conn.close()
+        print(f"✅ Snapshot gravado em {directory}: "
+              f"{tables['propriedades'].num_rows:,} propriedades, "
+              f"{tables['agregados'].num_rows} grupos ({time.perf_counter() - start:.2f}s)")
+        return
+
+    start = time.perf_counter()
+    table, version = open_snapshot('propriedades', directory)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if table is None:
+        print(f"⚠️  Nenhum snapshot em {directory} (use 'gravar')")
+        sys.exit(1)
+    print(f"🗂️  {directory}: {table.num_rows:,} propriedades, {table.num_columns} colunas, "
+          f"aberto em {elapsed_ms:.1f} ms")
+    print(f"   Versão: {version.get('banco')}, {version['sincronizacoes']} sincronizações, "
+          f"última em "
+          f"{version['ultima_conclusao']} (gravado em {version['criado_em']})")
+    conn = get_db_connection()
+    try:
+        current = sync_version(conn)
+    finally:
+        conn.close()
+    if version.get('banco') != current['banco']:
+        print(f"   ⚠️  Gravado a partir de outro banco ({version.get('banco')}), "
+              f"não de {current['banco']}")
+    elif is_stale(version, current):
+        print(f"   ⚠️  Desatualizado: o banco está em {current['sincronizacoes']} sincronizações "
+              f"(última em {current['ultima_conclusao']})")
+    else:
+        print("   ✅ Em dia com sincronizacoes")
+
+
+if __name__ == '__main__':
+    main()
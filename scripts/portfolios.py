@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Registro de portfólios (SPEs) para operação multi-portfólio.
+
+Cada portfólio vive no seu próprio banco ou schema. O registro é um YAML em
+PORTFOLIOS_PATH (ver portfolios.example.yaml); sem ele há um único portfólio,
+'principal', com as variáveis POSTGRES_* de sempre. Este módulo oferece:
+
+- um pool de conexões por portfólio (connection(), fan_out());
+- as variáveis de ambiente de cada portfólio (portfolio_env()), com as quais
+  qualquer script roda para um portfólio sem mudança, já que todos leem
+  os.getenv();
+- `executar`, que roda um comando da CLI em cada portfólio.
+
+Portfólios em schema usam search_path (opção `-c search_path` da conexão,
+ou PGOPTIONS para os scripts), com `public` no fim para as extensões.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_PORTFOLIO = 'principal'
+POOL_MAX_SIZE = int(os.getenv('PORTFOLIO_POOL_MAX_SIZE', '4'))
+
+
+def registry_path():
+    return Path(os.getenv('PORTFOLIOS_PATH', './portfolios.yaml'))
+
+
+def load_registry(path=None):
+    """
+    Portfólios do registro, em ordem: {nome: Portfolio}. Sem arquivo,
+    retorna só o portfólio 'principal' (variáveis POSTGRES_*).
+
+    O modelo pydantic é definido aqui dentro para que importar o módulo
+    (ex.: `bni portfolios --help`) não carregue o pydantic.
+    """
+    from typing import Dict, Optional
+
+    import yaml
+    from pydantic import BaseModel, Field, ValidationError
+
+    class Portfolio(BaseModel):
+        """Um portfólio do registro. Campos omitidos vêm de POSTGRES_*."""
+
+        nome: str
+        banco: str = Field(default_factory=lambda: os.getenv('POSTGRES_DB', 'bni_gestao'))
+        schema_: Optional[str] = Field(default=None, alias='schema')
+        host: str = Field(default_factory=lambda: os.getenv('POSTGRES_HOST', 'localhost'))
+        port: int = Field(default_factory=lambda: int(os.getenv('POSTGRES_PORT', '5432')))
+        usuario: str = Field(default_factory=lambda: os.getenv('POSTGRES_USER', 'postgres'))
+        # Nome da variável de ambiente com a senha (a senha não fica no registro)
+        senha_env: str = 'POSTGRES_PASSWORD'
+        hf_dataset: Optional[str] = None
+        # Variáveis extras para os scripts deste portfólio (ex.: DATA_RAW_PATH)
+        env: Dict[str, str] = Field(default_factory=dict)
+
+        model_config = {'populate_by_name': True}
+
+        @property
+        def options(self):
+            """Opções de conexão (search_path) para portfólios em schema."""
+            return f"-c search_path={self.schema_},public" if self.schema_ else None
+
+        def connect_kwargs(self):
+            """Argumentos de psycopg2.connect para este portfólio."""
+            kwargs = {
+                'host': self.host,
+                'port': self.port,
+                'database': self.banco,
+                'user': self.usuario,
+                'password': os.getenv(self.senha_env, 'postgres'),
+            }
+            if self.options:
+                kwargs['options'] = self.options
+            return kwargs
+
+        def describe(self):
+            """Destino do portfólio: host:porta/banco[.schema]."""
+            schema = f".{self.schema_}" if self.schema_ else ''
+            return f"{self.host}:{self.port}/{self.banco}{schema}"
+
+    path = Path(path) if path else registry_path()
+    if not path.exists():
+        return {DEFAULT_PORTFOLIO: Portfolio(nome=DEFAULT_PORTFOLIO)}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or {}
+    defaults = data.get('padrao') or {}
+    entries = data.get('portfolios') or {}
+    if not entries:
+        raise ValueError(f"Nenhum portfólio em {path}")
+    try:
+        return {name: Portfolio(nome=name, **{**defaults, **(entry or {})})
+                for name, entry in entries.items()}
+    except ValidationError as e:
+        raise ValueError(f"Registro de portfólios inválido ({path}): {e}") from e
+
+
+def select_portfolios(names=None, path=None):
+    """Portfólios escolhidos (todos, se `names` for vazio); sai com erro se algum não existir."""
+    try:
+        registry = load_registry(path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not names:
+        return list(registry.values())
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        print(f"❌ Portfólio(s) desconhecido(s): {', '.join(unknown)} "
+              f"(registrados: {', '.join(registry)})")
+        sys.exit(1)
+    return [registry[name] for name in names]
+
+
+def portfolio_env(portfolio):
+    """
+    Variáveis de ambiente para rodar um script neste portfólio. Snapshot,
+    índice, relatórios e vault ganham um subdiretório por portfólio para
+    que um portfólio não sobrescreva os arquivos de outro.
+    """
+    env = {
+        'PORTFOLIO_NAME': portfolio.nome,
+        'POSTGRES_HOST': portfolio.host,
+        'POSTGRES_PORT': str(portfolio.port),
+        'POSTGRES_DB': portfolio.banco,
+        'POSTGRES_USER': portfolio.usuario,
+        'POSTGRES_PASSWORD': os.getenv(portfolio.senha_env, 'postgres'),
+    }
+    if portfolio.options:
+        env['PGOPTIONS'] = portfolio.options
+    if portfolio.hf_dataset:
+        env['HF_DATASET_NAME'] = portfolio.hf_dataset
+    if portfolio.nome != DEFAULT_PORTFOLIO:
+        snapshot = Path(os.getenv('PORTFOLIO_SNAPSHOT_PATH', './data/snapshot'))
+        index = Path(os.getenv('PROPERTY_INDEX_PATH', './data/index/propriedades.idx'))
+        env['PORTFOLIO_SNAPSHOT_PATH'] = str(snapshot / portfolio.nome)
+        env['PROPERTY_INDEX_PATH'] = str(index.with_name(f"{portfolio.nome}_{index.name}"))
+        env['IFRS_REPORTS_PATH'] = str(Path(os.getenv('IFRS_REPORTS_PATH', './reports/ifrs'))
+                                       / portfolio.nome)
+        vault = Path(os.getenv('OBSIDIAN_VAULT_PATH', './obsidian/vault_backup'))
+        env['OBSIDIAN_VAULT_PATH'] = str(vault / portfolio.nome)
+    env.update(portfolio.env)
+    return env
+
+
+# ============================================
+# Pools de conexão por portfólio
+# ============================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(portfolio, maxconn=POOL_MAX_SIZE):
+    """Pool (ThreadedConnectionPool) do portfólio, criado no primeiro uso."""
+    from psycopg2.pool import ThreadedConnectionPool
+
+    with _pools_lock:
+        pool = _pools.get(portfolio.nome)
+        if pool is None:
+            pool = ThreadedConnectionPool(1, maxconn, **portfolio.connect_kwargs())
+            _pools[portfolio.nome] = pool
+        return pool
+
+
+@contextmanager
+def connection(portfolio):
+    """Conexão emprestada do pool do portfólio; volta ao pool sem transação aberta."""
+    pool = get_pool(portfolio)
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        pool.putconn(conn)
+
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+def fan_out(portfolios, func, workers=None):
+    """
+    Executa func(portfolio, conn) em paralelo (uma thread por portfólio, até
+    `workers`), cada chamada com uma conexão do pool do seu portfólio.
+    Retorna {nome: resultado}; a exceção de um portfólio é devolvida no lugar
+    do resultado, sem interromper os demais.
+    """
+    def run(portfolio):
+        try:
+            with connection(portfolio) as conn:
+                return func(portfolio, conn)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers or len(portfolios) or 1) as pool:
+        results = list(pool.map(run, portfolios))
+    return {portfolio.nome: result for portfolio, result in zip(portfolios, results)}
+
+
+# ============================================
+# CLI
+# ============================================
+
+def check_portfolio(portfolio, conn):
+    """Propriedades e última sincronização concluída do portfólio."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT (SELECT count(*) FROM propriedades),
+                   (SELECT max(concluido_em) FROM sincronizacoes WHERE status = 'concluido')
+        """)
+        return cursor.fetchone()
+
+
+def list_portfolios(portfolios):
+    results = fan_out(portfolios, check_portfolio)
+    print(f"{'portfólio':<20} {'destino':<40} {'propriedades':>12}  última sincronização")
+    for portfolio in portfolios:
+        result = results[portfolio.nome]
+        if isinstance(result, Exception):
+            status = f"❌ {str(result).strip().splitlines()[0]}"
+        else:
+            count, last = result
+            status = f"{count:>12,}  {last:%Y-%m-%d %H:%M}" if last else f"{count:>12,}  -"
+        print(f"{portfolio.nome:<20} {portfolio.describe():<40} {status}")
+
+
+def ensure_schema(portfolio):
+    """Cria o schema de um portfólio em schema (antes de init-db)."""
+    import psycopg2
+    from psycopg2 import sql
+
+    if not portfolio.schema_:
+        return
+    kwargs = {k: v for k, v in portfolio.connect_kwargs().items() if k != 'options'}
+    conn = psycopg2.connect(**kwargs)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(
+                sql.Identifier(portfolio.schema_)))
+    finally:
+        conn.close()
+
+
+def run_command(portfolio, command):
+    """Roda `bni <comando>` no ambiente do portfólio. Retorna (código, saída, segundos)."""
+    if command[0] == 'init-db':
+        ensure_schema(portfolio)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, str(SCRIPT_DIR / 'bni.py'), *command],
+        env={**os.environ, **portfolio_env(portfolio)},
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    return completed.returncode, completed.stdout, time.perf_counter() - start
+
+
+def execute_everywhere(portfolios, command, workers=1):
+    """Roda o comando em cada portfólio; a saída de cada um é mostrada com prefixo."""
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(p, pool.submit(run_command, p, command)) for p in portfolios]
+        for portfolio, future in futures:
+            returncode, output, seconds = future.result()
+            for line in output.rstrip().splitlines():
+                print(f"[{portfolio.nome}] {line}")
+            icon = '✅' if returncode == 0 else '❌'
+            print(f"{icon} {portfolio.nome}: código {returncode} em {seconds:.1f}s")
+            print("-" * 50)
+            if returncode != 0:
+                failed.append(portfolio.nome)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Registro de portfólios e execução por portfólio')
+    subparsers = parser.add_subparsers(dest='acao', required=True)
+
+    listar = subparsers.add_parser('listar',
+                                   help='Lista os portfólios e testa a conexão de cada um')
+    listar.add_argument('--portfolio', nargs='+', default=None, metavar='NOME')
+
+    executar = subparsers.add_parser(
+        'executar', help='Roda um comando da CLI em cada portfólio',
+        usage='bni portfolios executar [--portfolio NOME ...] [--paralelo N] '
+              '-- <comando> [argumentos]'
+    )
+    executar.add_argument('--portfolio', nargs='+', default=None, metavar='NOME',
+                          help='Portfólios (padrão: todos do registro)')
+    executar.add_argument('--paralelo', type=int, default=1,
+                          help='Portfólios executados ao mesmo tempo')
+    executar.add_argument('comando', nargs=argparse.REMAINDER,
+                          help='Comando da CLI e seus argumentos, após --')
+    args = parser.parse_args()
+
+    portfolios = select_portfolios(args.portfolio)
+
+    if args.acao == 'listar':
+        try:
+            list_portfolios(portfolios)
+        finally:
+            close_pools()
+        return
+
+    command = args.comando[1:] if args.comando[:1] == ['--'] else args.comando
+    if not command:
+        executar.error("informe o comando após -- (ex.: -- relatorios --format xlsx)")
+    print(f"🏢 {' '.join(command)} em {len(portfolios)} portfólio(s)")
+    print("-" * 50)
+    failed = execute_everywhere(portfolios, command, max(1, args.paralelo))
+    if failed:
+        print(f"❌ Falhou em: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ Concluído em todos os portfólios")
+
+
+if __name__ == '__main__':
+    main()
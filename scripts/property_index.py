@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Índice compacto de propriedades em memória, compartilhado entre scripts.
+
+As colunas ficam em arrays numpy: textos como bytes UTF-8 concatenados mais
+offsets int32 (o layout de uma coluna string do Arrow), tipo_estoque e
+status como códigos uint8 e valor_avaliacao em centavos int64 (money.py).
+Para as buscas há hashes ordenados de codigo e codigo_cc (código -> linha
+por busca binária, com conferência do texto) e os valores ordenados para
+consultas por faixa de valor_avaliacao.
+
+O índice é construído uma vez a partir do PostgreSQL ou de Parquet e gravado
+como snapshot: um único arquivo (cabeçalho JSON + arrays alinhados) aberto
+com mmap e lido sem cópia, em milissegundos, por qualquer script.
+
+Memória por propriedade: 62 bytes fixos (id 4, 3 offsets de texto 12,
+códigos de tipo_estoque/status 2, valor 8, hash+linha de codigo e de
+codigo_cc 24, valor ordenado+linha 12) mais os bytes UTF-8 de codigo,
+codigo_cc e nome. Ver benchmark_property_index.py para a comparação com um
+DataFrame.
+"""
+
+import os
+import sys
+import argparse
+import json
+import mmap
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
+
+MAGIC = b'BNIIDX01'
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+TEXT_COLUMNS = ['codigo', 'codigo_cc', 'nome']
+CATEGORY_COLUMNS = ['tipo_estoque', 'status']
+KEY_COLUMNS = ['codigo', 'codigo_cc']
+SOURCE_COLUMNS = ['id', 'codigo', 'codigo_cc', 'nome', 'tipo_estoque', 'status', 'valor_avaliacao']
+
+# valor_avaliacao ausente (np.iinfo(np.int64).min, sem importar numpy aqui)
+MISSING_CENTS = -2**63
+
+
+def default_index_path():
+    """Caminho do snapshot (PROPERTY_INDEX_PATH)."""
+    return Path(os.getenv('PROPERTY_INDEX_PATH', './data/index/propriedades.idx'))
+
+
+def hash_strings(values):
+    """Hash de 64 bits (SipHash do pandas, chave fixa) de cada texto."""
+    import numpy as np
+    import pandas as pd
+
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+
+def encode_strings(values):
+    """Textos -> (offsets int32, bytes UTF-8 uint8)."""
+    import numpy as np
+    import pyarrow as pa
+
+    array = pa.array(np.asarray(values, dtype=object), type=pa.string())
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int32, count=len(array) + 1)
+    data = (np.frombuffer(data, dtype=np.uint8, count=int(offsets[-1])) if data
+            else np.zeros(0, np.uint8))
+    return offsets - offsets[0], data
+
+
+def decode_strings(offsets, data):
+    """(offsets, bytes) -> pyarrow StringArray, sem copiar os bytes."""
+    import pyarrow as pa
+
+    return pa.StringArray.from_buffers(
+        len(offsets) - 1, pa.py_buffer(offsets), pa.py_buffer(data)
+    )
+
+
+class PropertyIndex:
+    """Colunas em arrays, buscas por código e por faixa de valor."""
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self._texts = {}
+
+    def __len__(self):
+        return len(self.arrays['id'])
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados pelos arrays (o mesmo que o snapshot, sem cabeçalho)."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    # Construção -----------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, df, origem='dataframe'):
+        """
+        Constrói o índice a partir de um DataFrame no layout do banco (colunas
+        de SOURCE_COLUMNS; sem `id`, as linhas recebem id 0).
+        """
+        import numpy as np
+        import pandas as pd
+        from money import parse_cents
+
+        codigo = df['codigo'].astype(str).reset_index(drop=True)
+        codigo_cc = df.get('codigo_cc', pd.Series(index=df.index, dtype=object))
+        codigo_cc = codigo_cc.reset_index(drop=True).fillna(codigo).astype(str)
+        texts = {
+            'codigo': codigo,
+            'codigo_cc': codigo_cc,
+            'nome': df.get('nome', pd.Series('', index=df.index)).fillna('').astype(str),
+        }
+
+        arrays = {}
+        ids = df['id'] if 'id' in df.columns else pd.Series(0, index=df.index)
+        arrays['id'] = ids.fillna(0).to_numpy(dtype=np.int32)
+        for column in TEXT_COLUMNS:
+            arrays[f'{column}_offsets'], arrays[f'{column}_bytes'] = encode_strings(texts[column])
+
+        categories = {}
+        for column in CATEGORY_COLUMNS:
+            values = (df.get(column, pd.Series(index=df.index, dtype=object))
+                      .fillna('N/D').astype(str))
+            categorical = pd.Categorical(values)
+            if len(categorical.categories) > 255:
+                raise ValueError(f"Mais de 255 valores distintos em {column}")
+            categories[column] = [str(c) for c in categorical.categories]
+            arrays[f'{column}_codigos'] = categorical.codes.astype(np.uint8)
+
+        cents = parse_cents(df['valor_avaliacao']) if 'valor_avaliacao' in df.columns \
+            else pd.Series(pd.NA, index=df.index, dtype='Int64')
+        valor = cents.to_numpy(dtype=np.int64, na_value=MISSING_CENTS)
+        arrays['valor_centavos'] = valor
+
+        for column in KEY_COLUMNS:
+            hashes = hash_strings(texts[column])
+            order = np.argsort(hashes, kind='stable')
+            arrays[f'{column}_hash'] = hashes[order]
+            arrays[f'{column}_linhas'] = order.astype(np.int32)
+
+        present = np.flatnonzero(valor != MISSING_CENTS)
+        order = present[np.argsort(valor[present], kind='stable')]
+        arrays['valor_ordenado'] = valor[order]
+        arrays['valor_linhas'] = order.astype(np.int32)
+
+        meta = {
+            'versao': FORMAT_VERSION,
+            'origem': origem,
+            'criado_em': datetime.now().isoformat(timespec='seconds'),
+            'linhas': len(df),
+            'categorias': categories,
+        }
+        return cls(arrays, meta)
+
+    @classmethod
+    def from_postgres(cls, conn):
+        """Constrói o índice com uma única consulta à tabela propriedades."""
+        import pandas as pd
+
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(SOURCE_COLUMNS)} FROM propriedades ORDER BY id")
+            df = pd.DataFrame(cursor.fetchall(), columns=SOURCE_COLUMNS)
+        return cls.from_frame(df, origem='postgres')
+
+    @classmethod
+    def from_parquet(cls, paths):
+        """
+        Constrói o índice a partir de arquivos Parquet no layout do banco
+        (export_dados.py) ou do CSV bruto (dataset do Hugging Face).
+        """
+        import pandas as pd
+        from import_propriedades import prepare_frame
+
+        frames = []
+        for path in paths:
+            df = pd.read_parquet(path)
+            if 'codigo' not in df.columns:
+                df = prepare_frame(df)
+            frames.append(df.reindex(columns=SOURCE_COLUMNS))
+        return cls.from_frame(pd.concat(frames, ignore_index=True), origem='parquet')
+
+    # Snapshot -------------------------------------------------------------
+
+    def save(self, path=None):
+        """Grava o snapshot (arquivo temporário + rename: leitores nunca veem meio arquivo)."""
+        import numpy as np
+
+        path = Path(path or default_index_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        layout, offset = {}, 0
+        for name, array in self.arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout[name] = [array.dtype.str, len(array), offset]
+            offset += array.nbytes
+        header = json.dumps({**self.meta, 'arrays': layout}).encode('utf-8')
+        data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+            for name, array in self.arrays.items():
+                f.seek(data_start + layout[name][2])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        """Abre o snapshot com mmap; os arrays apontam para o arquivo, sem cópia."""
+        import numpy as np
+
+        path = Path(path or default_index_path())
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} não é um snapshot do índice de propriedades")
+        (header_size,) = struct.unpack_from('<Q', buffer, len(MAGIC))
+        meta = json.loads(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_size])
+        if meta.get('versao') != FORMAT_VERSION:
+            raise ValueError(f"Versão do snapshot não suportada: {meta.get('versao')}")
+        data_start = -(-(len(MAGIC) + 8 + header_size) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {
+            name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count,
+                                offset=data_start + offset)
+            for name, (dtype, count, offset) in meta.pop('arrays').items()
+        }
+        return cls(arrays, meta)
+
+    # Consultas ------------------------------------------------------------
+
+    def texts(self, column):
+        """Coluna de texto inteira como pyarrow StringArray (sem cópia)."""
+        if column not in self._texts:
+            self._texts[column] = decode_strings(self.arrays[f'{column}_offsets'],
+                                                 self.arrays[f'{column}_bytes'])
+        return self._texts[column]
+
+    def text(self, column, row):
+        """Texto de uma linha."""
+        offsets = self.arrays[f'{column}_offsets']
+        data = self.arrays[f'{column}_bytes'][offsets[row]:offsets[row + 1]]
+        return data.tobytes().decode('utf-8')
+
+    def rows(self, keys, column='codigo'):
+        """
+        Linhas dos códigos informados (codigo ou codigo_cc), -1 para os que
+        não existem. Vetorizado: hash, busca binária e conferência do texto.
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        keys = np.asarray(keys, dtype=object)
+        sorted_hashes = self.arrays[f'{column}_hash']
+        if len(sorted_hashes) == 0 or len(keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+
+        hashes = hash_strings(keys)
+        positions = np.minimum(np.searchsorted(sorted_hashes, hashes), len(sorted_hashes) - 1)
+        result = np.where(sorted_hashes[positions] == hashes,
+                          self.arrays[f'{column}_linhas'][positions], -1).astype(np.int64)
+
+        found = np.flatnonzero(result >= 0)
+        if len(found):
+            stored = self.texts(column).take(pa.array(result[found]))
+            same = pc.equal(stored, pa.array(keys[found], type=pa.string()))
+            for i in found[~same.to_numpy(zero_copy_only=False)]:
+                result[i] = self._resolve_collision(column, keys[i], hashes[i])
+        return result
+
+    def _resolve_collision(self, column, key, key_hash):
+        """Percorre as linhas com o mesmo hash (colisão de 64 bits, rara)."""
+        import numpy as np
+
+        sorted_hashes = self.arrays[f'{column}_hash']
+        start = np.searchsorted(sorted_hashes, key_hash, side='left')
+        end = np.searchsorted(sorted_hashes, key_hash, side='right')
+        for row in self.arrays[f'{column}_linhas'][start:end]:
+            if self.text(column, row) == key:
+                return int(row)
+        return -1
+
+    def row(self, codigo, column='codigo'):
+        """Linha de um código, ou None."""
+        row = int(self.rows([str(codigo)], column)[0])
+        return None if row < 0 else row
+
+    def value_range(self, minimo=None, maximo=None):
+        """Linhas com valor_avaliacao em [minimo, maximo] (R$), em ordem crescente de valor."""
+        import numpy as np
+        from money import to_cents
+
+        ordered = self.arrays['valor_ordenado']
+        start = 0 if minimo is None else np.searchsorted(ordered, to_cents(minimo), side='left')
+        end = (len(ordered) if maximo is None
+               else np.searchsorted(ordered, to_cents(maximo), side='right'))
+        return self.arrays['valor_linhas'][start:end]
+
+    def record(self, row):
+        """Uma propriedade como dicionário (valor_avaliacao em Decimal)."""
+        from money import cents_to_decimal
+        from export_to_obsidian import note_filename
+
+        cents = int(self.arrays['valor_centavos'][row])
+        record = {'id': int(self.arrays['id'][row])}
+        record.update({column: self.text(column, row) for column in TEXT_COLUMNS})
+        record['arquivo'] = note_filename(record['codigo'])[:-len('.md')]
+        for column in CATEGORY_COLUMNS:
+            record[column] = self.meta['categorias'][column][self.arrays[f'{column}_codigos'][row]]
+        record['valor_avaliacao'] = None if cents == MISSING_CENTS else cents_to_decimal(cents)
+        return record
+
+    def to_frame(self, rows=None):
+        """
+        DataFrame com as colunas do índice (valor_avaliacao em R$, float) e o
+        nome do arquivo da nota no Obsidian (`arquivo`).
+        """
+        import numpy as np
+        import pandas as pd
+        import pyarrow as pa
+        from export_to_obsidian import note_filenames
+
+        take = None if rows is None else pa.array(np.asarray(rows, dtype=np.int64))
+        data = {'id': self.arrays['id'] if take is None else self.arrays['id'][rows]}
+        for column in TEXT_COLUMNS:
+            values = self.texts(column) if take is None else self.texts(column).take(take)
+            data[column] = values.to_pandas(types_mapper=pd.ArrowDtype)
+        for column in CATEGORY_COLUMNS:
+            codes = self.arrays[f'{column}_codigos']
+            data[column] = pd.Categorical.from_codes(
+                codes if take is None else codes[rows], self.meta['categorias'][column]
+            )
+        cents = self.arrays['valor_centavos']
+        if take is not None:
+            cents = cents[rows]
+        data['valor_avaliacao'] = np.where(cents == MISSING_CENTS, np.nan, cents / 100)
+        data['arquivo'] = note_filenames(data['codigo'])
+        return pd.DataFrame(data)
+
+
+def load_index(path=None):
+    """Snapshot do índice, ou None se ainda não foi construído."""
+    path = Path(path or default_index_path())
+    return PropertyIndex.load(path) if path.exists() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Índice compacto de propriedades (snapshot mmap)')
+    parser.add_argument('--indice', type=str, default=None,
+                        help='Caminho do snapshot (padrão: PROPERTY_INDEX_PATH)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    construir = subparsers.add_parser('construir', help='Constrói e grava o snapshot')
+    construir.add_argument('--parquet', type=str, nargs='+', default=None,
+                           help='Arquivos Parquet de origem (padrão: PostgreSQL)')
+    subparsers.add_parser('info', help='Resumo do snapshot')
+    buscar = subparsers.add_parser('buscar', help='Busca por codigo ou codigo_cc')
+    buscar.add_argument('codigo', type=str, nargs='+')
+    faixa = subparsers.add_parser('faixa', help='Propriedades por faixa de valor_avaliacao')
+    faixa.add_argument('--min', type=str, default=None, help='Valor mínimo (R$)')
+    faixa.add_argument('--max', type=str, default=None, help='Valor máximo (R$)')
+    faixa.add_argument('--limite', type=int, default=20, help='Máximo de linhas exibidas')
+
+    args = parser.parse_args()
+    path = Path(args.indice) if args.indice else default_index_path()
+
+    if args.comando == 'construir':
+        start = time.perf_counter()
+        if args.parquet:
+            index = PropertyIndex.from_parquet(args.parquet)
+        else:
+            from import_propriedades import get_db_connection
+
+            conn = get_db_connection()
+            try:
+                index = PropertyIndex.from_postgres(conn)
+            finally:
+                conn.close()
+        index.save(path)
+        print(f"✅ Índice de {len(index):,} propriedades gravado em {path} "
+              f"({index.nbytes / 1024:,.0f} KiB, {time.perf_counter() - start:.2f}s)")
+        return
+
+    if not path.exists():
+        print(f"❌ Snapshot não encontrado: {path} (use 'construir')")
+        sys.exit(1)
+    start = time.perf_counter()
+    index = PropertyIndex.load(path)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.comando == 'info':
+        print(f"🗂️  {path}: {len(index):,} propriedades, origem {index.meta['origem']}, "
+              f"criado em {index.meta['criado_em']}")
+        print(f"   {index.nbytes / 1024:,.0f} KiB "
+              f"({index.nbytes / max(len(index), 1):.0f} bytes/propriedade), "
+              f"carregado em {elapsed_ms:.1f} ms")
+    elif args.comando == 'buscar':
+        for codigo in args.codigo:
+            row = index.row(codigo)
+            if row is None:
+                row = index.row(codigo, 'codigo_cc')
+            print(f"  {codigo}: {index.record(row) if row is not None else 'não encontrado'}")
+    elif args.comando == 'faixa':
+        rows = index.value_range(args.min, args.max)
+        print(f"🔎 {len(rows):,} propriedades na faixa")
+        for record in index.to_frame(rows[:args.limite]).itertuples(index=False):
+            print(f"  {record.codigo:<12} {record.nome[:40]:<40} "
+                  f"R$ {record.valor_avaliacao:>16,.2f}")
+
+
+if __name__ == '__main__':
+    main()
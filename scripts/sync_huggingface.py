@@ -7,12 +7,18 @@ Faz upload dos dados processados para o dataset público no Hugging Face.
 import os
 import sys
 import argparse
+import io
+import hashlib
+import shutil
 from pathlib import Path
+from datetime import datetime
 from dotenv import load_dotenv
-from huggingface_hub import HfApi, login
-from datasets import Dataset, DatasetDict
-import pandas as pd
 import json
+import re
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,6 +28,8 @@ load_dotenv()
 
 def load_data_from_directory(data_dir):
     """Carrega dados CSV do diretório especificado."""
+    import pandas as pd
+
     data_path = Path(data_dir)
     data_files = {}
 
@@ -54,6 +62,8 @@ def load_data_from_directory(data_dir):
 
 def create_dataset_from_data(data_dict):
     """Cria um Dataset do Hugging Face a partir dos dados."""
+    from datasets import Dataset, DatasetDict
+
     if not data_dict:
         return None
 
@@ -70,8 +80,142 @@ def create_dataset_from_data(data_dict):
     return DatasetDict(dataset_dict)
 
 
+# ============================================
+# Caminho Arrow nativo (sem pandas)
+# ============================================
+
+ARROW_CACHE_DIRNAME = '.arrow_cache'
+CSV_NULL_VALUES = ['', 'N/A', 'NA', 'null']
+
+
+def json_type_to_arrow(spec):
+    """Converte o tipo de uma propriedade JSON Schema em tipo Arrow."""
+    import pyarrow as pa
+
+    json_type = spec.get('type')
+    types = set(json_type) if isinstance(json_type, list) else {json_type}
+    types.discard('null')
+
+    if types == {'integer'}:
+        return pa.int64()
+    if types <= {'number', 'integer'} and types:
+        return pa.float64()
+    if types == {'boolean'}:
+        return pa.bool_()
+    return pa.string()
+
+
+def load_arrow_schema(schemas_dir, name):
+    """Carrega os tipos Arrow de uma tabela a partir de `<name>_schema.json`."""
+    schema_path = Path(schemas_dir) / f"{name}_schema.json"
+    if not schema_path.exists():
+        return {}
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    return {
+        column: json_type_to_arrow(spec)
+        for column, spec in schema.get('properties', {}).items()
+    }
+
+
+def read_arrow_table(file_path, column_types=None):
+    """Lê um CSV ou Parquet diretamente para um pyarrow.Table."""
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    file_path = Path(file_path)
+    if file_path.suffix == '.parquet':
+        return pq.read_table(file_path, memory_map=True)
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types or {},
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=False,
+    )
+    return pa_csv.read_csv(file_path, convert_options=convert_options)
+
+
+def arrow_cache_key(file_path, column_types):
+    """Chave do cache: caminho, tamanho, mtime e tipos do schema."""
+    stat = Path(file_path).stat()
+    digest = hashlib.sha256()
+    digest.update(f"{Path(file_path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+    digest.update(repr(sorted((k, str(v)) for k, v in column_types.items())).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def write_arrow_cache(table, cache_path):
+    """Grava a tabela no formato Arrow IPC stream (lido via memory-map pelo datasets)."""
+    import pyarrow as pa
+
+    tmp_path = cache_path.with_suffix('.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp_path.replace(cache_path)
+
+
+def load_arrow_datasets_from_directory(data_dir, schemas_dir, cache_dir=None):
+    """
+    Carrega CSV/Parquet do diretório como datasets Arrow, sem passar por pandas.
+
+    Os tipos das colunas vêm dos schemas JSON em `schemas_dir`. Cada tabela é
+    gravada uma vez em cache Arrow IPC e aberta com memory-map por
+    `Dataset.from_file`, de modo que execuções seguintes não relêem o CSV
+    nem copiam os dados para o heap do Python.
+    """
+    from datasets import Dataset
+
+    data_path = Path(data_dir)
+    if not data_path.exists():
+        print(f"⚠️  Diretório {data_path} não encontrado.")
+        return None
+
+    files = sorted(list(data_path.glob("*.csv")) + list(data_path.glob("*.parquet")))
+    if not files:
+        print(f"⚠️  Nenhum arquivo CSV/Parquet encontrado em {data_path}")
+        return None
+
+    cache_path = Path(cache_dir) if cache_dir else data_path / ARROW_CACHE_DIRNAME
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    print(f"📁 Encontrados {len(files)} arquivo(s) (modo Arrow)")
+
+    datasets = {}
+    for file_path in files:
+        name = file_path.stem
+        try:
+            column_types = load_arrow_schema(schemas_dir, name)
+            cache_file = cache_path / f"{name}-{arrow_cache_key(file_path, column_types)}.arrow"
+
+            if not cache_file.exists():
+                for stale in cache_path.glob(f"{name}-*.arrow"):
+                    stale.unlink()
+                write_arrow_cache(read_arrow_table(file_path, column_types), cache_file)
+
+            datasets[name] = Dataset.from_file(str(cache_file))
+            print(f"  ✓ {name}: {datasets[name].num_rows} registros")
+        except Exception as e:
+            print(f"  ❌ Erro ao carregar {file_path}: {e}")
+
+    return datasets
+
+
+def create_dataset_from_arrow(datasets):
+    """Agrupa datasets Arrow já carregados em Dataset/DatasetDict."""
+    from datasets import DatasetDict
+
+    if not datasets:
+        return None
+    if len(datasets) == 1:
+        return next(iter(datasets.values()))
+    return DatasetDict(datasets)
+
+
 def push_to_huggingface(dataset, dataset_name, token, push_mode="auto"):
     """Faz upload do dataset para o Hugging Face."""
+    from huggingface_hub import login
+
     try:
         # Faz login
         if token:
@@ -96,10 +240,1016 @@ def push_to_huggingface(dataset, dataset_name, token, push_mode="auto"):
         return False
 
 
+# ============================================
+# Sincronização incremental (delta) por shards
+# ============================================
+
+SHARD_ROWS = 10000
+MANIFEST_FILENAME = '.hf_manifest.json'
+SHARD_KEY_CANDIDATES = ('id', 'ID', 'codigo', 'CODIGO_CC')
+
+
+def find_shard_key(df):
+    """Retorna a coluna usada como chave de particionamento dos shards."""
+    for column in SHARD_KEY_CANDIDATES:
+        if column in df.columns:
+            return column
+    return None
+
+
+def shard_dataframe(df, shard_rows=SHARD_ROWS, partition_column=None):
+    """
+    Divide um DataFrame em shards determinísticos.
+
+    A atribuição de cada linha ao shard depende apenas do seu valor de chave,
+    de modo que alterar uma linha afeta somente o shard que a contém:
+    - partition_column: um shard por valor distinto da coluna;
+    - chave numérica: faixas fixas de `shard_rows` valores de chave;
+    - outra chave: bucket estável pelo hash da chave (o número de buckets só
+      muda quando o volume cruza um múltiplo de `shard_rows`).
+
+    Retorna um dict {nome_do_shard: DataFrame} ordenado pela chave.
+    """
+    import pandas as pd
+
+    if partition_column:
+        if partition_column not in df.columns:
+            raise ValueError(f"Coluna de partição '{partition_column}' não encontrada")
+        labels = df[partition_column].astype(str).str.replace(r'[^\w\-]', '_', regex=True)
+        key = partition_column
+    else:
+        key = find_shard_key(df)
+        if key is None:
+            labels = pd.Series(0, index=df.index)
+        elif pd.api.types.is_integer_dtype(df[key]):
+            labels = df[key] // shard_rows
+        else:
+            n_buckets = max(1, -(-len(df) // shard_rows))
+            hashes = pd.util.hash_pandas_object(df[key].astype(str), index=False)
+            labels = hashes % n_buckets
+
+    shards = {}
+    for label, shard in df.groupby(labels, sort=True):
+        if key is not None:
+            shard = shard.sort_values(key, kind='mergesort')
+        name = f"part-{label}" if partition_column else f"shard-{int(label):05d}"
+        shards[name] = shard.reset_index(drop=True)
+
+    return shards
+
+
+def hash_shard(df):
+    """Calcula um hash SHA-256 do conteúdo do shard (independente do writer Parquet)."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def shard_to_parquet_bytes(df):
+    """Serializa um shard em Parquet na memória."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def load_manifest(manifest_path):
+    """Carrega o manifesto local de hashes dos shards já enviados."""
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return {'dataset': None, 'shards': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path):
+    """Persiste o manifesto de shards de forma atômica."""
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(manifest_path)
+
+
+def build_shard_plan(data_dict, manifest, shard_rows=SHARD_ROWS, partition_column=None):
+    """
+    Compara os shards locais com o manifesto.
+
+    Retorna (uploads, deletes, new_hashes) onde uploads é uma lista de
+    (path_in_repo, DataFrame) com os shards novos ou alterados e deletes a
+    lista de caminhos que existiam no manifesto mas não existem mais.
+    """
+    previous = manifest.get('shards', {})
+    new_hashes = {}
+    uploads = []
+
+    for table, df in data_dict.items():
+        for shard_name, shard in shard_dataframe(df, shard_rows, partition_column).items():
+            path_in_repo = f"data/{table}/{shard_name}.parquet"
+            shard_hash = hash_shard(shard)
+            new_hashes[path_in_repo] = shard_hash
+            if previous.get(path_in_repo) != shard_hash:
+                uploads.append((path_in_repo, shard))
+
+    deletes = sorted(set(previous) - set(new_hashes))
+    return uploads, deletes, new_hashes
+
+
+class LocalHubDirectory:
+    """
+    Substituto local do HfApi baseado em diretório.
+
+    Implementa o subconjunto de `create_commit` usado pela sincronização delta,
+    permitindo testar o fluxo completo sem acesso ao Hugging Face.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = Path(root_dir)
+
+    def create_repo(self, repo_id, repo_type='dataset', private=False, exist_ok=True, token=None):
+        (self.root_dir / repo_id).mkdir(parents=True, exist_ok=True)
+
+    def create_commit(self, repo_id, operations, commit_message, repo_type='dataset', token=None):
+        from huggingface_hub import CommitOperationDelete
+
+        repo_path = self.root_dir / repo_id
+        for operation in operations:
+            target = repo_path / operation.path_in_repo
+            if isinstance(operation, CommitOperationDelete):
+                target.unlink(missing_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            content = operation.path_or_fileobj
+            if isinstance(content, bytes):
+                target.write_bytes(content)
+            elif isinstance(content, (str, Path)):
+                shutil.copyfile(content, target)
+            else:
+                target.write_bytes(content.read())
+
+        log_path = repo_path / '.commits.log'
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(f"{datetime.now().isoformat()} {commit_message} "
+                    f"({len(operations)} operações)\n")
+
+    def preupload_lfs_files(self, repo_id, additions, repo_type='dataset', token=None):
+        staging = self.root_dir / repo_id / '.staging'
+        staging.mkdir(parents=True, exist_ok=True)
+        for operation in additions:
+            content = operation.path_or_fileobj
+            if isinstance(content, bytes):
+                blob = staging / hashlib.sha256(content).hexdigest()
+                blob.write_bytes(content)
+                operation.path_or_fileobj = str(blob)
+
+    def list_repo_files(self, repo_id, repo_type='dataset', revision=None, token=None):
+        repo_path = self.root_dir / repo_id
+        return sorted(
+            str(path.relative_to(repo_path)) for path in repo_path.rglob('*')
+            if path.is_file() and not path.name.startswith('.')
+        )
+
+    def hf_hub_download(self, repo_id, filename, repo_type='dataset', revision=None, token=None):
+        path = self.root_dir / repo_id / filename
+        if not path.exists():
+            raise FileNotFoundError(f"{filename} não encontrado em {repo_id}")
+        return str(path)
+
+
+# Arquivos gravados por push_to_hub (data/train-00000-of-00001.parquet)
+LEGACY_SHARD_PATTERN = re.compile(r'^data/[\w\-]+?-\d{5}-of-\d{5}\.parquet$')
+
+
+def split_front_matter(text):
+    """Separa o cabeçalho YAML (dict) do corpo de um README do Hugging Face."""
+    import yaml
+
+    match = re.match(r'^---\n(.*?)\n---\n?(.*)$', text, re.DOTALL)
+    if not match:
+        return {}, text
+    return yaml.safe_load(match.group(1)) or {}, match.group(2)
+
+
+def layout_operations(api, dataset_name, tables):
+    """
+    Operações que deixam o repositório só com o layout dos shards delta.
+
+    Remove os arquivos do layout de push_to_hub, que os loaders leriam junto
+    com data/<tabela>/*.parquet (linhas em dobro), e aponta os `configs` do
+    dataset card para os shards de cada tabela. Retorna [] quando o
+    repositório já está no layout delta.
+    """
+    from huggingface_hub import CommitOperationAdd, CommitOperationDelete
+    import yaml
+
+    files = api.list_repo_files(dataset_name, repo_type='dataset')
+    operations = [CommitOperationDelete(path_in_repo=path)
+                  for path in files if LEGACY_SHARD_PATTERN.match(path)]
+
+    readme = ''
+    if 'README.md' in files:
+        readme_path = api.hf_hub_download(dataset_name, 'README.md', repo_type='dataset')
+        readme = Path(readme_path).read_text(encoding='utf-8')
+    header, body = split_front_matter(readme)
+    configs = [{
+        'config_name': 'default',
+        'data_files': [{'split': table, 'path': f'data/{table}/*.parquet'}
+                       for table in sorted(tables)],
+    }]
+    if header.get('configs') != configs:
+        header['configs'] = configs
+        # Contagens de push_to_hub, que não valem mais para os shards
+        header.pop('dataset_info', None)
+        card = f"---\n{yaml.safe_dump(header, allow_unicode=True, sort_keys=False)}---\n{body}"
+        operations.append(CommitOperationAdd(path_in_repo='README.md',
+                                             path_or_fileobj=card.encode('utf-8')))
+    return operations
+
+
+def push_delta_to_huggingface(data_dict, dataset_name, token, manifest_path,
+                              api=None, shard_rows=SHARD_ROWS, partition_column=None):
+    """
+    Envia ao Hugging Face apenas os shards Parquet alterados.
+
+    Os shards novos/alterados e as remoções são agrupados em um único commit.
+    O manifesto local só é atualizado após o commit ser aceito.
+    """
+    from huggingface_hub import HfApi, CommitOperationAdd, CommitOperationDelete
+
+    try:
+        api = api or HfApi(token=token)
+        manifest = load_manifest(manifest_path)
+        if manifest.get('dataset') not in (None, dataset_name):
+            print(f"⚠️  Manifesto pertence a {manifest['dataset']}, enviando todos os shards")
+            manifest = {'dataset': dataset_name, 'shards': {}}
+
+        uploads, deletes, new_hashes = build_shard_plan(
+            data_dict, manifest, shard_rows, partition_column
+        )
+        unchanged = len(new_hashes) - len(uploads)
+        print(f"🧩 Shards: {len(new_hashes)} total, {len(uploads)} alterado(s), "
+              f"{len(deletes)} removido(s), {unchanged} inalterado(s)")
+
+        api.create_repo(repo_id=dataset_name, repo_type='dataset', private=False, exist_ok=True)
+        layout = layout_operations(api, dataset_name, {p.split('/')[1] for p in new_hashes})
+        if layout:
+            print(f"🧹 Layout do repositório (dataset card, arquivos de push_to_hub): "
+                  f"{len(layout)} operação(ões)")
+
+        if not uploads and not deletes and not layout:
+            print("✅ Nenhuma alteração detectada, nada a enviar.")
+            return True
+
+        operations = [
+            CommitOperationAdd(path_in_repo=path, path_or_fileobj=shard_to_parquet_bytes(shard))
+            for path, shard in uploads
+        ]
+        operations += [CommitOperationDelete(path_in_repo=path) for path in deletes]
+        operations += layout
+
+        print(f"📤 Enviando {len(operations)} operação(ões) para {dataset_name}...")
+        api.create_commit(
+            repo_id=dataset_name,
+            repo_type='dataset',
+            operations=operations,
+            commit_message=f"Sincronização delta: {len(uploads)} shard(s) alterado(s), "
+                           f"{len(deletes)} removido(s)",
+        )
+
+        save_manifest({'dataset': dataset_name, 'shards': new_hashes}, manifest_path)
+        print(f"✅ Sincronização delta concluída para {dataset_name}!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro na sincronização delta: {e}")
+        return False
+
+
+# ============================================
+# Pipeline concorrente: conversão e upload sobrepostos
+# ============================================
+
+PIPELINE_WORKERS = 4
+PIPELINE_UPLOAD_WORKERS = 4
+PIPELINE_MAX_INFLIGHT_MB = 256
+PIPELINE_RETRIES = 3
+PIPELINE_BACKOFF_SECONDS = 1.0
+
+
+class ByteBudget:
+    """
+    Limita a quantidade de bytes convertidos aguardando upload.
+
+    Os workers de conversão bloqueiam em `acquire` quando o limite é
+    atingido, o que aplica contrapressão enquanto os uploads drenam a fila.
+    Um item maior que o limite só é admitido com a fila vazia.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, n_bytes):
+        with self._condition:
+            while self.in_flight and self.in_flight + n_bytes > self.max_bytes:
+                self._condition.wait()
+            self.in_flight += n_bytes
+
+    def release(self, n_bytes):
+        with self._condition:
+            self.in_flight -= n_bytes
+            self._condition.notify_all()
+
+
+def with_retries(func, retries=PIPELINE_RETRIES, backoff=PIPELINE_BACKOFF_SECONDS, label=''):
+    """Executa `func` com novas tentativas e backoff exponencial com jitter."""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * (2 ** attempt) * (1 + random.random())
+            print(f"  ⚠️  {label} falhou ({e}), nova tentativa em {delay:.1f}s "
+                  f"({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+
+def get_db_connection():
+    """Cria conexão com o banco de dados (None se indisponível)."""
+    import psycopg2
+
+    try:
+        return psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'bni_gestao'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', 'postgres')
+        )
+    except psycopg2.Error as e:
+        print(f"⚠️  Banco de dados indisponível, sincronização não será registrada: {e}")
+        return None
+
+
+def record_sync_start(conn, tipo_sincronizacao, metadata=None):
+    """
+    Registra o início de uma sincronização em `sincronizacoes`.
+
+    Quando executado por um worker da fila (scripts/job_queue.py), BNI_SYNC_ID
+    aponta para a linha do job, que é reaproveitada em vez de criar outra.
+    """
+    from psycopg2.extras import Json
+
+    if conn is None:
+        return None
+    job_id = os.getenv('BNI_SYNC_ID')
+    with conn.cursor() as cursor:
+        if job_id:
+            cursor.execute("""
+                UPDATE sincronizacoes
+                SET tipo_sincronizacao = %s, metadata = metadata || %s
+                WHERE id = %s
+                RETURNING id
+            """, (tipo_sincronizacao, Json(metadata or {}), int(job_id)))
+            row = cursor.fetchone()
+            if row:
+                conn.commit()
+                return row[0]
+        cursor.execute("""
+            INSERT INTO sincronizacoes (origem, tipo_sincronizacao, status, metadata)
+            VALUES ('huggingface', %s, 'processando', %s)
+            RETURNING id
+        """, (tipo_sincronizacao, Json(metadata or {})))
+        sync_id = cursor.fetchone()[0]
+    conn.commit()
+    return sync_id
+
+
+def record_sync_finish(conn, sync_id, status, processados=0, inseridos=0, atualizados=0,
+                       erros=0, mensagem_erro=None, metadata=None):
+    """Atualiza o registro da sincronização com o resultado final."""
+    from psycopg2.extras import Json
+
+    if conn is None or sync_id is None:
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            UPDATE sincronizacoes
+            SET status = %s,
+                registros_processados = %s,
+                registros_inseridos = %s,
+                registros_atualizados = %s,
+                registros_erro = %s,
+                mensagem_erro = %s,
+                metadata = metadata || %s,
+                concluido_em = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """, (status, processados, inseridos, atualizados, erros, mensagem_erro,
+              Json(metadata or {}), sync_id))
+    conn.commit()
+
+
+def run_sync_pipeline(data_dir, dataset_name, token, manifest_path, api=None,
+                      workers=PIPELINE_WORKERS, upload_workers=PIPELINE_UPLOAD_WORKERS,
+                      max_inflight_bytes=PIPELINE_MAX_INFLIGHT_MB * 1024 * 1024,
+                      retries=PIPELINE_RETRIES, shard_rows=SHARD_ROWS,
+                      partition_column=None, record=True):
+    """
+    Sincroniza o diretório com o Hugging Face em pipeline.
+
+    Um pool de workers lê e converte cada CSV em shards Parquet enquanto um
+    segundo pool faz o pre-upload (LFS) dos shards já prontos; carga e
+    upload se sobrepõem e os bytes em trânsito ficam limitados por
+    `max_inflight_bytes`. Apenas shards alterados em relação ao manifesto
+    são enviados, e todos entram em um único commit ao final. O resultado,
+    com tempos por arquivo, é registrado em `sincronizacoes`.
+    """
+    import pandas as pd
+    from huggingface_hub import HfApi, CommitOperationAdd, CommitOperationDelete
+
+    data_path = Path(data_dir)
+    csv_files = sorted(data_path.glob("*.csv")) if data_path.exists() else []
+    if not csv_files:
+        print(f"⚠️  Nenhum arquivo CSV encontrado em {data_path}")
+        return False
+
+    api = api or HfApi(token=token)
+    manifest = load_manifest(manifest_path)
+    previous = manifest.get('shards', {}) if manifest.get('dataset') in (None, dataset_name) else {}
+
+    conn = get_db_connection() if record else None
+    sync_id = record_sync_start(conn, 'push_pipeline', {
+        'dataset': dataset_name, 'arquivos': [f.name for f in csv_files],
+    }) if conn else None
+
+    budget = ByteBudget(max_inflight_bytes)
+    timings = {f.stem: {'linhas': 0, 'shards': 0, 'enviados': 0, 'bytes': 0,
+                        'carga_s': 0.0, 'conversao_s': 0.0, 'upload_s': 0.0}
+               for f in csv_files}
+    timings_lock = threading.Lock()
+    new_hashes = {}
+    operations = []
+    failed_files = {}
+    started = time.perf_counter()
+
+    print(f"🚀 Pipeline: {len(csv_files)} arquivo(s), {workers} worker(s) de conversão, "
+          f"{upload_workers} de upload, limite {max_inflight_bytes / 1024 / 1024:.0f} MB")
+
+    try:
+        with_retries(
+            lambda: api.create_repo(repo_id=dataset_name, repo_type='dataset',
+                                    private=False, exist_ok=True),
+            retries=retries, label='create_repo'
+        )
+    except Exception as e:
+        record_sync_finish(conn, sync_id, 'erro', mensagem_erro=str(e),
+                           metadata={'duracao_s': round(time.perf_counter() - started, 3)})
+        if conn is not None:
+            conn.close()
+        print(f"❌ Erro ao criar o repositório {dataset_name}: {e}")
+        return False
+
+    def upload(table, operation, n_bytes):
+        try:
+            t0 = time.perf_counter()
+            with_retries(
+                lambda: api.preupload_lfs_files(dataset_name, additions=[operation],
+                                                repo_type='dataset'),
+                retries=retries, label=operation.path_in_repo
+            )
+            with timings_lock:
+                timings[table]['upload_s'] += time.perf_counter() - t0
+                timings[table]['enviados'] += 1
+            return operation
+        finally:
+            budget.release(n_bytes)
+
+    def convert(csv_file, upload_pool):
+        table = csv_file.stem
+        t0 = time.perf_counter()
+        df = pd.read_csv(csv_file)
+        t1 = time.perf_counter()
+
+        uploads = []
+        for shard_name, shard in shard_dataframe(df, shard_rows, partition_column).items():
+            path_in_repo = f"data/{table}/{shard_name}.parquet"
+            shard_hash = hash_shard(shard)
+            with timings_lock:
+                new_hashes[path_in_repo] = shard_hash
+                timings[table]['shards'] += 1
+            if previous.get(path_in_repo) == shard_hash:
+                continue
+
+            content = shard_to_parquet_bytes(shard)
+            budget.acquire(len(content))
+            with timings_lock:
+                timings[table]['bytes'] += len(content)
+            operation = CommitOperationAdd(path_in_repo=path_in_repo, path_or_fileobj=content)
+            uploads.append(upload_pool.submit(upload, table, operation, len(content)))
+
+        with timings_lock:
+            timings[table]['linhas'] = len(df)
+            timings[table]['carga_s'] = t1 - t0
+            timings[table]['conversao_s'] = time.perf_counter() - t1
+        return uploads
+
+    with ThreadPoolExecutor(max_workers=upload_workers) as upload_pool, \
+            ThreadPoolExecutor(max_workers=workers) as convert_pool:
+        conversions = {convert_pool.submit(convert, f, upload_pool): f for f in csv_files}
+        upload_futures = {}
+        for future in as_completed(conversions):
+            csv_file = conversions[future]
+            try:
+                for upload_future in future.result():
+                    upload_futures[upload_future] = csv_file
+            except Exception as e:
+                failed_files[csv_file.stem] = f"conversão: {e}"
+                print(f"  ❌ Erro ao converter {csv_file.name}: {e}")
+
+        for future in as_completed(upload_futures):
+            csv_file = upload_futures[future]
+            try:
+                operations.append(future.result())
+            except Exception as e:
+                failed_files.setdefault(csv_file.stem, f"upload: {e}")
+                print(f"  ❌ Erro no upload de {csv_file.name}: {e}")
+
+    for table, timing in timings.items():
+        status = '❌' if table in failed_files else '✓'
+        print(f"  {status} {table}: {timing['linhas']} registros, "
+              f"{timing['enviados']}/{timing['shards']} shard(s) enviados, "
+              f"carga {timing['carga_s']:.2f}s, conversão {timing['conversao_s']:.2f}s, "
+              f"upload {timing['upload_s']:.2f}s")
+
+    processed = sum(t['linhas'] for name, t in timings.items() if name not in failed_files)
+    errors = sum(t['linhas'] for name, t in timings.items() if name in failed_files)
+    summary = {
+        'arquivos': {name: {k: round(v, 3) if isinstance(v, float) else v
+                            for k, v in timing.items()} for name, timing in timings.items()},
+        'falhas': failed_files,
+    }
+
+    try:
+        if failed_files:
+            raise RuntimeError(f"{len(failed_files)} arquivo(s) com erro: "
+                               f"{', '.join(sorted(failed_files))}")
+
+        deletes = sorted(set(previous) - set(new_hashes))
+        commit_ops = operations + [CommitOperationDelete(path_in_repo=p) for p in deletes]
+        layout = layout_operations(api, dataset_name, {p.split('/')[1] for p in new_hashes})
+        if layout:
+            print(f"🧹 Layout do repositório (dataset card, arquivos de push_to_hub): "
+                  f"{len(layout)} operação(ões)")
+        commit_ops += layout
+        if commit_ops:
+            with_retries(
+                lambda: api.create_commit(
+                    repo_id=dataset_name, repo_type='dataset', operations=commit_ops,
+                    commit_message=f"Sincronização pipeline: {len(operations)} shard(s) "
+                                   f"alterado(s), {len(deletes)} removido(s)",
+                ),
+                retries=retries, label='commit'
+            )
+        save_manifest({'dataset': dataset_name, 'shards': new_hashes}, manifest_path)
+
+        summary['duracao_s'] = round(time.perf_counter() - started, 3)
+        record_sync_finish(conn, sync_id, 'concluido', processados=processed,
+                           atualizados=len(operations), metadata=summary)
+        print(f"✅ Pipeline concluído em {summary['duracao_s']:.2f}s: "
+              f"{len(operations)} shard(s) enviados, {len(deletes)} removido(s)")
+        return True
+
+    except Exception as e:
+        summary['duracao_s'] = round(time.perf_counter() - started, 3)
+        record_sync_finish(conn, sync_id, 'erro', processados=processed, erros=errors,
+                           mensagem_erro=str(e), metadata=summary)
+        print(f"❌ Erro no pipeline de sincronização: {e}")
+        return False
+
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# ============================================
+# Sincronização HF -> PostgreSQL (merge por diferença)
+# ============================================
+
+# Fração máxima das propriedades que um merge com --apply-deletes pode remover
+MERGE_MAX_DELETE_SHARE = 0.05
+
+MERGE_COMPARE_COLUMNS = [
+    'codigo_cc', 'nome', 'tipo_estoque', 'valor_avaliacao', 'valor_2023',
+    'valor_2024', 'preco_promessa', 'status', 'data_habite_se_prevista', 'observacoes',
+]
+
+
+def stage_propriedades(cursor, frame):
+    """Carrega o frame em uma tabela temporária via COPY."""
+    from import_propriedades import PROPRIEDADES_COLUMNS
+
+    cursor.execute(f"""
+        CREATE TEMP TABLE stg_propriedades ON COMMIT DROP AS
+        SELECT {', '.join(PROPRIEDADES_COLUMNS)} FROM propriedades WITH NO DATA
+    """)
+    buffer = io.StringIO()
+    frame[PROPRIEDADES_COLUMNS].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY stg_propriedades ({', '.join(PROPRIEDADES_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '')",
+        buffer
+    )
+    cursor.execute("ANALYZE stg_propriedades")
+
+
+def merge_propriedades(conn, frame, apply_deletes=False, max_delete_share=MERGE_MAX_DELETE_SHARE):
+    """
+    Aplica ao banco apenas a diferença entre o frame e `propriedades`.
+
+    A comparação é feita em SQL, por `codigo`, sobre uma tabela temporária:
+    inserções para códigos novos e UPDATE somente onde alguma coluna difere
+    (IS DISTINCT FROM). Códigos ausentes do dataset só são removidos com
+    `apply_deletes`, e a remoção é recusada se passar de `max_delete_share`
+    das propriedades: transacoes e avaliacoes caem junto (ON DELETE
+    CASCADE), e um dataset truncado apagaria o portfólio. Tudo roda em uma
+    única transação (o chamador faz o commit). Retorna (inseridos,
+    atualizados, removidos, ausentes).
+    """
+    if frame.empty:
+        raise ValueError("Dataset vazio: merge abortado para não remover todas as propriedades")
+    if frame['codigo'].isna().any():
+        raise ValueError(f"{frame['codigo'].isna().sum()} registro(s) sem código no dataset")
+    if frame['codigo'].duplicated().any():
+        duplicated = frame.loc[frame['codigo'].duplicated(), 'codigo'].head(5).tolist()
+        raise ValueError(f"Códigos duplicados no dataset: {', '.join(duplicated)}")
+
+    set_clause = ',\n                '.join(f"{c} = s.{c}" for c in MERGE_COMPARE_COLUMNS)
+    target = ', '.join(f"p.{c}" for c in MERGE_COMPARE_COLUMNS)
+    source = ', '.join(f"s.{c}" for c in MERGE_COMPARE_COLUMNS)
+    columns = ', '.join(['codigo'] + MERGE_COMPARE_COLUMNS)
+
+    with conn.cursor() as cursor:
+        stage_propriedades(cursor, frame)
+
+        cursor.execute("""
+            SELECT count(*) FILTER (WHERE NOT EXISTS (
+                       SELECT 1 FROM stg_propriedades s WHERE s.codigo = p.codigo)),
+                   count(*)
+            FROM propriedades p
+        """)
+        missing, total = cursor.fetchone()
+
+        deleted = 0
+        if apply_deletes and missing:
+            if missing > max_delete_share * total:
+                raise ValueError(
+                    f"Remoção recusada: {missing} de {total} propriedades ausentes do dataset "
+                    f"(limite {max_delete_share:.0%}); confira a revisão do dataset ou "
+                    f"ajuste --max-remocoes"
+                )
+            cursor.execute("""
+                DELETE FROM propriedades p
+                WHERE NOT EXISTS (SELECT 1 FROM stg_propriedades s WHERE s.codigo = p.codigo)
+            """)
+            deleted = cursor.rowcount
+
+        cursor.execute(f"""
+            UPDATE propriedades p
+            SET {set_clause}
+            FROM stg_propriedades s
+            WHERE p.codigo = s.codigo
+              AND ({target}) IS DISTINCT FROM ({source})
+        """)
+        updated = cursor.rowcount
+
+        cursor.execute(f"""
+            INSERT INTO propriedades ({columns})
+            SELECT {columns} FROM stg_propriedades s
+            WHERE NOT EXISTS (SELECT 1 FROM propriedades p WHERE p.codigo = s.codigo)
+        """)
+        inserted = cursor.rowcount
+
+    return inserted, updated, deleted, missing
+
+
+def pull_to_database(dataset_name, token, work_dir, table='propriedades', api=None,
+                     apply_deletes=False, revision=None, max_delete_share=MERGE_MAX_DELETE_SHARE):
+    """
+    Baixa o dataset e mescla o split `table` na tabela propriedades.
+
+    O download reaproveita o modo streaming (Parquet, retomável). O merge só
+    toca as linhas que mudaram e o resultado é registrado em
+    `sincronizacoes` com origem 'huggingface'.
+    """
+    import pandas as pd
+    from import_propriedades import prepare_frame
+
+    if not pull_streaming_from_huggingface(dataset_name, token, work_dir,
+                                           output_format='parquet', api=api,
+                                           revision=revision):
+        return False
+
+    parquet_path = Path(work_dir) / f"{table}.parquet"
+    if not parquet_path.exists():
+        candidates = sorted(Path(work_dir).glob('*.parquet'))
+        if len(candidates) != 1:
+            print(f"❌ Split '{table}' não encontrado no dataset")
+            return False
+        parquet_path = candidates[0]
+
+    conn = get_db_connection()
+    if conn is None:
+        return False
+
+    sync_id = record_sync_start(conn, 'pull_merge', {
+        'dataset': dataset_name, 'arquivo': parquet_path.name,
+    })
+    started = time.perf_counter()
+
+    try:
+        frame = prepare_frame(pd.read_parquet(parquet_path))
+        print(f"🔀 Mesclando {len(frame)} registros em propriedades...")
+        inserted, updated, deleted, missing = merge_propriedades(
+            conn, frame, apply_deletes, max_delete_share
+        )
+        print(f"   {inserted} inserido(s), {updated} atualizado(s), {deleted} removido(s), "
+              f"{len(frame) - inserted - updated} inalterado(s)")
+        if missing and not deleted:
+            print(f"   ⚠️  {missing} propriedade(s) ausente(s) do dataset mantida(s) "
+                  f"(use --apply-deletes para removê-las)")
+        conn.commit()
+
+        duration = round(time.perf_counter() - started, 3)
+        record_sync_finish(conn, sync_id, 'concluido', processados=len(frame),
+                           inseridos=inserted, atualizados=updated,
+                           metadata={'removidos': deleted, 'ausentes': missing,
+                                     'duracao_s': duration})
+        print(f"✅ Merge concluído em {duration:.2f}s")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        record_sync_finish(conn, sync_id, 'erro', mensagem_erro=str(e))
+        print(f"❌ Erro ao mesclar dados no banco: {e}")
+        return False
+
+    finally:
+        conn.close()
+
+
+# ============================================
+# Download em streaming, retomável, com projeção de colunas
+# ============================================
+
+PULL_STATE_FILENAME = '.pull_state.json'
+PULL_BATCH_ROWS = 65536
+SPLIT_SHARD_PATTERN = re.compile(r'^(?:data/)?(?P<split>[\w\-]+?)-\d{5}-of-\d{5}\.parquet$')
+FILTER_PATTERN = re.compile(
+    r'^\s*(?P<column>[^<>=!~]+?)\s*(?P<op>==|!=|>=|<=|=|>|<|~)\s*(?P<value>.*)$'
+)
+
+
+def split_for_file(path_in_repo):
+    """Infere o split de um arquivo Parquet do repositório (None se não for shard)."""
+    if not path_in_repo.endswith('.parquet'):
+        return None
+    match = SPLIT_SHARD_PATTERN.match(path_in_repo)
+    if match:
+        return match.group('split')
+    parts = Path(path_in_repo).parts
+    if len(parts) >= 3 and parts[0] == 'data':
+        return parts[1]
+    return Path(path_in_repo).parent.name or 'train'
+
+
+def parse_filters(filter_args, schema=None):
+    """
+    Converte filtros `coluna<op>valor` em uma expressão pyarrow.
+
+    Operadores: = (ou ==), !=, >, >=, <, <= e ~ (lista separada por '|').
+    Com `schema` (o do shard), o valor é convertido para o tipo da coluna:
+    CODIGO_CC=51001 compara texto com texto e ID=7 inteiro com inteiro. Sem
+    schema, ou para colunas fora dele, valores numéricos viram int/float.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+
+    if not filter_args:
+        return None
+
+    def coerce(column, raw):
+        if schema is not None and column in schema.names:
+            target = schema.field(column).type
+            if pa.types.is_string(target) or pa.types.is_large_string(target):
+                return raw
+            try:
+                return pa.scalar(raw).cast(target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ValueError(f"Valor '{raw}' inválido para {column} ({target})") from e
+        for cast in (int, float):
+            try:
+                return cast(raw)
+            except ValueError:
+                pass
+        return raw
+
+    expression = None
+    for filter_arg in filter_args:
+        match = FILTER_PATTERN.match(filter_arg)
+        if not match:
+            raise ValueError(f"Filtro inválido: '{filter_arg}' (use coluna=valor)")
+        column = match.group('column')
+        field = pa_ds.field(column)
+        op, raw = match.group('op'), match.group('value').strip()
+
+        if op == '~':
+            condition = field.isin([coerce(column, v) for v in raw.split('|')])
+        else:
+            value = coerce(column, raw)
+            condition = {
+                '=': field == value, '==': field == value, '!=': field != value,
+                '>': field > value, '>=': field >= value,
+                '<': field < value, '<=': field <= value,
+            }[op]
+        expression = condition if expression is None else expression & condition
+
+    return expression
+
+
+def load_pull_state(state_path, signature):
+    """Carrega o estado do download; descarta se os parâmetros mudaram."""
+    state_path = Path(state_path)
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('signature') == signature:
+            return state
+        print("ℹ️  Parâmetros diferentes do download anterior, recomeçando do zero")
+    return {'signature': signature, 'completed': {}}
+
+
+def write_shard_part(shard_path, part_path, columns, filters, output_format, batch_rows):
+    """
+    Lê um shard em record batches e grava a parte de saída incrementalmente.
+    Os filtros são convertidos com o schema do próprio shard (parse_filters).
+
+    A parte é gravada em arquivo temporário e renomeada ao final, de modo que
+    uma interrupção nunca deixa uma parte incompleta marcada como concluída.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as pa_ds
+    import pyarrow.parquet as pq
+
+    source = pa_ds.dataset(shard_path, format='parquet')
+    if columns:
+        missing = [c for c in columns if c not in source.schema.names]
+        if missing:
+            raise ValueError(f"Colunas inexistentes no dataset: {', '.join(missing)}")
+
+    expression = parse_filters(filters, source.schema)
+    schema = pa.schema([source.schema.field(c) for c in columns]) if columns else source.schema
+    tmp_path = part_path.with_name(part_path.name + '.tmp')
+    rows = 0
+
+    writer_cls = pq.ParquetWriter if output_format == 'parquet' else pa_csv.CSVWriter
+    with writer_cls(str(tmp_path), schema) as writer:
+        for batch in source.to_batches(columns=columns, filter=expression, batch_size=batch_rows):
+            if batch.num_rows:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+
+    tmp_path.replace(part_path)
+    return rows
+
+
+def assemble_split(part_paths, output_file, output_format):
+    """Concatena as partes de um split no arquivo final, sem materializá-lo."""
+    import pyarrow.parquet as pq
+
+    tmp_path = output_file.with_name(output_file.name + '.tmp')
+
+    if output_format == 'csv':
+        with open(tmp_path, 'wb') as out:
+            for i, part_path in enumerate(part_paths):
+                with open(part_path, 'rb') as part:
+                    header = part.readline()
+                    if i == 0:
+                        out.write(header)
+                    shutil.copyfileobj(part, out)
+    else:
+        schema = pq.read_schema(part_paths[0])
+        with pq.ParquetWriter(str(tmp_path), schema) as writer:
+            for part_path in part_paths:
+                for batch in pq.ParquetFile(part_path).iter_batches():
+                    writer.write_batch(batch)
+
+    tmp_path.replace(output_file)
+
+
+def pull_streaming_from_huggingface(dataset_name, token, output_dir, columns=None,
+                                    filters=None, output_format='csv', api=None,
+                                    batch_rows=PULL_BATCH_ROWS, revision=None):
+    """
+    Baixa o dataset shard a shard, sem carregá-lo inteiro na memória.
+
+    Cada shard Parquet é baixado (`api.hf_hub_download`), lido em record
+    batches com projeção de colunas e filtro, e gravado como uma parte em
+    `<output_dir>/.parts/<split>/`. Partes concluídas ficam registradas em
+    `.pull_state.json`, então uma execução interrompida retoma do próximo
+    shard. Ao final as partes de cada split são concatenadas em
+    `<split>.<formato>`.
+    """
+    from huggingface_hub import HfApi
+
+    try:
+        api = api or HfApi(token=token)
+        parse_filters(filters)  # valida a sintaxe antes de baixar
+        output_path = Path(output_dir)
+        parts_root = output_path / '.parts'
+        parts_root.mkdir(parents=True, exist_ok=True)
+
+        signature = {
+            'dataset': dataset_name,
+            'revision': revision,
+            'columns': columns,
+            'filters': filters,
+            'format': output_format,
+        }
+        state_path = output_path / PULL_STATE_FILENAME
+        state = load_pull_state(state_path, signature)
+        if not state['completed']:
+            shutil.rmtree(parts_root, ignore_errors=True)
+            parts_root.mkdir(parents=True, exist_ok=True)
+
+        print(f"📥 Listando shards de {dataset_name}...")
+        repo_files = api.list_repo_files(dataset_name, repo_type='dataset', revision=revision)
+        splits = {}
+        for path_in_repo in sorted(repo_files):
+            split = split_for_file(path_in_repo)
+            if split:
+                splits.setdefault(split, []).append(path_in_repo)
+
+        if not splits:
+            print("⚠️  Nenhum shard Parquet encontrado no dataset")
+            return False
+
+        total_shards = sum(len(files) for files in splits.values())
+        print(f"🧩 {len(splits)} split(s), {total_shards} shard(s), "
+              f"{len(state['completed'])} já baixado(s)")
+
+        for split, shard_files in splits.items():
+            split_dir = parts_root / split
+            split_dir.mkdir(parents=True, exist_ok=True)
+            part_paths = []
+            split_rows = 0
+
+            for path_in_repo in shard_files:
+                part_path = split_dir / f"{Path(path_in_repo).stem}.{output_format}"
+                part_paths.append(part_path)
+
+                if path_in_repo in state['completed'] and part_path.exists():
+                    split_rows += state['completed'][path_in_repo]
+                    continue
+
+                local_file = api.hf_hub_download(
+                    repo_id=dataset_name, filename=path_in_repo,
+                    repo_type='dataset', revision=revision
+                )
+                rows = write_shard_part(
+                    local_file, part_path, columns, filters, output_format, batch_rows
+                )
+                split_rows += rows
+
+                state['completed'][path_in_repo] = rows
+                save_manifest(state, state_path)
+                print(f"  ✓ {path_in_repo}: {rows} registros")
+
+            output_file = output_path / f"{split}.{output_format}"
+            assemble_split(part_paths, output_file, output_format)
+            print(f"  ✓ Salvo: {output_file} ({split_rows} registros)")
+
+        shutil.rmtree(parts_root, ignore_errors=True)
+        state_path.unlink(missing_ok=True)
+        print("✅ Download concluído!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro ao baixar dataset: {e}")
+        print("   Execute novamente para retomar a partir dos shards já baixados.")
+        return False
+
+
 def pull_from_huggingface(dataset_name, token, output_dir):
     """Baixa o dataset do Hugging Face."""
     try:
-        from datasets import load_dataset
+        from datasets import load_dataset, DatasetDict
 
         print(f"📥 Baixando dataset de {dataset_name}...")
         dataset = load_dataset(dataset_name, token=token)
@@ -140,9 +1290,56 @@ def main():
     parser.add_argument('--output-dir', type=str,
                        default=os.getenv('DATA_RAW_PATH', './data/raw'),
                        help='Diretório para salvar dados baixados')
+    parser.add_argument('--schemas-dir', type=str,
+                       default=os.getenv('DATA_SCHEMAS_PATH', './data/schemas'),
+                       help='Diretório com schemas JSON (tipos do modo Arrow)')
+    parser.add_argument('--arrow', action='store_true',
+                       help='Lê CSV/Parquet direto em Arrow (sem pandas) com cache memory-mapped')
+    parser.add_argument('--delta', action='store_true',
+                       help='Envia apenas os shards Parquet alterados (requer --push)')
+    parser.add_argument('--manifest', type=str, default=None,
+                       help=f'Manifesto local de shards (padrão: <data-dir>/{MANIFEST_FILENAME})')
+    parser.add_argument('--shard-rows', type=int, default=SHARD_ROWS,
+                       help='Tamanho da faixa de chave de cada shard')
+    parser.add_argument('--partition-column', type=str, default=None,
+                       help='Coluna usada para particionar os shards (um shard por valor)')
+    parser.add_argument('--hub-dir', type=str, default=None,
+                       help='Usa um diretório local no lugar do Hugging Face (testes)')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Converte e envia arquivos concorrentemente (requer --push)')
+    parser.add_argument('--workers', type=int, default=PIPELINE_WORKERS,
+                       help='Workers de leitura/conversão no modo --pipeline')
+    parser.add_argument('--upload-workers', type=int, default=PIPELINE_UPLOAD_WORKERS,
+                       help='Uploads simultâneos no modo --pipeline')
+    parser.add_argument('--max-inflight-mb', type=int, default=PIPELINE_MAX_INFLIGHT_MB,
+                       help='Limite de MB convertidos aguardando upload')
+    parser.add_argument('--retries', type=int, default=PIPELINE_RETRIES,
+                       help='Novas tentativas por upload com backoff exponencial')
+    parser.add_argument('--no-record', action='store_true',
+                       help='Não registra a sincronização na tabela sincronizacoes')
+    parser.add_argument('--to-db', action='store_true',
+                       help='Com --pull, mescla o dataset na tabela propriedades '
+                            '(apenas diferenças)')
+    parser.add_argument('--apply-deletes', action='store_true',
+                       help='Com --to-db, remove as propriedades ausentes do dataset (com suas '
+                            'transações e avaliações); sem ela, são mantidas')
+    parser.add_argument('--max-remocoes', type=float, default=MERGE_MAX_DELETE_SHARE,
+                       help='Com --apply-deletes, fração máxima das propriedades removidas '
+                            '(padrão: %(default)s); acima dela o merge é cancelado')
+    parser.add_argument('--stream', action='store_true',
+                       help='Baixa shard a shard em record batches, retomando downloads '
+                            'interrompidos')
+    parser.add_argument('--columns', type=str, default=None,
+                       help='Colunas a baixar, separadas por vírgula (requer --stream)')
+    parser.add_argument('--filter', type=str, action='append', dest='filters',
+                       help="Filtro coluna<op>valor, ex.: 'STATUS_ATUAL=Locado' (repetível)")
+    parser.add_argument('--format', type=str, choices=['csv', 'parquet'], default='csv',
+                       help='Formato dos arquivos baixados em modo --stream')
 
     args = parser.parse_args()
 
+    from huggingface_hub import login
+
     # Configurações
     hf_token = os.getenv('HF_TOKEN')
     hf_dataset = os.getenv('HF_DATASET_NAME', 'senal88/bni-gestao-imobiliaria')
@@ -152,7 +1349,31 @@ def main():
     print(f"Dataset: {hf_dataset}")
     print("-" * 50)
 
-    if args.push:
+    if args.push and args.pipeline:
+        manifest_path = args.manifest or str(Path(args.data_dir) / MANIFEST_FILENAME)
+        api = LocalHubDirectory(args.hub_dir) if args.hub_dir else None
+        if not api and hf_token:
+            login(token=hf_token)
+        success = run_sync_pipeline(
+            args.data_dir, hf_dataset, hf_token, manifest_path, api=api,
+            workers=args.workers, upload_workers=args.upload_workers,
+            max_inflight_bytes=args.max_inflight_mb * 1024 * 1024, retries=args.retries,
+            shard_rows=args.shard_rows, partition_column=args.partition_column,
+            record=not args.no_record
+        )
+        sys.exit(0 if success else 1)
+
+    elif args.push and args.arrow and not args.delta:
+        datasets = load_arrow_datasets_from_directory(args.data_dir, args.schemas_dir)
+
+        if not datasets:
+            print("❌ Nenhum dado encontrado para upload.")
+            sys.exit(1)
+
+        success = push_to_huggingface(create_dataset_from_arrow(datasets), hf_dataset, hf_token)
+        sys.exit(0 if success else 1)
+
+    elif args.push:
         # Carrega dados locais
         data_dict = load_data_from_directory(args.data_dir)
 
@@ -160,6 +1381,17 @@ def main():
             print("❌ Nenhum dado encontrado para upload.")
             sys.exit(1)
 
+        if args.delta:
+            manifest_path = args.manifest or str(Path(args.data_dir) / MANIFEST_FILENAME)
+            api = LocalHubDirectory(args.hub_dir) if args.hub_dir else None
+            if not api and hf_token:
+                login(token=hf_token)
+            success = push_delta_to_huggingface(
+                data_dict, hf_dataset, hf_token, manifest_path, api=api,
+                shard_rows=args.shard_rows, partition_column=args.partition_column
+            )
+            sys.exit(0 if success else 1)
+
         # Cria dataset
         dataset = create_dataset_from_data(data_dict)
 
@@ -171,6 +1403,26 @@ def main():
             print("❌ Erro ao criar dataset.")
             sys.exit(1)
 
+    elif args.pull and args.to_db:
+        api = LocalHubDirectory(args.hub_dir) if args.hub_dir else None
+        success = pull_to_database(
+            hf_dataset, hf_token, Path(args.output_dir) / '.hf_pull', api=api,
+            apply_deletes=args.apply_deletes,
+            revision=os.getenv('HF_DATASET_REVISION') if not args.hub_dir else None,
+            max_delete_share=args.max_remocoes
+        )
+        sys.exit(0 if success else 1)
+
+    elif args.pull and args.stream:
+        columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+        api = LocalHubDirectory(args.hub_dir) if args.hub_dir else None
+        success = pull_streaming_from_huggingface(
+            hf_dataset, hf_token, args.output_dir, columns=columns, filters=args.filters,
+            output_format=args.format, api=api,
+            revision=os.getenv('HF_DATASET_REVISION') if not args.hub_dir else None
+        )
+        sys.exit(0 if success else 1)
+
     elif args.pull:
         # Baixa dados
         success = pull_from_huggingface(hf_dataset, hf_token, args.output_dir)
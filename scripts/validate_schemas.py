@@ -8,11 +8,9 @@ import os
 import sys
 import argparse
 import json
+import re
 from pathlib import Path
 from dotenv import load_dotenv
-import pandas as pd
-import jsonschema
-from jsonschema import validate, ValidationError
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -30,14 +28,39 @@ def load_schema(schema_path):
         return None
 
 
-def validate_csv_against_schema(csv_path, schema):
-    """Valida um arquivo CSV contra um schema."""
+def column_properties(columns, schema):
+    """
+    Definição de cada coluna no schema: `properties` pelo nome exato ou, para
+    colunas como VALOR_DD_MM_AAAA_R$, a primeira regex de `patternProperties`.
+    """
+    properties = schema.get('properties', {})
+    patterns = [(re.compile(pattern), spec)
+                for pattern, spec in schema.get('patternProperties', {}).items()]
+    resolved = {}
+    for column in columns:
+        if column in properties:
+            resolved[column] = properties[column]
+            continue
+        for pattern, spec in patterns:
+            if pattern.search(str(column)):
+                resolved[column] = spec
+                break
+    return resolved
+
+
+def validate_csv_against_schema(csv_path, schema, read_csv=None):
+    """
+    Valida um arquivo CSV contra um schema. `read_csv` permite reaproveitar
+    DataFrames já carregados (ver scripts/pipeline.py).
+    """
+    import pandas as pd
+
     errors = []
     warnings = []
 
     try:
         # Carrega CSV
-        df = pd.read_csv(csv_path)
+        df = (read_csv or pd.read_csv)(csv_path)
 
         # Valida estrutura básica
         required_fields = schema.get('required', [])
@@ -46,7 +69,7 @@ def validate_csv_against_schema(csv_path, schema):
                 errors.append(f"Campo obrigatório '{field}' não encontrado")
 
         # Valida tipos de dados
-        properties = schema.get('properties', {})
+        properties = column_properties(df.columns, schema)
         for column in df.columns:
             if column in properties:
                 expected_type = properties[column].get('type')
@@ -108,7 +131,7 @@ def find_schema_for_csv(csv_path, schemas_dir):
     return None
 
 
-def validate_all_csvs(data_dir, schemas_dir):
+def validate_all_csvs(data_dir, schemas_dir, read_csv=None):
     """Valida todos os CSVs em um diretório."""
     data_path = Path(data_dir)
     schemas_path = Path(schemas_dir)
@@ -146,7 +169,7 @@ def validate_all_csvs(data_dir, schemas_dir):
             all_valid = False
             continue
 
-        result = validate_csv_against_schema(csv_file, schema)
+        result = validate_csv_against_schema(csv_file, schema, read_csv)
 
         if result['valid']:
             print(f"  ✅ Válido ({result['row_count']} linhas, {result['column_count']} colunas)")